@@ -0,0 +1,142 @@
+"""
+Provides a per-user directory of calendars resolved from list_calendars. A user's calendar IDs,
+primary flag and time zones rarely change, so later threads get them from the task executor
+prompt instead of rediscovering them with a tool call and an extra LLM iteration.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import tempfile
+from agentic.config import CALENDAR_CACHE_PATH, CALENDAR_CACHE_TTL
+
+
+CALENDAR_LIST_TOOL = 'list_calendars'
+CALENDAR_FIELDS = ('id', 'summary', 'primary', 'timeZone')
+
+
+class CalendarDirectory:
+    """
+    Calendars per user, kept in memory and optionally persisted to a JSON file at path.
+
+    Entries expire ttl seconds after they were recorded. Recording the same calendars again only
+    refreshes an entry past half its ttl, so repeated list_calendars results cause no writes.
+
+    The file is read once on first use and replaced atomically through a unique temp file when
+    entries change. Inside an event loop the writes run in a worker thread, one at a time, with
+    changes made meanwhile coalesced into the next write; flush() waits for them.
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._entries: dict[str, dict] | None = None
+        self._dirty = False
+        self._writer: asyncio.Task | None = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path) as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"could not read calendar cache {self.path}: {e}")
+        return self._entries
+
+    def _write(self, data: str):
+        directory, name = os.path.split(os.path.abspath(self.path))
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile('w', dir=directory, prefix=f'.{name}.', suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"could not write calendar cache {self.path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(json.dumps(self._entries))
+            return
+        self._dirty = True
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self):
+        while self._dirty:
+            self._dirty = False
+            # serialized on the loop, so the snapshot is consistent
+            await asyncio.to_thread(self._write, json.dumps(self._entries))
+
+    async def flush(self):
+        """Wait for scheduled writes to the file to finish."""
+        if self._writer is not None:
+            await self._writer
+
+    def get(self, user_id: str) -> list[dict] | None:
+        """Return the user's known calendars, or None if unknown or expired."""
+        entry = self._load().get(user_id)
+        if entry is None or time.time() - entry['recorded_at'] > self.ttl:
+            return None
+        return entry['calendars']
+
+    def record(self, user_id: str, content) -> bool:
+        """Record calendars from list_calendars output. Returns whether anything was recorded."""
+        return self.store(user_id, parse_calendars(content))
+
+    def store(self, user_id: str, calendars: list[dict]) -> bool:
+        """Record already parsed calendars. Returns whether anything was recorded."""
+        if not calendars:
+            return False
+        entry = self._load().get(user_id)
+        if entry is not None and entry['calendars'] == calendars and time.time() - entry['recorded_at'] < self.ttl / 2:
+            return False
+        self._entries[user_id] = {'calendars': calendars, 'recorded_at': time.time()}
+        self._save()
+        logging.info(f"Recorded {len(calendars)} calendars for user {user_id}")
+        return True
+
+    def forget(self, user_id: str):
+        if self._load().pop(user_id, None) is not None:
+            self._save()
+
+    def clear(self):
+        self._entries = {}
+        self._save()
+
+
+def parse_calendars(content) -> list[dict]:
+    """Extract calendar records from list_calendars output (JSON text or content blocks)."""
+    if isinstance(content, list):
+        content = ''.join(
+            block.get('text', '') if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return []
+
+    if isinstance(data, dict):
+        data = data.get('items') or data.get('calendars') or []
+    if not isinstance(data, list):
+        return []
+
+    return [
+        {key: item[key] for key in CALENDAR_FIELDS if item.get(key) is not None}
+        for item in data
+        if isinstance(item, dict) and item.get('id')
+    ]
+
+
+CALENDARS = CalendarDirectory(path=CALENDAR_CACHE_PATH, ttl=CALENDAR_CACHE_TTL)
@@ -0,0 +1,96 @@
+"""
+Provides a model cascade for agent nodes: a call is answered by the fast model unless a check on
+its result fails, in which case it is retried on the next, stronger model.
+"""
+
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from langchain_core.runnables.config import ensure_config, var_child_runnable_config
+
+
+TIERS = ('fast', 'strong')
+
+
+@contextmanager
+def attempt_metadata(**metadata):
+    """Add metadata to the config of model calls made inside, so their streamed chunks can be told apart."""
+    config = ensure_config()
+    token = var_child_runnable_config.set({**config, 'metadata': {**config.get('metadata', {}), **metadata}})
+    try:
+        yield
+    finally:
+        var_child_runnable_config.reset(token)
+
+
+class ModelCascade:
+    """
+    Runs node model calls through tiers of models and keeps per-node, per-tier metrics.
+
+    Models are passed per call (fastest first), so nodes keep reading them from config at call
+    time. A call escalates when check(result) returns a reason, or when it raises one of
+    escalate_on; the last tier's result is returned as is.
+
+    Model calls of each attempt carry cascade_tier and cascade_final (whether no escalation can
+    follow) in their metadata, so streaming can drop the text of an attempt that escalated.
+    """
+
+    def __init__(self):
+        self._stats = {}
+
+    def _node(self, node: str) -> dict:
+        return self._stats.setdefault(node, {
+            'runs': 0,
+            'escalations': 0,
+            'reasons': Counter(),
+            'tiers': {},
+        })
+
+    async def run(self, node: str, models: list, call, check=None, escalate_on: tuple = ()):
+        stats = self._node(node)
+        stats['runs'] += 1
+
+        for level, model in enumerate(models):
+            tier = TIERS[min(level, len(TIERS) - 1)]
+            last = level == len(models) - 1
+            start = time.perf_counter()
+            try:
+                with attempt_metadata(cascade_tier=tier, cascade_final=last):
+                    result = await call(model)
+                reason = check(result) if check and not last else None
+            except escalate_on as e:
+                if last:
+                    raise
+                result, reason = None, type(e).__name__
+            finally:
+                tier_stats = stats['tiers'].setdefault(tier, {'calls': 0, 'seconds': 0.0})
+                tier_stats['calls'] += 1
+                tier_stats['seconds'] += time.perf_counter() - start
+
+            if reason is None:
+                return result
+            stats['escalations'] += 1
+            stats['reasons'][reason.split(':')[0]] += 1
+            logging.info(f"Escalating {node} from {tier} model: {reason}")
+
+    def stats(self) -> dict:
+        return {
+            node: {
+                'runs': stats['runs'],
+                'escalations': stats['escalations'],
+                'escalation_rate': stats['escalations'] / stats['runs'] if stats['runs'] else 0.0,
+                'reasons': dict(stats['reasons']),
+                'tiers': {
+                    tier: {**tier_stats, 'mean_seconds': tier_stats['seconds'] / tier_stats['calls']}
+                    for tier, tier_stats in stats['tiers'].items()
+                },
+            }
+            for node, stats in self._stats.items()
+        }
+
+    def clear(self):
+        self._stats.clear()
+
+
+MODEL_CASCADE = ModelCascade()
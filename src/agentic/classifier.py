@@ -0,0 +1,116 @@
+"""
+Provides a deterministic fast path in front of the policy router LLM. Requests whose tool types are
+obvious from their wording are routed without a structured-output model call; anything the scorers
+are unsure about falls back to the LLM.
+"""
+
+import re
+import math
+import logging
+from langchain_core.messages import HumanMessage
+from agentic.config import POLICY_FAST_PATH_THRESHOLD, POLICY_FAST_PATH_EMBEDDINGS
+from agentic.schema.models import PolicyRouterOut
+from mcp_module.adapter import TOOL_MAPPING, TOOL_TYPE_KEYWORDS
+from utils.helpers import cosine
+
+
+class KeywordScorer:
+    """
+    Scores tool types with weighted regex rules. The weights of all matching rules combine as
+    1 - prod(1 - weight), so independent signals reinforce each other without exceeding 1.
+    """
+
+    def __init__(self, rules: dict[str, list[tuple[str, float]]]):
+        self.rules = {
+            tool_type: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in patterns]
+            for tool_type, patterns in rules.items()
+        }
+
+    async def score(self, text: str) -> dict[str, float]:
+        scores = {}
+        for tool_type, patterns in self.rules.items():
+            doubt = math.prod(1 - weight for pattern, weight in patterns if pattern.search(text))
+            if doubt < 1:
+                scores[tool_type] = 1 - doubt
+        return scores
+
+
+class EmbeddingScorer:
+    """
+    Scores tool types by cosine similarity between the request and a description of each type's
+    tools. Meant for a small local embeddings model; category vectors are embedded once.
+    """
+
+    def __init__(self, embeddings, tool_mapping: dict[str, list[str]]):
+        self.embeddings = embeddings
+        self.descriptions = {
+            tool_type: f"{tool_type}: " + ", ".join(tool.replace('_', ' ') for tool in tools)
+            for tool_type, tools in tool_mapping.items()
+        }
+        self._vectors = None
+
+    async def score(self, text: str) -> dict[str, float]:
+        if self._vectors is None:
+            vectors = await self.embeddings.aembed_documents(list(self.descriptions.values()))
+            self._vectors = dict(zip(self.descriptions, vectors))
+
+        query = await self.embeddings.aembed_query(text)
+        return {tool_type: max(0.0, cosine(query, vector)) for tool_type, vector in self._vectors.items()}
+
+
+def last_human_text(messages: list) -> str | None:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.content if isinstance(message.content, str) else None
+    return None
+
+
+class FastPathClassifier:
+    """
+    Combines scorers (taking each tool type's highest score) over the latest human message.
+
+    Returns an allow decision when at least one tool type reaches the threshold and no other type
+    is in the doubtful band between half the threshold and the threshold. Refusals are never made
+    here, so out-of-scope requests always reach the LLM.
+    """
+
+    def __init__(self, scorers: list, threshold: float = 0.7):
+        self.scorers = scorers
+        self.threshold = threshold
+
+    async def classify(self, messages: list, tool_mapping: dict) -> PolicyRouterOut | None:
+        text = last_human_text(messages)
+        if not text:
+            return None
+
+        scores = {}
+        for scorer in self.scorers:
+            try:
+                for tool_type, score in (await scorer.score(text)).items():
+                    scores[tool_type] = max(score, scores.get(tool_type, 0.0))
+            except Exception as e:
+                logging.warning(f"Policy fast path scorer {type(scorer).__name__} failed: {e}")
+
+        scores = {tool_type: score for tool_type, score in scores.items() if tool_type in tool_mapping}
+        allowed = sorted(tool_type for tool_type, score in scores.items() if score >= self.threshold)
+        doubtful = [tool_type for tool_type, score in scores.items() if self.threshold / 2 <= score < self.threshold]
+        if not allowed or doubtful:
+            return None
+
+        confidence = min(scores[tool_type] for tool_type in allowed)
+        return PolicyRouterOut(
+            decision='allow',
+            note=f"fast path ({confidence:.2f})",
+            allowed_tool_types=allowed,
+        )
+
+
+def create_classifier() -> FastPathClassifier:
+    scorers = [KeywordScorer(TOOL_TYPE_KEYWORDS)]
+    if POLICY_FAST_PATH_EMBEDDINGS:
+        from langchain.embeddings import init_embeddings
+        scorers.append(EmbeddingScorer(init_embeddings(POLICY_FAST_PATH_EMBEDDINGS), TOOL_MAPPING))
+    return FastPathClassifier(scorers, threshold=POLICY_FAST_PATH_THRESHOLD)
+
+
+POLICY_CLASSIFIER = create_classifier()
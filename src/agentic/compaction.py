@@ -0,0 +1,146 @@
+"""
+Provides compaction of tool outputs before they enter the prompt. Tool results are re-sent to the
+task executor on every loop iteration, so their size directly drives prompt tokens and latency.
+"""
+
+import csv
+import io
+import json
+import logging
+from langchain_core.messages import ToolMessage
+from agentic.config import TOOL_OUTPUT_COMPACTION, TOOL_OUTPUT_MAX_FIELD_CHARS, TOOL_OUTPUT_TABLE_THRESHOLD
+from mcp_module.adapter import TOOL_OUTPUT_FIELDS
+
+
+# keys under which wrapped outputs (e.g. Google API list responses) hold their records
+RECORD_LIST_KEYS = ('items', 'calendars')
+
+
+class ToolOutputCompactor:
+    """
+    Shrinks JSON tool outputs in ToolMessages.
+
+    Projects each record of a tool's output to its configured fields, drops empty values and truncates long
+    strings. Lists of records whose compact JSON exceeds table_threshold characters are encoded
+    as CSV with one header row. The original content is kept in the message artifact under
+    'full_content', which never reaches the model. Non-JSON and error outputs are left as is.
+    """
+
+    def __init__(self, fields: dict[str, list[str]] | None = None, max_field_chars: int = 200, table_threshold: int = 1500):
+        self.fields = fields or {}
+        self.max_field_chars = max_field_chars
+        self.table_threshold = table_threshold
+
+    def compact_messages(self, messages: list) -> list:
+        return [
+            self.compact(message) if isinstance(message, ToolMessage) else message
+            for message in messages
+        ]
+
+    def compact(self, message: ToolMessage) -> ToolMessage:
+        if message.status == 'error':
+            return message
+
+        text = _content_text(message.content)
+        if text is None:
+            return message
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return message
+
+        data = self._shrink(self._project(message.name, data))
+        compacted = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        if len(compacted) > self.table_threshold and _is_records(data):
+            compacted = _to_table(data)
+
+        if len(compacted) >= len(text):
+            return message
+
+        logging.info(f"Compacted {message.name} output from {len(text)} to {len(compacted)} chars")
+        return message.model_copy(update={
+            'content': compacted,
+            'artifact': {'full_content': message.content, 'mcp': message.artifact},
+        })
+
+    def _project(self, tool_name: str, data):
+        """
+        Project the records of an output to the tool's fields. Records are the items of a list,
+        or of a wrapper's list-valued 'items'/'calendars' key, whose other keys are kept as is.
+        """
+        fields = self.fields.get(tool_name)
+        if not fields:
+            return data
+        if isinstance(data, list):
+            return [{key: item[key] for key in fields if key in item} if isinstance(item, dict) else item for item in data]
+        if isinstance(data, dict):
+            return {
+                key: self._project(tool_name, value) if key in RECORD_LIST_KEYS and isinstance(value, list) else value
+                for key, value in data.items()
+            }
+        return data
+
+    def _shrink(self, data):
+        if isinstance(data, dict):
+            shrunk = {key: self._shrink(value) for key, value in data.items()}
+            return {key: value for key, value in shrunk.items() if value not in (None, '', [], {})}
+        if isinstance(data, list):
+            return [self._shrink(item) for item in data]
+        if isinstance(data, str) and len(data) > self.max_field_chars:
+            return data[:self.max_field_chars] + '…'
+        return data
+
+
+TOOL_OUTPUT_COMPACTOR = ToolOutputCompactor(
+    fields=TOOL_OUTPUT_FIELDS,
+    max_field_chars=TOOL_OUTPUT_MAX_FIELD_CHARS,
+    table_threshold=TOOL_OUTPUT_TABLE_THRESHOLD,
+) if TOOL_OUTPUT_COMPACTION else None
+
+
+def get_full_output(message: ToolMessage):
+    """Return the uncompacted content of a tool message."""
+    if isinstance(message.artifact, dict) and 'full_content' in message.artifact:
+        return message.artifact['full_content']
+    return message.content
+
+
+def _content_text(content) -> str | None:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list) and len(content) == 1:
+        block = content[0]
+        if isinstance(block, str):
+            return block
+        if isinstance(block, dict) and block.get('type') == 'text':
+            return block.get('text')
+    return None
+
+
+def _is_records(data) -> bool:
+    return isinstance(data, list) and bool(data) and all(isinstance(item, dict) for item in data)
+
+
+def _flatten(record: dict, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _to_table(records: list[dict]) -> str:
+    rows = [_flatten(record) for record in records]
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(['' if row.get(column) is None else row[column] for column in columns])
+    return f"{len(rows)} rows (csv)\n{buffer.getvalue().rstrip()}"
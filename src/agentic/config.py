@@ -2,6 +2,7 @@ import os
 from dotenv import load_dotenv
 from langchain.chat_models import init_chat_model
 from langfuse.langchain import CallbackHandler
+from utils.http_clients import create_async_client
 
 load_dotenv()
 
@@ -10,16 +11,110 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 os.environ['GOOGLE_API_KEY'] = GOOGLE_API_KEY
 os.environ['OPENAI_API_KEY'] = OPENAI_API_KEY
 
+# one pooled, kept-alive client shared by all OpenAI models (HTTP/2 unless LLM_HTTP2 is false);
+# on startup main sends LLM_WARMUP_REQUESTS concurrent requests to each model's base URL, which open
+# that many connections over HTTP/1.1 but share one over HTTP/2
+LLM_HTTP_CLIENT = create_async_client(
+    max_connections=int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', '100')),
+    max_keepalive=int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', '20')),
+    keepalive_expiry=float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY', '120')),
+    http2=os.getenv('LLM_HTTP2', 'true').lower() == 'true',
+)
+LLM_WARMUP_REQUESTS = int(os.getenv('LLM_WARMUP_REQUESTS', '4'))
+
 TASK_EXECUTOR_MODEL = init_chat_model(
     model='openai:gpt-5-nano',
-    temperature=0
+    temperature=0,
+    # retries and back-off are left to agentic.scheduler.LLM_SCHEDULER
+    max_retries=0,
+    http_async_client=LLM_HTTP_CLIENT
 )
 
 POLICY_ROUTER_MODEL = init_chat_model(
     model='openai:gpt-5-nano',
-    temperature=0
+    temperature=0,
+    max_retries=0,
+    http_async_client=LLM_HTTP_CLIENT
 )
 
+# optional stronger model that node calls escalate to when a check on the fast model's output fails
+STRONG_MODEL = None
+if os.getenv('CASCADE_STRONG_MODEL'):
+    strong_model = os.getenv('CASCADE_STRONG_MODEL')
+    STRONG_MODEL = init_chat_model(
+        model=strong_model,
+        temperature=0,
+        max_retries=0,
+        # models of other providers keep their own clients
+        **({'http_async_client': LLM_HTTP_CLIENT} if strong_model.startswith('openai:') else {})
+    )
+
+SUMMARY_MODEL = init_chat_model(
+    model='openai:gpt-5-nano',
+    temperature=0,
+    max_retries=0,
+    http_async_client=LLM_HTTP_CLIENT
+)
+
+# tool execution limits for use_tools (per-tool deadlines live in mcp_module.adapter.TOOL_TIMEOUTS)
+TOOL_MAX_CONCURRENCY = int(os.getenv('TOOL_MAX_CONCURRENCY', '8'))
+TOOL_TIMEOUT_SECONDS = float(os.getenv('TOOL_TIMEOUT_SECONDS', '30'))
+
+# prerequisite lookups of the allowed tool types run after policy_router (calls live in mcp_module.adapter.PREFETCH_TOOLS)
+PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'true').lower() == 'true'
+
+# consecutive rounds of corrected (schema-invalid) tool calls before a turn gives up with an error answer
+TOOL_CALL_MAX_CORRECTIONS = int(os.getenv('TOOL_CALL_MAX_CORRECTIONS', '2'))
+
+# per-user calendar directory; set CALENDAR_CACHE_PATH to persist it across restarts
+CALENDAR_CACHE_PATH = os.getenv('CALENDAR_CACHE_PATH')
+CALENDAR_CACHE_TTL = float(os.getenv('CALENDAR_CACHE_TTL', str(7 * 24 * 3600)))
+
+# compaction of tool outputs before they reach the model (per-tool fields live in mcp_module.adapter.TOOL_OUTPUT_FIELDS)
+TOOL_OUTPUT_COMPACTION = os.getenv('TOOL_OUTPUT_COMPACTION', 'true').lower() == 'true'
+TOOL_OUTPUT_MAX_FIELD_CHARS = int(os.getenv('TOOL_OUTPUT_MAX_FIELD_CHARS', '200'))
+TOOL_OUTPUT_TABLE_THRESHOLD = int(os.getenv('TOOL_OUTPUT_TABLE_THRESHOLD', '1500'))
+
+# deterministic policy_router fast path (keyword rules live in mcp_module.adapter.TOOL_TYPE_KEYWORDS);
+# requests scored below the threshold fall back to the LLM
+POLICY_FAST_PATH = os.getenv('POLICY_FAST_PATH', 'true').lower() == 'true'
+POLICY_FAST_PATH_THRESHOLD = float(os.getenv('POLICY_FAST_PATH_THRESHOLD', '0.7'))
+# optional embeddings model (e.g. a small local one) scoring requests against TOOL_MAPPING categories
+POLICY_FAST_PATH_EMBEDDINGS = os.getenv('POLICY_FAST_PATH_EMBEDDINGS')
+
+# cache of policy_router LLM decisions for repeated opening requests
+POLICY_CACHE_ENABLED = os.getenv('POLICY_CACHE_ENABLED', 'true').lower() == 'true'
+POLICY_CACHE_SIZE = int(os.getenv('POLICY_CACHE_SIZE', '4096'))
+POLICY_CACHE_TTL = float(os.getenv('POLICY_CACHE_TTL', '3600'))
+
+# 'sequential' runs task_executor after policy_router; 'speculative' starts it in parallel with the
+# tool types in SPECULATIVE_TOOL_TYPES and keeps the result only if the policy agrees
+GRAPH_MODE = os.getenv('GRAPH_MODE', 'sequential')
+SPECULATIVE_TOOL_TYPES = [t.strip() for t in os.getenv('SPECULATIVE_TOOL_TYPES', 'calendar').split(',') if t.strip()]
+
+# token budget of the conversation view sent to models; the last CONTEXT_KEEP_TURNS turns are kept verbatim
+CONTEXT_MAX_TOKENS = int(os.getenv('CONTEXT_MAX_TOKENS', '8000'))
+CONTEXT_KEEP_TURNS = int(os.getenv('CONTEXT_KEEP_TURNS', '2'))
+# fold turns that no longer fit into a rolling per-thread summary instead of just dropping them
+CONTEXT_SUMMARIZATION = os.getenv('CONTEXT_SUMMARIZATION', 'true').lower() == 'true'
+
+# final responses of opening, read-only requests, answered again without running the graph
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '120'))
+# optional embeddings model (e.g. 'openai:text-embedding-3-small') matching similarly worded requests
+RESPONSE_CACHE_EMBEDDINGS = os.getenv('RESPONSE_CACHE_EMBEDDINGS')
+RESPONSE_CACHE_SIMILARITY = float(os.getenv('RESPONSE_CACHE_SIMILARITY', '0.92'))
+
+# process-wide budgets for LLM calls made by agent nodes (0 = unlimited); set them a little below the
+# provider's limits so bursts queue locally by priority instead of being throttled with 429s
+LLM_RATE_LIMIT_RPM = float(os.getenv('LLM_RATE_LIMIT_RPM', '0'))
+LLM_RATE_LIMIT_TPM = float(os.getenv('LLM_RATE_LIMIT_TPM', '0'))
+# output tokens charged per call on admission, corrected with the actual usage afterwards
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv('LLM_EXPECTED_OUTPUT_TOKENS', '500'))
+# retries of failed LLM calls, made by the scheduler (the models' SDK retries are disabled)
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+
 LANGFUSE_CALLBACK = None
 if os.getenv('LANGFUSE_PUBLIC_KEY') and os.getenv('LANGFUSE_SECRET_KEY'):
     LANGFUSE_CALLBACK = CallbackHandler()
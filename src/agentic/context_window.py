@@ -0,0 +1,162 @@
+"""
+Provides context window management for long threads. Model nodes see a compacted view of the
+conversation that fits a token budget, while the full history stays in the checkpointed state.
+"""
+
+import asyncio
+import logging
+import contextvars
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from agentic.config import CONTEXT_MAX_TOKENS, CONTEXT_KEEP_TURNS
+from utils.cache import TTLCache
+
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARIZER_PROMPT = """Summarize the conversation between a user and a calendar assistant for the assistant's own reference.
+Keep facts needed later: requests made, decisions, created or changed events with their IDs, names and times, and user preferences.
+Merge the previous summary if one is given. Plain text, at most 150 words."""
+
+
+def split_turns(messages: list) -> list[list]:
+    """Split messages into turns, each starting at a HumanMessage."""
+    turns = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def collapse_turn(turn: list) -> list:
+    """
+    Keep only what a finished turn means for later turns: the user's messages and the assistant's
+    text answers. Tool calls and their ToolMessages are dropped together, so every remaining
+    message keeps its pairing, and HITL filler (deferred/dummy results) disappears with them.
+    """
+    return [
+        message for message in turn
+        if isinstance(message, HumanMessage) or (isinstance(message, AIMessage) and not message.tool_calls)
+    ]
+
+
+class ContextWindow:
+    """
+    Builds the message view sent to a model under a token budget.
+
+    The last keep_turns turns are sent verbatim, since follow-ups often refer to their tool results
+    (e.g. event IDs). Older turns are collapsed, and turns already folded into the thread's rolling
+    summary are replaced by it. If the view is still over budget, the oldest turns are dropped;
+    those are the turns summarize() folds into the summary next.
+    """
+
+    def __init__(self, max_tokens: int = 8000, keep_turns: int = 2, count_tokens=count_tokens_approximately):
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.count_tokens = count_tokens
+
+    def _unsummarized(self, messages: list, summary: dict | None) -> tuple[list, list]:
+        if summary:
+            for i, message in enumerate(messages):
+                if message.id == summary['through_id']:
+                    return [SystemMessage(content=SUMMARY_PREFIX + summary['content'])], messages[i + 1:]
+        return [], messages
+
+    def split(self, messages: list, summary: dict | None = None) -> tuple[list, list]:
+        """
+        Return (view, overflow): the compacted messages to send, and the original turns that were
+        left out for the budget (oldest first).
+        """
+        prefix, remaining = self._unsummarized(messages, summary)
+        turns = split_turns(remaining)
+        recent = max(self.keep_turns, 1)
+        compacted = [collapse_turn(turn) for turn in turns[:-recent]] + turns[-recent:]
+
+        # approximate counts are per message, so the total can be kept up to date per turn
+        sizes = [self.count_tokens(turn) for turn in compacted]
+        total = self.count_tokens(prefix) + sum(sizes)
+        overflow = []
+        while len(compacted) > 1 and total > self.max_tokens:
+            total -= sizes.pop(0)
+            compacted.pop(0)
+            overflow.append(turns.pop(0))
+        if overflow:
+            logging.info(f"Context window left out {len(overflow)} older turns")
+        return prefix + [m for turn in compacted for m in turn], overflow
+
+    def view(self, messages: list, summary: dict | None = None) -> list:
+        return self.split(messages, summary)[0]
+
+    async def summarize(self, model, messages: list, summary: dict | None = None) -> dict | None:
+        """Fold turns that no longer fit into the rolling summary; None if nothing overflows."""
+        _, overflow = self.split(messages, summary)
+        if not overflow:
+            return None
+
+        previous = [HumanMessage(content="Previous summary:\n" + summary['content'])] if summary else []
+        transcript = "\n".join(
+            f"{message.type}: {message.text}" for turn in overflow for message in collapse_turn(turn)
+        )
+        response = await model.ainvoke(
+            [SystemMessage(content=SUMMARIZER_PROMPT)]
+            + previous
+            + [HumanMessage(content="Conversation:\n" + transcript)]
+        )
+        logging.info(f"Summarized {len(overflow)} older turns into the thread summary")
+        # the summary covers whole turns, so nothing of a summarized turn is left dangling
+        return {'content': response.text, 'through_id': overflow[-1][-1].id}
+
+
+class BackgroundSummaries:
+    """
+    Rolling summaries computed off the request path, one at a time per thread.
+
+    A turn whose history overflows starts a summary here and goes on with the truncated view; the
+    thread's next turn takes the finished summary into its state. Summaries never taken are
+    dropped after ttl seconds. Best effort: a failed summary is logged and the turns stay left out.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 24 * 3600):
+        self._tasks = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def _summarize(self, thread_id: str, coro) -> dict | None:
+        try:
+            return await coro
+        except Exception as e:
+            logging.warning(f"Context summarization for thread {thread_id} failed: {e}")
+            return None
+
+    def start(self, thread_id: str, coro) -> bool:
+        """Run coro as the thread's summary, unless one is still running. Returns whether it started."""
+        running = self._tasks.get(thread_id)
+        if running is not None and not running.done():
+            coro.close()
+            return False
+        # a fresh context keeps the finished request's callbacks out of the background call
+        task = asyncio.create_task(self._summarize(thread_id, coro), context=contextvars.Context())
+        self._tasks.set(thread_id, task)
+        return True
+
+    def take(self, thread_id: str) -> dict | None:
+        """Return the thread's finished summary once, or None if there is none (yet)."""
+        task = self._tasks.get(thread_id)
+        if task is None or not task.done():
+            return None
+        self._tasks.pop(thread_id)
+        return None if task.cancelled() else task.result()
+
+    async def wait(self, thread_id: str):
+        """Wait for the thread's running summary, if any."""
+        task = self._tasks.get(thread_id)
+        if task is not None:
+            await asyncio.wait([task])
+
+    def clear(self):
+        for _, task in self._tasks.items():
+            task.cancel()
+        self._tasks.clear()
+
+
+CONTEXT_WINDOW = ContextWindow(max_tokens=CONTEXT_MAX_TOKENS, keep_turns=CONTEXT_KEEP_TURNS)
+BACKGROUND_SUMMARIES = BackgroundSummaries()
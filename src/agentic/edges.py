@@ -4,7 +4,9 @@ Contains functions representing conditional edges, where routing to nodes depend
 
 import logging
 from langgraph.graph import END
+from langchain_core.messages import ToolMessage
 from agentic.state import RequestState, NO_ACTION
+from agentic.schema.tools import DECLARE_TOOL_TYPES_TOOL_NAME
 
 
 def route_from_task_executor(state: RequestState):
@@ -13,6 +15,11 @@ def route_from_task_executor(state: RequestState):
     last_message = messages[-1]
     pending_kind = state.get('pending_action', NO_ACTION)['kind']
 
+    # invalid tool calls were answered with corrective ToolMessages, let the model retry
+    if isinstance(last_message, ToolMessage):
+        logging.info("Routing from Task Executor back to task_executor after invalid tool calls")
+        return "task_executor"
+
     if pending_kind == 'clarification':
         logging.info("Routing from Task Executor to human_clarification")
         return "human_clarification"
@@ -28,6 +35,21 @@ def route_from_task_executor(state: RequestState):
     return END
 
 
+def route_from_routing_executor(state: RequestState):
+    """Retry routing if tool calls were rejected before any tool types were declared, else route as task_executor"""
+    trailing = []
+    for message in reversed(state["messages"]):
+        if not isinstance(message, ToolMessage):
+            break
+        trailing.append(message)
+
+    if trailing and not any(message.name == DECLARE_TOOL_TYPES_TOOL_NAME for message in trailing):
+        logging.info("Routing from Routing Executor back to routing_executor, no tool types declared")
+        return "routing_executor"
+
+    return route_from_task_executor(state)
+
+
 def oauth_url_detection(state: RequestState):
     """Route to oauth_needed if URL OAuth is detected, otherwise continue to task executor"""
     if state.get('pending_action', NO_ACTION)['kind'] == 'oauth_url':
@@ -0,0 +1,83 @@
+"""
+Provides the execution engine for tool calls made by the task executor. Plugs into LangGraph's
+ToolNode as its awrap_tool_call hook, so ToolNode keeps running calls concurrently while this
+bounds concurrency, applies per-tool deadlines and turns failures into error ToolMessages.
+"""
+
+import asyncio
+import logging
+from langchain_core.messages import ToolMessage
+from langgraph.errors import GraphBubbleUp
+from mcp.shared.exceptions import McpError
+from agentic.config import TOOL_MAX_CONCURRENCY, TOOL_TIMEOUT_SECONDS
+from mcp_module.adapter import TOOL_TIMEOUTS
+from utils.loop_local import LoopLocal
+
+
+URL_ELICITATION_ERROR = -32042
+
+
+def is_url_elicitation(e: Exception) -> bool:
+    return isinstance(e, McpError) and e.error.code == URL_ELICITATION_ERROR
+
+
+class ToolCallExecutor:
+    """
+    Wraps each tool call with a shared semaphore and a deadline.
+
+    A call that times out or raises yields a ToolMessage with status='error' instead of failing
+    the whole step, so the model still gets results for the calls that succeeded. Exceptions
+    matching should_propagate (e.g. OAuth elicitation) are re-raised for the node to handle.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        default_timeout: float = 30.0,
+        timeouts: dict[str, float] | None = None,
+        should_propagate=None,
+    ):
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self.should_propagate = should_propagate or (lambda e: False)
+        self.max_concurrency = max_concurrency
+        self._semaphore = LoopLocal(lambda: asyncio.Semaphore(self.max_concurrency))
+
+    def timeout_for(self, tool_name: str) -> float:
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    async def __call__(self, request, execute):
+        call = request.tool_call
+        timeout = self.timeout_for(call['name'])
+
+        async with self._semaphore.get():
+            try:
+                return await asyncio.wait_for(execute(request), timeout)
+            except GraphBubbleUp:
+                raise
+            except TimeoutError:
+                logging.warning(f"Tool {call['name']} timed out after {timeout}s")
+                return self._error_message(call, f"Error: {call['name']} timed out after {timeout}s.")
+            except Exception as e:
+                if self.should_propagate(e):
+                    raise
+                logging.error(f"Tool {call['name']} failed: {e}")
+                return self._error_message(call, f"Error: {call['name']} failed: {e}")
+
+    @staticmethod
+    def _error_message(call, content: str) -> ToolMessage:
+        return ToolMessage(
+            content=content,
+            name=call['name'],
+            tool_call_id=call['id'],
+            status='error',
+        )
+
+
+# OAuth elicitation must escape the executor so use_tools can start the OAuth flow
+TOOL_EXECUTOR = ToolCallExecutor(
+    max_concurrency=TOOL_MAX_CONCURRENCY,
+    default_timeout=TOOL_TIMEOUT_SECONDS,
+    timeouts=TOOL_TIMEOUTS,
+    should_propagate=is_url_elicitation,
+)
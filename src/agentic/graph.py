@@ -6,73 +6,251 @@ from typing import Literal
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.types import Command
-from langchain.messages import HumanMessage
+from langchain.messages import HumanMessage, AIMessage, AIMessageChunk
 from agentic.state import RequestState
-from agentic.nodes.agent import policy_router, task_executor
-from agentic.nodes.tool import use_tools
+from agentic.nodes.agent import policy_router, task_executor, speculative_executor, routing_executor, manage_context
+from agentic.nodes.tool import use_tools, prefetch
 from agentic.nodes.human import human_confirmation, human_clarification, oauth_needed
-from agentic.edges import route_from_task_executor, oauth_url_detection, route_from_human_confirmation, route_from_human_clarification
-from agentic.config import LANGFUSE_CALLBACK
-
-# each node in our agentic system is represented by a function
-graph_config = StateGraph(state_schema=RequestState)
-graph_config.add_node("policy_router", policy_router)
-graph_config.add_node("task_executor", task_executor)
-graph_config.add_node("use_tools", use_tools)
-graph_config.add_node("human_confirmation", human_confirmation)
-graph_config.add_node("human_clarification", human_clarification)
-graph_config.add_node("oauth_needed", oauth_needed)
-
-# conditional edges use a function to dynamically route
-graph_config.add_edge(START, "policy_router")
-graph_config.add_edge("policy_router", "task_executor")
-graph_config.add_conditional_edges(
-    "task_executor",
-    route_from_task_executor,
-    ["use_tools", "human_confirmation", "human_clarification", END]
-)
-graph_config.add_conditional_edges(
-    "use_tools",
-    oauth_url_detection,
-    ["task_executor", "oauth_needed"]
-)
-graph_config.add_conditional_edges(
-    "human_confirmation",
-    route_from_human_confirmation,
-    ["use_tools", "task_executor"]
-)
-graph_config.add_conditional_edges(
-    "human_clarification",
-    route_from_human_clarification,
-    ["use_tools", "human_confirmation", "task_executor"]
-)
-graph_config.add_edge("oauth_needed", END)
+from agentic.edges import route_from_task_executor, route_from_routing_executor, oauth_url_detection, route_from_human_confirmation, route_from_human_clarification
+from agentic.config import LANGFUSE_CALLBACK, GRAPH_MODE, RESPONSE_CACHE_ENABLED
+from agentic.metrics import PROMPT_CACHE_METRICS, CURRENT_RUN
+from agentic.response_cache import RESPONSE_CACHE
+from utils.helpers import get_user_id
+
+GRAPH_MODES = ('sequential', 'speculative', 'single_call')
+
+
+def build_graph(mode: str = 'sequential', checkpointer=None):
+    """
+    Compile the agent workflow. In 'speculative' mode the first task_executor model call runs in
+    parallel with policy_router and is committed only if the policy agrees with its tool types.
+    In 'single_call' mode routing_executor replaces both policy_router and that first call.
+    """
+    if mode not in GRAPH_MODES:
+        raise ValueError(f"Unknown graph mode {mode!r}, expected one of {GRAPH_MODES}")
+
+    # each node in our agentic system is represented by a function
+    graph_config = StateGraph(state_schema=RequestState)
+    graph_config.add_node("task_executor", task_executor)
+    graph_config.add_node("use_tools", use_tools)
+    graph_config.add_node("human_confirmation", human_confirmation)
+    graph_config.add_node("human_clarification", human_clarification)
+    graph_config.add_node("oauth_needed", oauth_needed)
+    graph_config.add_node("manage_context", manage_context)
+
+    # conditional edges use a function to dynamically route
+    # older turns are summarized in the background, so no node waits on the summary
+    graph_config.add_edge(START, "manage_context")
+    graph_config.add_edge("manage_context", END)
+    if mode == 'single_call':
+        # the tool types are only declared in the model's answer, so nothing is prefetched
+        graph_config.add_node("routing_executor", routing_executor)
+        graph_config.add_edge(START, "routing_executor")
+        graph_config.add_conditional_edges(
+            "routing_executor",
+            route_from_routing_executor,
+            ["routing_executor", "use_tools", "human_confirmation", "human_clarification", "task_executor", END]
+        )
+    else:
+        graph_config.add_node("policy_router", policy_router)
+        graph_config.add_node("prefetch", prefetch)
+        graph_config.add_edge(START, "policy_router")
+        # prerequisite lookups only run for the tool types the policy allowed
+        graph_config.add_edge("policy_router", "prefetch")
+        if mode == 'speculative':
+            graph_config.add_node("speculative_executor", speculative_executor)
+            graph_config.add_edge(START, "speculative_executor")
+            graph_config.add_edge(["prefetch", "speculative_executor"], "task_executor")
+        else:
+            graph_config.add_edge("prefetch", "task_executor")
+    graph_config.add_conditional_edges(
+        "task_executor",
+        route_from_task_executor,
+        ["use_tools", "human_confirmation", "human_clarification", "task_executor", END]
+    )
+    graph_config.add_conditional_edges(
+        "use_tools",
+        oauth_url_detection,
+        ["task_executor", "oauth_needed"]
+    )
+    graph_config.add_conditional_edges(
+        "human_confirmation",
+        route_from_human_confirmation,
+        ["use_tools", "task_executor"]
+    )
+    graph_config.add_conditional_edges(
+        "human_clarification",
+        route_from_human_clarification,
+        ["use_tools", "human_confirmation", "task_executor"]
+    )
+    graph_config.add_edge("oauth_needed", END)
+
+    return graph_config.compile(checkpointer=checkpointer)
+
 
 # set up a local memory checkpointer for now, volatile and not persistent
 memory = InMemorySaver()
-graph = graph_config.compile(checkpointer=memory)
+graph = build_graph(GRAPH_MODE, checkpointer=memory)
 
 
-async def run_graph(thread_id: str, initial_request: str) -> RequestState:
-    message = await graph.ainvoke(
-        input={
-            "messages": [HumanMessage(initial_request)],
-            "allowed_tool_types": []
+def run_config(thread_id: str, resumed: bool = False) -> dict:
+    callbacks = [PROMPT_CACHE_METRICS]
+    if CURRENT_RUN.get() is not None:
+        callbacks.append(CURRENT_RUN.get())
+    if LANGFUSE_CALLBACK:
+        callbacks.append(LANGFUSE_CALLBACK)
+    return {
+        # resumed runs get the highest LLM_SCHEDULER priority
+        "configurable": {"thread_id": thread_id, "resumed": resumed},
+        "callbacks": callbacks
+    }
+
+
+# nodes whose model output can be the final response; speculative output may be discarded, so a
+# committed speculation is emitted with task_executor's update instead
+STREAMED_NODES = {'task_executor', 'routing_executor'}
+
+
+def update_answer(update) -> AIMessage | None:
+    """The last AI message in a node's state update, if it answers without calling tools."""
+    messages = (update or {}).get('messages', [])
+    if not isinstance(messages, list):
+        messages = [messages]
+    answer = next((message for message in reversed(messages) if isinstance(message, AIMessage)), None)
+    return answer if answer is not None and not answer.tool_calls else None
+
+
+def build_run_input(initial_request: str, user_id: str | None = None) -> dict:
+    graph_input = {
+        "messages": [HumanMessage(initial_request)],
+        "allowed_tool_types": []
+    }
+    if user_id:
+        graph_input["user_id"] = user_id
+    return graph_input
+
+
+async def cached_run(thread_id: str, initial_request: str, user_id: str | None = None) -> RequestState | None:
+    """
+    Answer an opening request from RESPONSE_CACHE without running the graph. On a hit the exchange
+    is still written to the thread, so follow-ups see it; returns the thread's state, or None.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+
+    config = run_config(thread_id)
+    graph_input = build_run_input(initial_request, user_id)
+    # later turns depend on the earlier ones, so only requests opening a thread are answered
+    if (await graph.aget_state(config)).values.get('messages'):
+        return None
+    response = await RESPONSE_CACHE.get(get_user_id(graph_input), initial_request)
+    if response is None:
+        return None
+
+    await graph.aupdate_state(
+        config,
+        {
+            **graph_input,
+            'messages': graph_input['messages'] + [AIMessage(response)],
+            'final_response': response,
         },
-        config={
-            "configurable": {"thread_id": thread_id},
-            "callbacks": [LANGFUSE_CALLBACK] if LANGFUSE_CALLBACK else []
-        }
+        as_node="task_executor"
+    )
+    return (await graph.aget_state(config)).values
+
+
+async def remember_run(final_state: RequestState, initial_request: str):
+    """Store the final response of a finished read-only run in RESPONSE_CACHE."""
+    if RESPONSE_CACHE_ENABLED and RESPONSE_CACHE.cacheable(final_state):
+        await RESPONSE_CACHE.set(get_user_id(final_state), initial_request, final_state['final_response'])
+
+
+async def run_graph(thread_id: str, initial_request: str, user_id: str | None = None) -> RequestState:
+    cached = await cached_run(thread_id, initial_request, user_id)
+    if cached is not None:
+        return cached
+
+    message = await graph.ainvoke(
+        input=build_run_input(initial_request, user_id),
+        config=run_config(thread_id)
     )
+    await remember_run(message, initial_request)
     return message
 
 
 async def resume_graph(thread_id: str, resume_data) -> RequestState:
     state = await graph.ainvoke(
         Command(resume=resume_data),
-        config={
-            "configurable": {"thread_id": thread_id},
-            "callbacks": [LANGFUSE_CALLBACK] if LANGFUSE_CALLBACK else []
-        }
+        config=run_config(thread_id, resumed=True)
     )
-    return state
\ No newline at end of file
+    return state
+
+
+async def stream_graph(thread_id: str, graph_input, resumed: bool = False):
+    """
+    Run the graph, yielding ('token', text) as answering nodes generate text and finally
+    ('state', final_state) once the run finishes or is interrupted.
+
+    A node's tokens are held back until it returns, since only then is it known whether its message
+    answers or calls tools. They are yielded if the returned message answers and matches them;
+    text written before tool calls is dropped. A held MODEL_CASCADE attempt is replaced by a
+    stronger one that follows. When the returned answer differs from the tokens (a committed
+    speculation, or a fixed answer), its text is yielded instead.
+    """
+    final_state = None
+    # per node: tokens generated since its last update
+    held: dict[str, list[str]] = {}
+    escalating: set[str] = set()
+    async for mode, chunk in graph.astream(
+        graph_input,
+        config=run_config(thread_id, resumed),
+        stream_mode=["messages", "updates", "values"]
+    ):
+        if mode == "values":
+            final_state = chunk
+            continue
+
+        if mode == "updates":
+            for node, update in chunk.items():
+                if node not in STREAMED_NODES:
+                    continue
+                tokens = held.pop(node, [])
+                escalating.discard(node)
+                answer = update_answer(update)
+                if answer is None or not answer.text:
+                    continue
+                if ''.join(tokens) != answer.text:
+                    tokens = [answer.text]
+                for text in tokens:
+                    yield 'token', text
+            continue
+
+        message, metadata = chunk
+        node = metadata.get('langgraph_node')
+        if node not in STREAMED_NODES or not isinstance(message, AIMessageChunk) or not message.text:
+            continue
+        if not metadata.get('cascade_final', True):
+            escalating.add(node)
+        elif node in escalating:
+            # a stronger attempt replaces the text of the one it escalated from
+            escalating.discard(node)
+            held.pop(node, None)
+        held.setdefault(node, []).append(message.text)
+    yield 'state', final_state
+
+
+async def stream_run(thread_id: str, initial_request: str, user_id: str | None = None):
+    cached = await cached_run(thread_id, initial_request, user_id)
+    if cached is not None:
+        yield 'token', cached['final_response']
+        yield 'state', cached
+        return
+
+    async for kind, payload in stream_graph(thread_id, build_run_input(initial_request, user_id)):
+        if kind == 'state':
+            await remember_run(payload, initial_request)
+        yield kind, payload
+
+
+def stream_resume(thread_id: str, resume_data):
+    return stream_graph(thread_id, Command(resume=resume_data), resumed=True)
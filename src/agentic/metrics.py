@@ -0,0 +1,242 @@
+"""
+Provides per-node instrumentation of graph runs: provider-side prompt caching (nodes keep a stable
+prompt prefix so providers can reuse it), and per-run node, model and tool timings and token usage.
+"""
+
+import time
+import logging
+from uuid import UUID
+from contextlib import contextmanager
+from contextvars import ContextVar
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+UNKNOWN_NODE = 'unknown'
+# nodes whose calls are iterations of the agent loop
+ITERATION_NODES = ('task_executor', 'routing_executor')
+# LangGraph tags the run of each node (not of the runnables nested in it) with its step
+NODE_STEP_TAG = 'graph:step:'
+
+
+class PromptCacheMetrics(BaseCallbackHandler):
+    """
+    Callback handler aggregating input and cached input tokens per graph node.
+
+    Chat model runs are attributed to the LangGraph node they were started from, and usage is
+    read from the resulting messages' usage_metadata (cache_read input token details).
+    """
+
+    # aggregate on the event loop thread rather than in an executor
+    run_inline = True
+
+    def __init__(self):
+        self._nodes: dict[UUID, str] = {}
+        self._totals: dict[str, dict] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: dict | None = None, **kwargs):
+        self._nodes[run_id] = (metadata or {}).get('langgraph_node', UNKNOWN_NODE)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        node = self._nodes.pop(run_id, UNKNOWN_NODE)
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None)
+                if usage:
+                    self.record(node, usage)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._nodes.pop(run_id, None)
+
+    def record(self, node: str, usage: dict):
+        input_tokens = usage.get('input_tokens', 0)
+        cached_tokens = (usage.get('input_token_details') or {}).get('cache_read', 0) or 0
+
+        totals = self._totals.setdefault(node, {'calls': 0, 'input_tokens': 0, 'cached_tokens': 0})
+        totals['calls'] += 1
+        totals['input_tokens'] += input_tokens
+        totals['cached_tokens'] += cached_tokens
+        logging.info(f"Prompt cache {node}: {cached_tokens}/{input_tokens} input tokens cached")
+
+    def stats(self) -> dict:
+        return {
+            node: {
+                **totals,
+                'cached_ratio': totals['cached_tokens'] / totals['input_tokens'] if totals['input_tokens'] else 0.0,
+            }
+            for node, totals in self._totals.items()
+        }
+
+    def clear(self):
+        self._nodes.clear()
+        self._totals.clear()
+
+
+PROMPT_CACHE_METRICS = PromptCacheMetrics()
+
+
+def empty_node_stats() -> dict:
+    return {
+        'calls': 0,
+        'wall_seconds': 0.0,
+        'llm_calls': 0,
+        'llm_seconds': 0.0,
+        'tool_calls': 0,
+        'tool_seconds': 0.0,
+        'input_tokens': 0,
+        'output_tokens': 0,
+        'cached_tokens': 0,
+    }
+
+
+# (call counter, seconds) keys of node stats per kind of timed run
+TIMED_RUNS = {
+    'node': ('calls', 'wall_seconds'),
+    'llm': ('llm_calls', 'llm_seconds'),
+    'tool': ('tool_calls', 'tool_seconds'),
+}
+
+
+class RunRecorder(BaseCallbackHandler):
+    """
+    Callback handler recording one request: per graph node its calls, wall time, time spent in
+    chat model and tool calls, and token usage (including cached input tokens).
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.nodes: dict[str, dict] = {}
+        self._open: dict[UUID, tuple[str, str, float]] = {}
+
+    def _start(self, kind: str, run_id: UUID, metadata: dict | None):
+        node = (metadata or {}).get('langgraph_node', UNKNOWN_NODE)
+        self._open[run_id] = (kind, node, time.perf_counter())
+
+    def _end(self, run_id: UUID) -> dict | None:
+        entry = self._open.pop(run_id, None)
+        if entry is None:
+            return None
+        kind, node, start = entry
+        stats = self.nodes.setdefault(node, empty_node_stats())
+        calls, seconds = TIMED_RUNS[kind]
+        stats[calls] += 1
+        stats[seconds] += time.perf_counter() - start
+        return stats
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, tags: list[str] | None = None, metadata: dict | None = None, **kwargs):
+        if any(tag.startswith(NODE_STEP_TAG) for tag in tags or []):
+            self._start('node', run_id, metadata)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        # interrupts end a node's run with an error too
+        self._end(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: dict | None = None, **kwargs):
+        self._start('llm', run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        stats = self._end(run_id)
+        if stats is None:
+            return
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None)
+                if usage:
+                    stats['input_tokens'] += usage.get('input_tokens', 0)
+                    stats['output_tokens'] += usage.get('output_tokens', 0)
+                    stats['cached_tokens'] += (usage.get('input_token_details') or {}).get('cache_read', 0) or 0
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._end(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, metadata: dict | None = None, **kwargs):
+        self._start('tool', run_id, metadata)
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs):
+        self._end(run_id)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def summary(self) -> dict:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        totals = empty_node_stats()
+        for stats in self.nodes.values():
+            for key, value in stats.items():
+                totals[key] += value
+        del totals['calls'], totals['wall_seconds']
+        return {
+            'wall_seconds': end - self.started,
+            'iterations': sum(self.nodes.get(node, {}).get('calls', 0) for node in ITERATION_NODES),
+            'totals': totals,
+            'nodes': {node: dict(stats) for node, stats in self.nodes.items()},
+        }
+
+
+class RunMetrics:
+    """Aggregates the summaries of finished runs into per-node totals and means."""
+
+    def __init__(self):
+        self.runs = 0
+        self.wall_seconds = 0.0
+        self.iterations = 0
+        self._nodes: dict[str, dict] = {}
+
+    def add(self, summary: dict):
+        self.runs += 1
+        self.wall_seconds += summary['wall_seconds']
+        self.iterations += summary['iterations']
+        for node, stats in summary['nodes'].items():
+            totals = self._nodes.setdefault(node, empty_node_stats())
+            for key, value in stats.items():
+                totals[key] += value
+
+    def stats(self) -> dict:
+        return {
+            'runs': self.runs,
+            'mean_wall_seconds': self.wall_seconds / self.runs if self.runs else 0.0,
+            'mean_iterations': self.iterations / self.runs if self.runs else 0.0,
+            'nodes': {
+                node: {
+                    **totals,
+                    'mean_wall_seconds': totals['wall_seconds'] / totals['calls'] if totals['calls'] else 0.0,
+                }
+                for node, totals in self._nodes.items()
+            },
+        }
+
+    def clear(self):
+        self.runs = 0
+        self.wall_seconds = 0.0
+        self.iterations = 0
+        self._nodes.clear()
+
+
+RUN_METRICS = RunMetrics()
+
+CURRENT_RUN: ContextVar[RunRecorder | None] = ContextVar('agent_current_run', default=None)
+
+
+@contextmanager
+def record_run():
+    """Record graph runs started in this context (see agentic.graph.run_config) and aggregate them into RUN_METRICS."""
+    recorder = RunRecorder()
+    token = CURRENT_RUN.set(recorder)
+    try:
+        yield recorder
+    finally:
+        try:
+            CURRENT_RUN.reset(token)
+        except ValueError:
+            # a streamed run abandoned by its client is closed from another context
+            pass
+        recorder.finish()
+        RUN_METRICS.add(recorder.summary())
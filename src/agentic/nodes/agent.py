@@ -2,33 +2,68 @@
 Implementation of several agent nodes within the message assistant agentic system.
 """
 
+import uuid
 import logging
-from langchain.messages import SystemMessage
+from langchain_core.exceptions import OutputParserException
+from pydantic import ValidationError
+from langchain_core.runnables import RunnableConfig
+from langchain.messages import SystemMessage, AIMessage, ToolMessage, HumanMessage
 from agentic.state import RequestState, NO_ACTION
-from agentic.config import POLICY_ROUTER_MODEL, TASK_EXECUTOR_MODEL
-from agentic.schema.prompts import POLICY_ROUTER, get_task_executor_prompt
+from agentic.config import (
+    POLICY_ROUTER_MODEL, TASK_EXECUTOR_MODEL, STRONG_MODEL, SUMMARY_MODEL, POLICY_FAST_PATH, POLICY_CACHE_ENABLED,
+    SPECULATIVE_TOOL_TYPES, CONTEXT_SUMMARIZATION, TOOL_CALL_MAX_CORRECTIONS,
+)
+from agentic.schema.prompts import POLICY_ROUTER, TASK_EXECUTOR, SINGLE_CALL_EXECUTOR, get_task_context
 from agentic.schema.models import PolicyRouterOut
-from agentic.schema.tools import request_clarification, CLARIFICATION_TOOL_NAME
-from mcp_module.adapter import TOOL_MAPPING, HITL_TOOLS, CLIENT
+from agentic.schema.tools import CLARIFICATION_TOOL_NAME, DECLARE_TOOL_TYPES_TOOL_NAME
+from agentic.registry import TOOL_REGISTRY, ROUTING_REGISTRY
+from agentic.calendars import CALENDARS
+from agentic.context_window import CONTEXT_WINDOW, BACKGROUND_SUMMARIES
+from agentic.cascade import MODEL_CASCADE
+from agentic.classifier import POLICY_CLASSIFIER
+from agentic.policy_cache import POLICY_CACHE
+from agentic.scheduler import LLM_SCHEDULER, NEW, BACKGROUND, request_priority
+from agentic.validation import SKIPPED_MESSAGE, CORRECTIONS_EXHAUSTED_MESSAGE
+from mcp_module.context import canonical_args
+from mcp_module.adapter import TOOL_MAPPING, HITL_TOOLS, invalidate_tools_cache
+from utils.helpers import get_user_id, get_thread_id
 
-async def policy_router(state: RequestState):
+async def policy_router(state: RequestState, config: RunnableConfig = None):
     """
     Policy router node.
 
     Analyzes the user request to determine which tool types (calendar) are
     permitted for the current conversation. Adds allowed_tool_types to state.
 
-    Uses structured output to ensure consistent policy decisions.
+    Requests the fast path classifier is confident about skip the LLM, as do opening requests
+    already decided before (POLICY_CACHE); the rest use structured output to ensure consistent
+    policy decisions, retried on the strong model if the output is malformed. Model calls of this
+    and the other agent nodes are admitted by LLM_SCHEDULER.
     """
-    structured_model = POLICY_ROUTER_MODEL.with_structured_output(PolicyRouterOut)
-    message = await structured_model.ainvoke(
-        [
+    # a previous run stopped for OAuth, so the set of tools we can see may have changed since
+    if state.get('auth_url'):
+        invalidate_tools_cache('oauth completed')
+
+    # obvious requests are routed by the deterministic classifier without an LLM round trip
+    message = await POLICY_CLASSIFIER.classify(state['messages'], TOOL_MAPPING) if POLICY_FAST_PATH else None
+    if message is None and POLICY_CACHE_ENABLED:
+        message = POLICY_CACHE.get(state['messages'], TOOL_MAPPING)
+    if message is None:
+        prompt = [
             SystemMessage(
                 content=POLICY_ROUTER
             )
-        ]
-        + state['messages']
-    )
+        ] + CONTEXT_WINDOW.view(state['messages'], state.get('context_summary'))
+        priority = request_priority(state, config)
+        # a malformed structured output is retried on the strong model
+        message = await MODEL_CASCADE.run(
+            'policy_router',
+            cascade_models(POLICY_ROUTER_MODEL),
+            lambda model: LLM_SCHEDULER.wrap(model.with_structured_output(PolicyRouterOut), priority).ainvoke(prompt),
+            escalate_on=(OutputParserException, ValidationError),
+        )
+        if POLICY_CACHE_ENABLED:
+            POLICY_CACHE.set(state['messages'], TOOL_MAPPING, message)
     schema = message.model_dump()
     logging.info(f"Policy note: {schema['note']}")
 
@@ -37,40 +72,290 @@ async def policy_router(state: RequestState):
         'auth_url': None,
     }
 
-async def task_executor(state: RequestState):
+async def manage_context(state: RequestState, config: RunnableConfig = None):
     """
-    Task executor node.
+    Context manager node.
 
-    Main agent that processes user requests by invoking appropriate MCP tools.
-    Loads tools based on allowed_tool_types from policy_router.
+    Runs alongside policy_router at the start of each request and returns without waiting on a
+    model. Takes the summary a previous turn finished into the thread's state, and once older turns
+    no longer fit the context window, starts folding them into the rolling summary in the
+    background (BACKGROUND_SUMMARIES). The current turn uses the truncated view meanwhile.
+    """
+    thread_id = get_thread_id(config)
+    if not CONTEXT_SUMMARIZATION or thread_id is None:
+        return {}
 
-    Detects HITL tools and sets pending_action for human confirmation when needed.
+    update = {}
+    summary = state.get('context_summary')
+    finished = BACKGROUND_SUMMARIES.take(thread_id)
+    if finished:
+        update['context_summary'] = summary = finished
+
+    _, overflow = CONTEXT_WINDOW.split(state['messages'], summary)
+    if overflow:
+        # nothing waits on the summary, so it yields to calls users are waiting for
+        BACKGROUND_SUMMARIES.start(thread_id, CONTEXT_WINDOW.summarize(
+            LLM_SCHEDULER.wrap(SUMMARY_MODEL, BACKGROUND), state['messages'], summary
+        ))
+    return update
+
+
+def prefetched_messages(state: RequestState, tool_names: frozenset[str]) -> list:
+    """
+    Turn prefetched results for allowed tools into tool call and result message pairs, recording
+    the calendars they list now that they are used.
     """
-    all_tools = await CLIENT.get_tools()
-    allowed_tool_types = [TOOL_MAPPING[tool_type] for tool_type in state['allowed_tool_types']]
-    allowed_tools = {tool for tool_type_list in allowed_tool_types for tool in tool_type_list}
-    mcp_tools = [tool for tool in all_tools if tool.name in allowed_tools]
-    tools = mcp_tools + [request_clarification]
+    messages = []
+    for result in state.get('prefetched') or []:
+        if result['tool_type'] not in state['allowed_tool_types'] or result['tool_name'] not in tool_names:
+            continue
+        if result.get('calendars'):
+            CALENDARS.store(get_user_id(state), result['calendars'])
+        call_id = f"prefetch_{uuid.uuid4().hex[:12]}"
+        messages += [
+            AIMessage(content='', tool_calls=[{'name': result['tool_name'], 'args': result['args'], 'id': call_id}]),
+            ToolMessage(content=result['content'], name=result['tool_name'], tool_call_id=call_id),
+        ]
+    return messages
+
+
+def cascade_models(fast_model) -> list:
+    """Models a node's call cascades through, fastest first."""
+    return [fast_model, STRONG_MODEL] if STRONG_MODEL is not None else [fast_model]
+
+
+def repeats_tool_calls(state: RequestState, message) -> bool:
+    """Whether every tool call in message was already made with the same arguments this turn."""
+    seen = set()
+    for previous in reversed(state['messages']):
+        if isinstance(previous, HumanMessage):
+            break
+        if isinstance(previous, AIMessage):
+            seen.update((tc['name'], canonical_args(tc['args'])) for tc in previous.tool_calls)
+    calls = {(tc['name'], canonical_args(tc['args'])) for tc in message.tool_calls}
+    return bool(calls) and calls <= seen
+
 
-    logging.info(f"Task allowed tools: {allowed_tools}")
+def task_model_check(state: RequestState, binding):
+    """Escalation check for task model calls: invalid tool arguments or a loop without progress."""
+    def check(message) -> str | None:
+        for tc in message.tool_calls:
+            errors = binding.validator.errors(tc)
+            if errors:
+                return f"invalid_tool_call: {tc['name']}: {errors[0]}"
+        if repeats_tool_calls(state, message):
+            return "no_progress: repeated tool calls"
+        return None
+    return check
 
-    tool_model = TASK_EXECUTOR_MODEL.bind_tools(tools=tools)
-    message = await tool_model.ainvoke(
+
+async def invoke_task_model(state: RequestState, binding, injected: list, prompt: str = TASK_EXECUTOR, model=None, priority: int = NEW):
+    """Call the task executor model bound to binding's tools on the conversation plus injected messages."""
+    tool_model = LLM_SCHEDULER.wrap(binding.bind(model or TASK_EXECUTOR_MODEL), priority)
+    # static instructions lead and volatile context trails, keeping the prefix cacheable across calls
+    return await tool_model.ainvoke(
         [
             SystemMessage(
-                content=get_task_executor_prompt()
+                content=prompt
+            )
+        ]
+        + CONTEXT_WINDOW.view(state['messages'], state.get('context_summary'))
+        + injected
+        + [
+            SystemMessage(
+                content=get_task_context(calendars=CALENDARS.get(get_user_id(state)))
             )
         ]
-        + state['messages']
     )
+
+
+async def speculative_executor(state: RequestState, config: RunnableConfig = None):
+    """
+    Speculative executor node (speculative graph mode only).
+
+    Runs the first task_executor model call for SPECULATIVE_TOOL_TYPES in parallel with
+    policy_router. task_executor commits the result if the policy allows exactly those tool types
+    and discards it otherwise. Best effort: any failure leaves no speculation behind.
+    """
+    try:
+        binding = await TOOL_REGISTRY.get(SPECULATIVE_TOOL_TYPES, TOOL_MAPPING)
+        message = await invoke_task_model(state, binding, [], priority=request_priority(state, config))
+    except Exception as e:
+        logging.warning(f"Speculative task execution failed: {e}")
+        return {'speculation': None}
+
+    return {
+        'speculation': {
+            'allowed_tool_types': list(SPECULATIVE_TOOL_TYPES),
+            'message': message,
+        }
+    }
+
+
+def take_speculation(state: RequestState):
+    """Return the speculative message if it was made for exactly the allowed tool types."""
+    speculation = state.get('speculation')
+    if not speculation:
+        return None
+    if set(speculation['allowed_tool_types']) != set(state['allowed_tool_types']):
+        logging.info(f"Discarding speculation for {speculation['allowed_tool_types']}, policy allowed {state['allowed_tool_types']}")
+        return None
+    logging.info(f"Committing speculation for {speculation['allowed_tool_types']}")
+    return speculation['message']
+
+
+async def task_executor(state: RequestState, config: RunnableConfig = None):
+    """
+    Task executor node.
+
+    Main agent that processes user requests by invoking appropriate MCP tools.
+    Loads tools based on allowed_tool_types from policy_router, reusing the model bound to them
+    from TOOL_REGISTRY.
+
+    Results prefetched for allowed tools are injected into the conversation first, and calendars
+    already known for the user are listed in the trailing request context, so the model does not
+    have to request them. In speculative graph mode, a speculation matching the policy decision is
+    committed instead of calling the model.
+
+    The call goes through MODEL_CASCADE: with a strong model configured, a response with invalid
+    tool arguments or only repeated tool calls is retried on it. Tool calls are then validated
+    against the tools' input schemas; if any is invalid, every call is answered with a corrective
+    ToolMessage and the loop returns here, at most TOOL_CALL_MAX_CORRECTIONS times in a row.
+
+    Detects HITL tools and sets pending_action for human confirmation when needed.
+    """
+    binding = await TOOL_REGISTRY.get(state['allowed_tool_types'], TOOL_MAPPING)
+    logging.info(f"Task allowed tools: {set(binding.tool_names)}")
+
+    message = take_speculation(state)
+    # the speculation ran before prefetch results existed, so they are only injected into fresh calls
+    injected = [] if message else prefetched_messages(state, binding.tool_names)
+    if injected:
+        logging.info(f"Injected {len(injected) // 2} prefetched tool results")
+    if message is None:
+        priority = request_priority(state, config)
+        message = await MODEL_CASCADE.run(
+            'task_executor',
+            cascade_models(TASK_EXECUTOR_MODEL),
+            lambda model: invoke_task_model(state, binding, injected, model=model, priority=priority),
+            check=task_model_check(state, binding),
+        )
+
+    # prefetched results and speculations are consumed on the first iteration
+    update = {'messages': [*injected, message] if injected else message}
+    if state.get('prefetched'):
+        update['prefetched'] = []
+    if state.get('speculation'):
+        update['speculation'] = None
+    if state.get('tool_call_corrections'):
+        update['tool_call_corrections'] = 0
     logging.info(f"Task Executor Message: {message.content}")
     logging.info(f"Task Executor Tools Called: {message.tool_calls}")
 
+    # reject malformed calls before they reach a human or the MCP server
+    corrections = binding.validator.reject_invalid(message.tool_calls)
+    if corrections:
+        return {**update, **correct_tool_calls(state, [*injected, message, *corrections])}
+
+    return route_tool_calls(message, update)
+
+
+def correct_tool_calls(state: RequestState, messages: list) -> dict:
+    """
+    Update for a step whose tool calls were answered with corrections (messages ends with them).
+    The model gets up to TOOL_CALL_MAX_CORRECTIONS retries in a row; after that the turn ends with
+    an error answer instead of looping until the graph's recursion limit.
+    """
+    corrections = state.get('tool_call_corrections', 0) + 1
+    if corrections <= TOOL_CALL_MAX_CORRECTIONS:
+        return {'messages': messages, 'tool_call_corrections': corrections}
+
+    logging.warning(f"Giving up after {corrections} rounds of invalid tool calls")
+    answer = AIMessage(content=CORRECTIONS_EXHAUSTED_MESSAGE)
+    return {'messages': [*messages, answer], 'final_response': answer.content, 'tool_call_corrections': 0}
+
+
+def answer_tool_calls(tool_calls: list[dict], content, status: str = 'success') -> list[ToolMessage]:
+    """Answer tool calls without executing them; content may be a function of the call."""
+    return [
+        ToolMessage(
+            content=content(tc) if callable(content) else content,
+            name=tc['name'],
+            tool_call_id=tc['id'],
+            status=status,
+        )
+        for tc in tool_calls
+    ]
+
+
+async def routing_executor(state: RequestState, config: RunnableConfig = None):
+    """
+    Routing executor node (single_call graph mode only).
+
+    Replaces policy_router and the first task_executor call with one model call over the tools of
+    every tool type. The model declares the tool types it needs with declare_tool_types, which
+    become allowed_tool_types. Calls made without a declaration or outside the declared tool types
+    are rejected in code before anything runs, and use_tools only ever binds the allowed tools.
+    """
+    binding = await ROUTING_REGISTRY.get(list(TOOL_MAPPING), TOOL_MAPPING)
+    priority = request_priority(state, config)
+    message = await MODEL_CASCADE.run(
+        'routing_executor',
+        cascade_models(TASK_EXECUTOR_MODEL),
+        lambda model: invoke_task_model(state, binding, [], prompt=SINGLE_CALL_EXECUTOR, model=model, priority=priority),
+        check=task_model_check(state, binding),
+    )
+    logging.info(f"Routing Executor Message: {message.content}")
+    logging.info(f"Routing Executor Tools Called: {message.tool_calls}")
+
+    corrections = binding.validator.reject_invalid(message.tool_calls)
+    if corrections:
+        return correct_tool_calls(state, [message, *corrections])
+    # past the corrections, this step succeeds or asks again for a declaration
+    reset = {'tool_call_corrections': 0} if state.get('tool_call_corrections') else {}
+
+    declarations = [tc for tc in message.tool_calls if tc['name'] == DECLARE_TOOL_TYPES_TOOL_NAME]
+    calls = [tc for tc in message.tool_calls if tc['name'] != DECLARE_TOOL_TYPES_TOOL_NAME]
+    if not declarations:
+        if calls:
+            # no decision was made, so the model gets another routing turn
+            return correct_tool_calls(state, [
+                message,
+                *answer_tool_calls(calls, "Error: call declare_tool_types before any other tool.", status='error'),
+            ])
+        return {**reset, 'messages': message, 'allowed_tool_types': [], 'final_response': message.content}
+
+    allowed = sorted({t for tc in declarations for t in tc['args']['tool_types'] if t in TOOL_MAPPING})
+    allowed_names = {CLARIFICATION_TOOL_NAME, *(name for t in allowed for name in TOOL_MAPPING[t])}
+    logging.info(f"Declared tool types: {allowed}")
+    declared = answer_tool_calls(declarations, f"Allowed tool types: {allowed}")
+
+    rejected = {tc['id'] for tc in calls if tc['name'] not in allowed_names}
+    if rejected:
+        logging.info(f"Rejected undeclared tool calls: {[tc['name'] for tc in calls if tc['id'] in rejected]}")
+        errors = answer_tool_calls(
+            calls,
+            lambda tc: f"Error: {tc['name']} is not in the declared tool types {allowed}." if tc['id'] in rejected else SKIPPED_MESSAGE,
+            status='error',
+        )
+        return {**correct_tool_calls(state, [message, *declared, *errors]), 'allowed_tool_types': allowed}
+
+    if not calls:
+        return {**reset, 'messages': [message, *declared], 'allowed_tool_types': allowed}
+
+    # the declaration is answered here; remaining calls continue in a new message, as after clarification
+    deferred = answer_tool_calls(calls, "Deferred until tool types were declared.")
+    remaining = AIMessage(content=message.content, tool_calls=calls)
+    return route_tool_calls(remaining, {**reset, 'messages': [message, *declared, *deferred, remaining], 'allowed_tool_types': allowed})
+
+
+def route_tool_calls(message, update: dict) -> dict:
+    """Add the pending action or final response that message's tool calls lead to onto update."""
     # check for clarification requests first (takes priority)
     clarification_calls = [tc for tc in message.tool_calls if tc['name'] == CLARIFICATION_TOOL_NAME]
     if clarification_calls:
         return {
-            'messages': message,
+            **update,
             'pending_action': {
                 'kind': 'clarification',
                 'clarifications': [
@@ -97,7 +382,7 @@ async def task_executor(state: RequestState):
     ]
     if hitl_tool_calls:
         return {
-            'messages': message,
+            **update,
             'pending_action': {
                 'kind': 'confirmation',
                 'tool_calls': hitl_tool_calls
@@ -106,13 +391,12 @@ async def task_executor(state: RequestState):
 
     if not message.tool_calls:
         return {
-            'messages': message,
+            **update,
             'final_response': message.content
         }
 
-    return {
-        'messages': message
-    }
+    return update
+
 
 if __name__ == '__main__':
     pass
\ No newline at end of file
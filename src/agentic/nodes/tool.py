@@ -2,36 +2,79 @@
 Implementation of tool nodes within the message assistant agentic system.
 """
 
+import asyncio
 import logging
-from langgraph.prebuilt.tool_node import ToolNode
 from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
 from agentic.state import RequestState
-from mcp_module.adapter import CLIENT
+from agentic.compaction import TOOL_OUTPUT_COMPACTOR
+from agentic.config import PREFETCH_ENABLED
+from agentic.calendars import CALENDARS, CALENDAR_LIST_TOOL, parse_calendars
+from agentic.executor import TOOL_EXECUTOR, URL_ELICITATION_ERROR
+from agentic.registry import TOOL_REGISTRY
+from agentic.response_cache import RESPONSE_CACHE
+from mcp_module.adapter import TOOL_MAPPING, PREFETCH_TOOLS, CIRCUIT_BREAKER, get_tools, invalidate_tools_cache
+from mcp_module.breaker import OPEN
+from mcp_module.context import bind_user, bind_thread
 from mcp.shared.exceptions import McpError
-from utils.helpers import get_last_ai_message
+from utils.helpers import get_last_ai_message, get_user_id, get_thread_id
 
 
-URL_ELICITATION_ERROR = -32042
+DEGRADED_MESSAGE = "Calendar service is temporarily degraded; this call was not made. Tell the user to try again shortly."
 
-async def use_tools(state: RequestState):
+
+def record_calendars(user_id: str, messages: list):
+    for message in messages:
+        if isinstance(message, ToolMessage) and message.name == CALENDAR_LIST_TOOL and message.status != 'error':
+            CALENDARS.record(user_id, message.content)
+
+
+async def use_tools(state: RequestState, config: RunnableConfig = None):
     """
     Tool execution node.
 
-    Executes MCP tool calls from the task_executor using LangGraph's ToolNode.
+    Executes MCP tool calls from the task_executor using the ToolNode prebuilt in TOOL_REGISTRY
+    for the allowed tool types. Calls run concurrently under TOOL_EXECUTOR's limits; a call that
+    fails or times out produces an error ToolMessage while the others still return their results.
     Handles OAuth URL elicitation errors by capturing the auth URL in pending_action.
+    While the MCP circuit breaker is open, fails fast with DEGRADED_MESSAGE for every call.
+    Calls are bound to the thread so replicated MCP servers can route them sticky.
 
-    Returns ToolMessage results to state for the task_executor to process.
+    Read-only tool results are served from the per-user result cache when possible.
+    Returns ToolMessage results to state for the task_executor to process, compacted by
+    TOOL_OUTPUT_COMPACTOR (the full output stays in each message's artifact). Calendars listed
+    by list_calendars are recorded in the user's calendar directory, and a successful write drops
+    the user's cached responses.
     """
+    if CIRCUIT_BREAKER.state == OPEN:
+        logging.warning("MCP circuit open, failing tool calls fast")
+        return {
+            'messages': [
+                ToolMessage(content=DEGRADED_MESSAGE, name=tc['name'], tool_call_id=tc['id'], status='error')
+                for tc in get_last_ai_message(state).tool_calls
+            ]
+        }
+
     try:
-        tools = await CLIENT.get_tools()
-        tool_node = ToolNode(tools)
-        return await tool_node.ainvoke(state)
+        binding = await TOOL_REGISTRY.get(state['allowed_tool_types'], TOOL_MAPPING)
+        user_id = get_user_id(state)
+        with bind_user(user_id), bind_thread(get_thread_id(config)):
+            result = await binding.tool_node.ainvoke(state)
+
+        if isinstance(result, dict):
+            record_calendars(user_id, result['messages'])
+            RESPONSE_CACHE.record_writes(user_id, result['messages'])
+
+        if TOOL_OUTPUT_COMPACTOR is not None and isinstance(result, dict):
+            result['messages'] = TOOL_OUTPUT_COMPACTOR.compact_messages(result['messages'])
+        return result
     except McpError as e:
         logging.error(f"an mcp error occured here: {e}")
         error = e.error
         data = error.data
 
         if error.code == URL_ELICITATION_ERROR:
+            invalidate_tools_cache('oauth required')
             elicitation = data['elicitations'][0]
             last_ai_message = get_last_ai_message(state)
             tool_messages = [
@@ -54,4 +97,60 @@ async def use_tools(state: RequestState):
         raise
     except Exception as e:
         logging.error(f"an error occured here: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+async def prefetch(state: RequestState, config: RunnableConfig = None):
+    """
+    Prefetch node.
+
+    Runs once policy_router has decided (at once when its fast path answered) and calls the
+    prerequisite read tools in PREFETCH_TOOLS of the allowed tool types only. Results land in
+    state['prefetched'] and the task_executor injects them, saving it a tool round trip.
+
+    Best effort: failures, OAuth elicitations and timeouts are skipped, leaving the task_executor
+    to make the calls itself. list_calendars is skipped when the user's calendars are already known.
+    Listed calendars are not recorded here, since a committed speculation discards the results;
+    task_executor records them when it injects them.
+    """
+    allowed = [tool_type for tool_type in state.get('allowed_tool_types', []) if tool_type in PREFETCH_TOOLS]
+    if not PREFETCH_ENABLED or not allowed or CIRCUIT_BREAKER.state == OPEN:
+        return {'prefetched': []}
+
+    try:
+        tools = {tool.name: tool for tool in await get_tools()}
+    except Exception as e:
+        logging.warning(f"prefetch could not load tools: {e}")
+        return {'prefetched': []}
+
+    user_id = get_user_id(state)
+    known_calendars = CALENDARS.get(user_id) is not None
+    calls = [
+        (tool_type, tools[tool_name], args)
+        for tool_type in allowed
+        for tool_name, args in PREFETCH_TOOLS[tool_type]
+        if tool_name in tools and not (tool_name == CALENDAR_LIST_TOOL and known_calendars)
+    ]
+
+    async def run(tool_type, tool, args):
+        message = await asyncio.wait_for(
+            tool.ainvoke({'name': tool.name, 'args': args, 'id': f'prefetch_{tool.name}', 'type': 'tool_call'}),
+            TOOL_EXECUTOR.timeout_for(tool.name),
+        )
+        result = {'tool_type': tool_type, 'tool_name': tool.name, 'args': args}
+        if tool.name == CALENDAR_LIST_TOOL and message.status != 'error':
+            result['calendars'] = parse_calendars(message.content)
+        if TOOL_OUTPUT_COMPACTOR is not None:
+            message = TOOL_OUTPUT_COMPACTOR.compact(message)
+        return {**result, 'content': message.content}
+
+    with bind_user(user_id), bind_thread(get_thread_id(config)):
+        results = await asyncio.gather(*(run(*call) for call in calls), return_exceptions=True)
+
+    prefetched = []
+    for (tool_type, tool, args), result in zip(calls, results):
+        if isinstance(result, BaseException):
+            logging.info(f"prefetch of {tool.name} skipped: {result}")
+        else:
+            prefetched.append(result)
+    return {'prefetched': prefetched}
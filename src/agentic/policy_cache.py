@@ -0,0 +1,73 @@
+"""
+Provides a cache of policy router decisions, so repeated requests skip the policy LLM call.
+"""
+
+import re
+import json
+import hashlib
+import logging
+from langchain_core.messages import HumanMessage
+from agentic.config import POLICY_CACHE_SIZE, POLICY_CACHE_TTL
+from utils.cache import TTLCache
+
+
+def normalize_request(text: str) -> str:
+    """Lowercase, unify apostrophes, drop punctuation and collapse whitespace."""
+    text = text.lower().replace('’', "'")
+    text = re.sub(r"[^\w\s']", ' ', text)
+    return ' '.join(text.split())
+
+
+def mapping_version(tool_mapping: dict) -> str:
+    return hashlib.sha1(json.dumps(tool_mapping, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class PolicyDecisionCache:
+    """
+    LRU + TTL cache of PolicyRouterOut decisions keyed by the normalized request and the version of
+    the tool mapping they were made against.
+
+    Only requests that open a conversation are cached: later turns are decided in the context of
+    the earlier ones, so the same text can warrant a different decision. Every entry is dropped
+    once the tool mapping changes.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._version = None
+
+    def _key(self, messages: list, tool_mapping: dict) -> tuple | None:
+        human = [message for message in messages if isinstance(message, HumanMessage)]
+        if len(human) != 1 or not isinstance(human[0].content, str):
+            return None
+
+        version = mapping_version(tool_mapping)
+        if version != self._version:
+            if self._version is not None:
+                logging.info(f"Tool mapping changed, dropping {len(self.cache)} cached policy decisions")
+            self.cache.clear()
+            self._version = version
+        return (normalize_request(human[0].content), version)
+
+    def get(self, messages: list, tool_mapping: dict):
+        key = self._key(messages, tool_mapping)
+        if key is None:
+            return None
+        decision = self.cache.get(key)
+        if decision is not None:
+            logging.info(f"Policy decision cache hit: {key[0]!r}")
+        return decision
+
+    def set(self, messages: list, tool_mapping: dict, decision):
+        key = self._key(messages, tool_mapping)
+        if key is not None:
+            self.cache.set(key, decision)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+POLICY_CACHE = PolicyDecisionCache(maxsize=POLICY_CACHE_SIZE, ttl=POLICY_CACHE_TTL)
@@ -0,0 +1,100 @@
+"""
+Provides a registry of prebuilt tool bindings, so the agent loop stops filtering the tool catalog,
+converting tool schemas and constructing a ToolNode on every step.
+"""
+
+import logging
+from langgraph.prebuilt.tool_node import ToolNode
+from agentic.executor import TOOL_EXECUTOR
+from agentic.schema.tools import request_clarification, declare_tool_types
+from agentic.validation import ToolCallValidator
+from mcp_module.adapter import CATALOG, get_tools
+
+
+class ToolBinding:
+    """
+    Tools permitted for one set of allowed tool types, with the ToolNode that executes them, the
+    validator for calls to them and the models bound to them. Models are bound lazily and
+    memoized by identity.
+    """
+
+    def __init__(self, tools: list, model_tools: list, wrap_tool_call=None):
+        self.tools = tools
+        self.tool_names = frozenset(tool.name for tool in tools)
+        self.tool_node = ToolNode(tools, awrap_tool_call=wrap_tool_call)
+        self._model_tools = tools + model_tools
+        self.validator = ToolCallValidator(self._model_tools)
+        self._bound = {}
+
+    def bind(self, model):
+        """Return model.bind_tools(...) for this binding's tools, building it once per model."""
+        entry = self._bound.get(id(model))
+        # hold on to the model so its id cannot be reused by another object
+        if entry is None or entry[0] is not model:
+            entry = (model, model.bind_tools(tools=self._model_tools))
+            self._bound[id(model)] = entry
+        return entry[1]
+
+
+class ToolRegistry:
+    """
+    Memoizes ToolBindings per frozenset(allowed_tool_types) and tool mapping.
+
+    All bindings are rebuilt once the tool catalog version changes. Empty tool lists (e.g. while
+    OAuth is pending) are never memoized, mirroring the catalog.
+    """
+
+    def __init__(self, catalog, load_tools, model_tools: list | None = None, wrap_tool_call=None):
+        self._catalog = catalog
+        self._load_tools = load_tools
+        self._model_tools = model_tools or []
+        self._wrap_tool_call = wrap_tool_call
+        self._bindings = {}
+        self._version = None
+
+        self.builds = 0
+
+    async def get(self, allowed_tool_types, tool_mapping: dict) -> ToolBinding:
+        all_tools = await self._load_tools()
+        version = self._catalog.version
+        if version != self._version:
+            self._bindings.clear()
+            self._version = version
+
+        allowed_tool_types = frozenset(allowed_tool_types or ())
+        key = (allowed_tool_types, id(tool_mapping))
+        entry = self._bindings.get(key)
+        if entry is not None and entry[0] is tool_mapping:
+            return entry[1]
+
+        allowed_tools = {tool for tool_type in allowed_tool_types for tool in tool_mapping[tool_type]}
+        binding = ToolBinding(
+            [tool for tool in all_tools if tool.name in allowed_tools],
+            self._model_tools,
+            self._wrap_tool_call,
+        )
+        self.builds += 1
+        logging.info(f"Built tool binding for {sorted(allowed_tool_types)} at catalog version {version}")
+
+        if all_tools:
+            self._bindings[key] = (tool_mapping, binding)
+        return binding
+
+    def clear(self):
+        self._bindings.clear()
+        self._version = None
+
+
+TOOL_REGISTRY = ToolRegistry(
+    CATALOG,
+    get_tools,
+    model_tools=[request_clarification],
+    wrap_tool_call=TOOL_EXECUTOR,
+)
+# single_call graph mode binds every tool type plus the tool the model declares its tool types with
+ROUTING_REGISTRY = ToolRegistry(
+    CATALOG,
+    get_tools,
+    model_tools=[request_clarification, declare_tool_types],
+    wrap_tool_call=TOOL_EXECUTOR,
+)
@@ -0,0 +1,141 @@
+"""
+Provides a cache of final responses to read-only requests, so repeating a question answers it
+without running the graph's model and MCP calls again.
+"""
+
+import logging
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from agentic.config import (
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_EMBEDDINGS,
+    RESPONSE_CACHE_SIMILARITY,
+)
+from agentic.policy_cache import normalize_request
+from agentic.schema.tools import DECLARE_TOOL_TYPES_TOOL_NAME
+from agentic.state import NO_ACTION
+from mcp_module.adapter import READ_ONLY_TOOLS, HITL_TOOLS
+from utils.cache import TTLCache
+from utils.helpers import cosine
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of final responses keyed by user and normalized request text.
+
+    Only runs that open a thread and finish with an answer after calling nothing but read_tools
+    are stored, since their answer depends on the request and the user's data alone. With an
+    embeddings model, a request that misses exactly is answered by the user's most similar cached
+    request at or above the similarity threshold. A user's entries are dropped as soon as one of
+    their write_tools calls succeeds; the short TTL covers changes made outside the agent.
+    """
+
+    def __init__(
+        self,
+        read_tools: set[str],
+        write_tools: set[str],
+        maxsize: int = 1024,
+        ttl: float = 120.0,
+        embeddings=None,
+        similarity: float = 0.92,
+    ):
+        self.read_tools = set(read_tools)
+        self.write_tools = set(write_tools)
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.embeddings = embeddings
+        self.similarity = similarity
+        self.similar_hits = 0
+
+    def cacheable(self, state) -> bool:
+        """Whether a finished run's final_response may answer the same request again."""
+        if not state.get('final_response') or state.get('auth_url'):
+            return False
+        if state.get('pending_action', NO_ACTION)['kind'] != NO_ACTION['kind']:
+            return False
+
+        messages = state.get('messages', [])
+        if sum(isinstance(message, HumanMessage) for message in messages) != 1:
+            return False
+        for message in messages:
+            if isinstance(message, AIMessage) and any(tc['name'] not in self.read_tools for tc in message.tool_calls):
+                return False
+            # answers built around failed or degraded calls are not worth repeating
+            if isinstance(message, ToolMessage) and message.status == 'error':
+                return False
+        return True
+
+    async def _embed(self, text: str) -> list[float] | None:
+        try:
+            return await self.embeddings.aembed_query(text)
+        except Exception as e:
+            logging.warning(f"Response cache could not embed request: {e}")
+            return None
+
+    async def get(self, user_id: str, request: str) -> str | None:
+        key = (user_id, normalize_request(request))
+        entry = self.cache.get(key)
+        if entry is not None:
+            logging.info(f"Response cache hit: {key[1]!r}")
+            return entry['response']
+
+        if self.embeddings is None:
+            return None
+        candidates = [(k, v) for k, v in self.cache.items() if k[0] == user_id and v['vector']]
+        if not candidates:
+            return None
+        vector = await self._embed(request)
+        if vector is None:
+            return None
+
+        match, entry = max(candidates, key=lambda candidate: cosine(vector, candidate[1]['vector']))
+        score = cosine(vector, entry['vector'])
+        if score < self.similarity:
+            return None
+        self.similar_hits += 1
+        logging.info(f"Response cache similar hit ({score:.2f}): {key[1]!r} ~ {match[1]!r}")
+        return entry['response']
+
+    async def set(self, user_id: str, request: str, response: str):
+        vector = await self._embed(request) if self.embeddings is not None else None
+        self.cache.set((user_id, normalize_request(request)), {'response': response, 'vector': vector})
+
+    def record_writes(self, user_id: str, messages: list) -> int:
+        """Invalidate the user's responses if any of the given tool results is a successful write."""
+        if any(
+            isinstance(message, ToolMessage) and message.name in self.write_tools and message.status != 'error'
+            for message in messages
+        ):
+            return self.invalidate_user(user_id)
+        return 0
+
+    def invalidate_user(self, user_id: str) -> int:
+        dropped = self.cache.invalidate(lambda key: key[0] == user_id)
+        if dropped:
+            logging.info(f"Invalidated {dropped} cached responses for user {user_id}")
+        return dropped
+
+    def clear(self):
+        self.cache.clear()
+        self.similar_hits = 0
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), 'similar_hits': self.similar_hits}
+
+
+def create_response_cache() -> ResponseCache:
+    embeddings = None
+    if RESPONSE_CACHE_EMBEDDINGS:
+        from langchain.embeddings import init_embeddings
+        embeddings = init_embeddings(RESPONSE_CACHE_EMBEDDINGS)
+    return ResponseCache(
+        # declaring tool types (single_call mode) reads nothing and changes nothing
+        read_tools=READ_ONLY_TOOLS | {DECLARE_TOOL_TYPES_TOOL_NAME},
+        write_tools=HITL_TOOLS,
+        maxsize=RESPONSE_CACHE_SIZE,
+        ttl=RESPONSE_CACHE_TTL,
+        embeddings=embeddings,
+        similarity=RESPONSE_CACHE_SIMILARITY,
+    )
+
+
+RESPONSE_CACHE = create_response_cache()
@@ -0,0 +1,269 @@
+"""
+Provides a process-wide scheduler for LLM calls. Calls are admitted against requests-per-minute and
+tokens-per-minute budgets in priority order, so bursts queue locally instead of being throttled
+(and blindly retried) by the provider.
+"""
+
+import time
+import heapq
+import random
+import asyncio
+import logging
+import itertools
+import openai
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from agentic.config import LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_TPM, LLM_EXPECTED_OUTPUT_TOKENS, LLM_MAX_RETRIES
+
+
+# lower values are admitted first
+RESUME, IN_PROGRESS, NEW, BACKGROUND = range(4)
+PRIORITY_NAMES = {RESUME: 'resume', IN_PROGRESS: 'in_progress', NEW: 'new', BACKGROUND: 'background'}
+
+
+def request_priority(state, config=None) -> int:
+    """
+    Priority of a node's model calls: resumed runs first (the user just acted on a pending
+    action), then threads already under way, then requests opening a new thread.
+    """
+    if ((config or {}).get('configurable') or {}).get('resumed'):
+        return RESUME
+    messages = state.get('messages', [])
+    opening = sum(isinstance(message, HumanMessage) for message in messages) == 1
+    # later iterations of the first turn follow model output, so they count as under way
+    if opening and isinstance(messages[-1], HumanMessage):
+        return NEW
+    return IN_PROGRESS
+
+
+def is_retryable(error: Exception) -> bool:
+    """Provider errors worth retrying: timeouts, conflicts, rate limits, server errors and lost connections."""
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status in (408, 409, 429) or status >= 500
+    return isinstance(error, openai.APIConnectionError)
+
+
+def retry_after(error: Exception) -> float | None:
+    """Seconds the provider asked to wait before retrying, if it said."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(model_input) -> int:
+    """Approximate tokens a call will use: its input messages plus the expected output."""
+    try:
+        input_tokens = count_tokens_approximately(model_input) if isinstance(model_input, list) else 0
+    except Exception:
+        input_tokens = 0
+    return input_tokens + LLM_EXPECTED_OUTPUT_TOKENS
+
+
+class TokenBucket:
+    """
+    Bucket holding up to a minute's budget, refilled continuously at per_minute. A per_minute of 0
+    means unlimited. Amounts above the capacity are capped so they can still be admitted.
+    """
+
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available, 0 if it is now."""
+        if not self.capacity:
+            return 0.0
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float):
+        if self.capacity:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Charge (or refund, if negative) the difference between estimated and actual usage."""
+        if self.capacity:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+    def drain(self):
+        if self.capacity:
+            self._refill()
+            self.level = min(self.level, 0.0)
+
+
+class ScheduledModel:
+    """Wraps a chat model (or runnable) so its ainvoke calls go through a scheduler."""
+
+    def __init__(self, scheduler, model, priority: int):
+        self.scheduler = scheduler
+        self.model = model
+        self.priority = priority
+
+    async def ainvoke(self, model_input, *args, **kwargs):
+        return await self.scheduler.run(
+            lambda: self.model.ainvoke(model_input, *args, **kwargs),
+            tokens=estimate_tokens(model_input),
+            priority=self.priority,
+        )
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls against RPM and TPM token buckets from a priority queue.
+
+    A call is admitted immediately when nothing is queued and both budgets allow it. Otherwise it
+    waits in a heap ordered by (priority, arrival), and the head is admitted once both buckets
+    have refilled enough. Token charges are estimated on admission and corrected with the actual
+    usage of the response.
+
+    Models are built with the SDK's own retries disabled, so retries happen here: a retryable
+    failure waits for the provider's Retry-After or a full-jitter exponential backoff, then is
+    admitted again at its priority. A provider 429 also drains both buckets so queued calls back
+    off together.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 0,
+        tpm: float = 0,
+        max_retries: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        clock=time.monotonic,
+    ):
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._queue: list[tuple[int, int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._stats: dict[int, dict] = {}
+        self.max_queue_depth = 0
+        self.rate_limited = 0
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def wrap(self, model, priority: int) -> ScheduledModel:
+        return ScheduledModel(self, model, priority)
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def _admit(self, tokens: int):
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(not future.cancelled() for *_, future in self._queue)
+
+    def _dispatch(self):
+        self._timer = None
+        while self._queue:
+            _, _, tokens, future = self._queue[0]
+            if future.cancelled():
+                heapq.heappop(self._queue)
+                continue
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            self._admit(tokens)
+            future.set_result(None)
+
+    async def acquire(self, tokens: int, priority: int = NEW) -> float:
+        """Wait until the call may run; returns the seconds waited."""
+        start = time.perf_counter()
+        queued = bool(self.queue_depth) or self._wait_time(tokens) > 0
+        if not queued:
+            self._admit(tokens)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (priority, next(self._order), tokens, future))
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._dispatch()
+            await future
+
+        waited = time.perf_counter() - start
+        stats = self._stats.setdefault(priority, {'admitted': 0, 'queued': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0})
+        stats['admitted'] += 1
+        stats['queued'] += queued
+        stats['wait_seconds'] += waited
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+        if waited > 1:
+            logging.info(f"LLM call ({PRIORITY_NAMES.get(priority, priority)}) waited {waited:.2f}s for rate limits")
+        return waited
+
+    async def run(self, call, tokens: int, priority: int = NEW):
+        """
+        Run call() once admitted, charging `tokens` (estimated) against the TPM budget. call must
+        start a new model call each time, since retries call it again.
+        """
+        attempt = 0
+        while True:
+            await self.acquire(tokens, priority)
+            try:
+                result = await call()
+                break
+            except Exception as e:
+                if getattr(e, 'status_code', None) == 429:
+                    self.rate_limited += 1
+                    logging.warning("LLM provider rate limited a call, draining scheduler budgets")
+                    self.requests.drain()
+                    self.tokens.drain()
+                attempt += 1
+                if not is_retryable(e) or attempt > self.max_retries:
+                    raise
+                self.retries += 1
+                delay = retry_after(e) or self.backoff(attempt)
+                logging.warning(f"Retrying LLM call in {delay:.2f}s after failure: {e}")
+                await asyncio.sleep(delay)
+
+        usage = result.usage_metadata if isinstance(result, AIMessage) else None
+        if usage and usage.get('total_tokens'):
+            self.tokens.adjust(usage['total_tokens'] - tokens)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'rate_limited': self.rate_limited,
+            'retries': self.retries,
+            'priorities': {
+                PRIORITY_NAMES.get(priority, str(priority)): {
+                    **stats,
+                    'mean_wait_seconds': stats['wait_seconds'] / stats['admitted'],
+                }
+                for priority, stats in sorted(self._stats.items())
+            },
+        }
+
+    def clear(self):
+        self._stats.clear()
+        self.max_queue_depth = 0
+        self.rate_limited = 0
+        self.retries = 0
+
+
+LLM_SCHEDULER = LLMScheduler(rpm=LLM_RATE_LIMIT_RPM, tpm=LLM_RATE_LIMIT_TPM, max_retries=LLM_MAX_RETRIES)
@@ -23,11 +23,19 @@ Rules:
 - No markdown, no extra keys, no text outside JSON.
 """
 
-def get_task_executor_prompt():
-    current_datetime = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-    return f"""You are TaskExecutor. Fulfill user requests using available tools.
+def format_known_calendars(calendars: list[dict] | None) -> str:
+    if not calendars:
+        return ""
+    lines = [
+        "- " + ", ".join(f"{key}={value}" for key, value in calendar.items())
+        for calendar in calendars
+    ]
+    return "\nKnown calendars (already resolved, do not call list_calendars to find these):\n" + "\n".join(lines) + "\n"
 
-Current datetime: {current_datetime}
+
+# kept byte-identical across calls so providers can cache it as a prompt prefix;
+# anything that varies per request belongs in get_task_context
+TASK_EXECUTOR = """You are TaskExecutor. Fulfill user requests using available tools.
 
 Objectives:
 1. Understand the user's goal
@@ -37,14 +45,16 @@ Objectives:
 
 Defaults (never ask for these):
 - calendar_id: primary calendar (where primary=True)
-- start_time for list_events: {current_datetime}
+- start_time for list_events: the current datetime given in the request context
 - event duration: 30 minutes
 - event name: generate from context
 
 Rules:
 - Call prerequisite tools automatically (list_calendars for calendar_id, list_events for event_id)
+- Reuse tool results already in the conversation instead of calling the same tool again
 - Only list events from primary calendar unless explicitly asked
 - Ensure all required fields before calling write tools
+- If a tool reports the calendar service is degraded, tell the user it is temporarily unavailable and stop
 
 request_clarification:
 - ALWAYS use this tool for questions (never plain text)
@@ -58,6 +68,28 @@ Output:
 - After presenting results, STOP - no suggestions or alternatives
 """
 
+
+# single_call graph mode: the task executor makes the policy decision itself
+SINGLE_CALL_EXECUTOR = TASK_EXECUTOR + f"""
+Tool types:
+{TOOL_MAPPING}
+
+declare_tool_types:
+- Call it before any other tool (including request_clarification), in the same response as your first tool calls
+- Declare the smallest set of tool types the request needs
+- Calls to tools outside the declared tool types are rejected
+- If the request needs no tools, answer directly without declaring
+"""
+
+
+def get_task_context(calendars: list[dict] | None = None, now: datetime | None = None) -> str:
+    """Volatile request context, sent after the conversation so the prefix before it stays cacheable."""
+    # minute granularity, finer timestamps only defeat caching of repeated calls
+    current_datetime = (now or datetime.now()).strftime('%Y-%m-%dT%H:%M')
+    return f"""Request context:
+Current datetime: {current_datetime}
+{format_known_calendars(calendars)}"""
+
 if __name__ == "__main__":
     print(POLICY_ROUTER)
     pass
\ No newline at end of file
@@ -11,3 +11,12 @@ CLARIFICATION_TOOL_NAME = "request_clarification"
 def request_clarification(question: str, context: str = "") -> str:
     """Request clarification from the user when information is ambiguous."""
     return "Clarification pending"
+
+
+DECLARE_TOOL_TYPES_TOOL_NAME = "declare_tool_types"
+
+
+@tool
+def declare_tool_types(tool_types: list[str]) -> str:
+    """Declare the tool types this request needs before calling any other tool."""
+    return "Tool types declared"
@@ -3,6 +3,7 @@ Implementation of state shared across LangGraph nodes of the message assistant a
 """
 
 from typing import TypedDict, Literal, NotRequired, List, Any
+from langchain_core.messages import AIMessage
 from langgraph.graph import MessagesState
 
 
@@ -59,10 +60,37 @@ class PendingClarification(TypedDict):
 PendingAction = PendingApproval | PendingMCPElicitation | PendingClarification
 
 
+class PrefetchedResult(TypedDict):
+    """Result of a prerequisite tool call for an allowed tool type, injected by task_executor."""
+    tool_type: str
+    tool_name: str
+    args: dict[str, Any]
+    content: Any
+    # parsed list_calendars output, recorded only if the result is injected
+    calendars: NotRequired[list[dict[str, Any]]]
+
+
+class Speculation(TypedDict):
+    """First task_executor response computed in parallel with policy_router for guessed tool types."""
+    allowed_tool_types: List[str]
+    message: AIMessage
+
+
+class ContextSummary(TypedDict):
+    """Rolling summary of the turns of a thread up to and including message through_id."""
+    content: str
+    through_id: str
+
+
 class RequestState(MessagesState):
     allowed_tool_types: list[str]
+    user_id: NotRequired[str]
     pending_action: NotRequired[PendingAction]
     final_response: NotRequired[str]
     approval_outcome: NotRequired[ApprovalOutcome]
     auth_url: NotRequired[str]
+    prefetched: NotRequired[List[PrefetchedResult]]
+    speculation: NotRequired[Speculation | None]
+    context_summary: NotRequired[ContextSummary]
+    tool_call_corrections: NotRequired[int]
 
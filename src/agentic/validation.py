@@ -0,0 +1,82 @@
+"""
+Provides local validation of model tool calls against the tools' input schemas, so malformed
+calls are corrected by the model right away instead of after a human round trip and a server
+side error.
+"""
+
+import logging
+from jsonschema.validators import validator_for
+from langchain_core.messages import ToolMessage
+
+
+SKIPPED_MESSAGE = "Not executed because other tool calls in this step were invalid. Call it again if still needed."
+CORRECTIONS_EXHAUSTED_MESSAGE = (
+    "Sorry, I couldn't put together a valid request for this. "
+    "Please rephrase it or add details such as the calendar, date and time."
+)
+
+
+def tool_schema(tool) -> dict:
+    """Return a tool's input JSON schema (MCP tools carry it as a dict, LangChain tools as a model)."""
+    schema = tool.args_schema
+    if isinstance(schema, dict):
+        return schema
+    return tool.tool_call_schema.model_json_schema()
+
+
+class ToolCallValidator:
+    """
+    Validators for a fixed set of tools, compiled once from their input schemas.
+
+    Tools whose schema cannot be compiled are not validated locally.
+    """
+
+    def __init__(self, tools: list):
+        self.names = {tool.name for tool in tools}
+        self._validators = {}
+        for tool in tools:
+            try:
+                schema = tool_schema(tool)
+                cls = validator_for(schema)
+                cls.check_schema(schema)
+                self._validators[tool.name] = cls(schema)
+            except Exception as e:
+                logging.warning(f"not validating {tool.name} locally, bad input schema: {e}")
+
+    def errors(self, tool_call: dict) -> list[str]:
+        """Return human-readable problems with a tool call, empty if it is valid."""
+        if tool_call['name'] not in self.names:
+            return [f"unknown tool '{tool_call['name']}'; available tools: {sorted(self.names)}"]
+
+        validator = self._validators.get(tool_call['name'])
+        if validator is None:
+            return []
+        return [
+            f"{'/'.join(str(part) for part in error.absolute_path) or 'arguments'}: {error.message}"
+            for error in validator.iter_errors(tool_call['args'])
+        ]
+
+    def reject_invalid(self, tool_calls: list[dict]) -> list[ToolMessage]:
+        """
+        Return corrective ToolMessages answering every call if any call is invalid, else [].
+
+        Invalid calls get their validation errors; valid calls in the same step are not executed,
+        so the model can re-plan the whole step.
+        """
+        errors = {tc['id']: self.errors(tc) for tc in tool_calls}
+        if not any(errors.values()):
+            return []
+
+        logging.info(f"Rejected invalid tool calls: {[tc['name'] for tc in tool_calls if errors[tc['id']]]}")
+        return [
+            ToolMessage(
+                content=(
+                    f"Invalid arguments for {tc['name']}: " + "; ".join(errors[tc['id']]) + ". Fix the call and try again."
+                    if errors[tc['id']] else SKIPPED_MESSAGE
+                ),
+                name=tc['name'],
+                tool_call_id=tc['id'],
+                status='error',
+            )
+            for tc in tool_calls
+        ]
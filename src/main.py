@@ -2,11 +2,26 @@
 Entrypoint for the FastAPI server.
 """
 
+import json
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Response, status
+from fastapi.responses import StreamingResponse
 from utils.models import RunBody, ResumeBody, AgentResponse
-from agentic.graph import run_graph, resume_graph
+from agentic.graph import run_graph, resume_graph, stream_run, stream_resume
 from agentic.state import NO_ACTION
+from agentic.config import (
+    LLM_HTTP_CLIENT, LLM_WARMUP_REQUESTS, TASK_EXECUTOR_MODEL, POLICY_ROUTER_MODEL, STRONG_MODEL, SUMMARY_MODEL,
+)
+from agentic.metrics import PROMPT_CACHE_METRICS, RUN_METRICS, record_run
+from agentic.calendars import CALENDARS
+from agentic.cascade import MODEL_CASCADE
+from agentic.policy_cache import POLICY_CACHE
+from agentic.response_cache import RESPONSE_CACHE
+from agentic.scheduler import LLM_SCHEDULER
+from mcp_module.adapter import CLIENT, CATALOG, RESULT_CACHE, CIRCUIT_BREAKER
+from utils.http_clients import warm_up_models
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,71 +31,88 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # open warm MCP sessions and LLM connections before serving, and close them on shutdown
+    await asyncio.gather(
+        CLIENT.start(),
+        warm_up_models([TASK_EXECUTOR_MODEL, POLICY_ROUTER_MODEL, STRONG_MODEL, SUMMARY_MODEL], LLM_WARMUP_REQUESTS),
+    )
+    yield
+    await CALENDARS.flush()
+    await CLIENT.close()
+    await LLM_HTTP_CLIENT.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 @app.get('/health-check')
 async def health():
     return "Server is healthy"
 
 
-@app.post('/run', response_model=AgentResponse)
-async def run(body: RunBody, response: Response):
+@app.get('/metrics')
+async def metrics():
     """
-    Initiate a fresh user request.
+    Aggregated performance metrics since startup: per-node run accounting, caches, the model
+    cascade, the LLM scheduler, the MCP circuit breaker and MCP replica balancing.
     """
-    final_state = await run_graph(
-        thread_id=body.thread_id,
-        initial_request=body.user_request
-    )
-
+    return {
+        'runs': RUN_METRICS.stats(),
+        'prompt_cache': PROMPT_CACHE_METRICS.stats(),
+        'model_cascade': MODEL_CASCADE.stats(),
+        'policy_cache': POLICY_CACHE.stats(),
+        'response_cache': RESPONSE_CACHE.stats(),
+        'tool_result_cache': RESULT_CACHE.stats(),
+        'tool_catalog': CATALOG.stats(),
+        'circuit_breaker': CIRCUIT_BREAKER.stats(),
+        'mcp_replicas': CLIENT.replica_stats(),
+        'llm_scheduler': LLM_SCHEDULER.stats(),
+    }
+
+
+def build_agent_response(final_state, thread_id: str) -> tuple[int, AgentResponse]:
+    """Map the state a graph run ended in to an HTTP status code and AgentResponse."""
     pending = final_state.get('pending_action', NO_ACTION)
 
     if pending['kind'] == 'clarification':
-        response.status_code = status.HTTP_202_ACCEPTED
-        return AgentResponse(
+        return status.HTTP_202_ACCEPTED, AgentResponse(
             status="clarification_required",
-            thread_id=body.thread_id,
+            thread_id=thread_id,
             pending_action=pending
         )
 
     if pending['kind'] == 'confirmation':
-        response.status_code = status.HTTP_202_ACCEPTED
-        return AgentResponse(
+        return status.HTTP_202_ACCEPTED, AgentResponse(
             status="confirmation_required",
-            thread_id=body.thread_id,
+            thread_id=thread_id,
             pending_action=pending
         )
 
     auth_url = final_state.get('auth_url')
     if auth_url:
-        response.status_code = status.HTTP_202_ACCEPTED
-        return AgentResponse(
+        return status.HTTP_202_ACCEPTED, AgentResponse(
             status="oauth_required",
-            response=final_state['final_response'],
+            response=final_state.get('final_response'),
             url=auth_url,
         )
 
-    return AgentResponse(
+    return status.HTTP_200_OK, AgentResponse(
         status="success",
-        response=final_state['final_response']
+        response=final_state.get('final_response', 'Action completed.')
     )
 
 
-@app.post('/resume', response_model=AgentResponse)
-async def resume(body: ResumeBody, response: Response):
-    """
-    Resume a paused graph execution with user approval or clarification responses.
-
-    Used to continue after human_confirmation or human_clarification interrupt.
-    """
+def build_resume_data(body: ResumeBody):
+    """Turn a resume body into the payload the interrupted node expects, or None if it has neither."""
     if body.clarification_responses is not None:
-        resume_data = {
+        return {
             'responses': [
                 {'call_id': r.call_id, 'response': r.response}
                 for r in body.clarification_responses
             ]
         }
-    elif body.approvals is not None:
-        resume_data = [
+    if body.approvals is not None:
+        return [
             {
                 'call_id': a.call_id,
                 'approved': a.approved,
@@ -88,51 +120,92 @@ async def resume(body: ResumeBody, response: Response):
             }
             for a in body.approvals
         ]
-    else:
-        response.status_code = status.HTTP_400_BAD_REQUEST
-        return AgentResponse(
-            status="error",
-            message="Must provide approvals or clarification_responses"
-        )
+    return None
+
 
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_agent_events(events, thread_id: str, debug: bool = False):
+    """
+    Encode graph stream events as SSE: 'token' events carry response text as it is generated, and
+    a final event named after the AgentResponse status carries the AgentResponse itself (with the
+    run summary when debug is set).
+    """
     try:
-        final_state = await resume_graph(
+        with record_run() as recorder:
+            async for kind, payload in events:
+                if kind == 'token':
+                    yield sse_event('token', {'content': payload})
+                else:
+                    _, agent_response = build_agent_response(payload, thread_id)
+                    if debug:
+                        agent_response.debug = recorder.summary()
+                    yield sse_event(agent_response.status, agent_response.model_dump(exclude_none=True))
+    except Exception as e:
+        logging.error(f"Stream error: {e}")
+        yield sse_event('error', AgentResponse(status="error", message=str(e)).model_dump(exclude_none=True))
+
+
+@app.post('/run', response_model=AgentResponse)
+async def run(body: RunBody, response: Response):
+    """
+    Initiate a fresh user request.
+    """
+    with record_run() as recorder:
+        final_state = await run_graph(
             thread_id=body.thread_id,
-            resume_data=resume_data
+            initial_request=body.user_request,
+            user_id=body.user_id
         )
 
-        pending = final_state.get('pending_action', NO_ACTION)
+    response.status_code, agent_response = build_agent_response(final_state, body.thread_id)
+    if body.debug:
+        agent_response.debug = recorder.summary()
+    return agent_response
 
-        if pending['kind'] == 'clarification':
-            response.status_code = status.HTTP_202_ACCEPTED
-            return AgentResponse(
-                status="clarification_required",
-                thread_id=body.thread_id,
-                pending_action=pending
-            )
 
-        if pending['kind'] == 'confirmation':
-            response.status_code = status.HTTP_202_ACCEPTED
-            return AgentResponse(
-                status="confirmation_required",
-                thread_id=body.thread_id,
-                pending_action=pending
-            )
+@app.post('/run/stream')
+async def run_stream(body: RunBody):
+    """
+    Initiate a fresh user request, streaming the response as server-sent events.
+    """
+    events = stream_run(
+        thread_id=body.thread_id,
+        initial_request=body.user_request,
+        user_id=body.user_id
+    )
+    return StreamingResponse(stream_agent_events(events, body.thread_id, body.debug), media_type='text/event-stream')
 
-        auth_url = final_state.get('auth_url')
-        if auth_url:
-            response.status_code = status.HTTP_202_ACCEPTED
-            return AgentResponse(
-                status="oauth_required",
-                response=final_state.get('final_response'),
-                url=auth_url,
-            )
 
+@app.post('/resume', response_model=AgentResponse)
+async def resume(body: ResumeBody, response: Response):
+    """
+    Resume a paused graph execution with user approval or clarification responses.
+
+    Used to continue after human_confirmation or human_clarification interrupt.
+    """
+    resume_data = build_resume_data(body)
+    if resume_data is None:
+        response.status_code = status.HTTP_400_BAD_REQUEST
         return AgentResponse(
-            status="success",
-            response=final_state.get('final_response', 'Action completed.')
+            status="error",
+            message="Must provide approvals or clarification_responses"
         )
 
+    try:
+        with record_run() as recorder:
+            final_state = await resume_graph(
+                thread_id=body.thread_id,
+                resume_data=resume_data
+            )
+
+        response.status_code, agent_response = build_agent_response(final_state, body.thread_id)
+        if body.debug:
+            agent_response.debug = recorder.summary()
+        return agent_response
+
     except Exception as e:
         logging.error(f"Resume error: {e}")
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -141,3 +214,19 @@ async def resume(body: ResumeBody, response: Response):
             message=str(e)
         )
 
+
+@app.post('/resume/stream')
+async def resume_stream(body: ResumeBody, response: Response):
+    """
+    Resume a paused graph execution, streaming the response as server-sent events.
+    """
+    resume_data = build_resume_data(body)
+    if resume_data is None:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return AgentResponse(
+            status="error",
+            message="Must provide approvals or clarification_responses"
+        )
+
+    events = stream_resume(thread_id=body.thread_id, resume_data=resume_data)
+    return StreamingResponse(stream_agent_events(events, body.thread_id, body.debug), media_type='text/event-stream')
@@ -4,54 +4,141 @@ be referenced and used by model nodes.
 """
 
 import os
-import asyncio
 from dotenv import load_dotenv
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp_module.pool import PooledMCPClient
+from mcp_module.catalog import ToolCatalog
+from mcp_module.cache import ToolResultCache
+from mcp_module.singleflight import SingleFlight
+from mcp_module.breaker import CircuitBreaker, RetryPolicy
 
 load_dotenv()
 ASSISTANT_MCP = os.getenv('ASSISTANT_MCP_URL')
+# equivalent assistant-mcp replicas; falls back to ASSISTANT_MCP_URL
+ASSISTANT_MCP_URLS = [url.strip() for url in os.getenv('ASSISTANT_MCP_URLS', '').split(',') if url.strip()] or [ASSISTANT_MCP]
+MCP_BALANCER_STRATEGY = os.getenv('MCP_BALANCER_STRATEGY', 'least_outstanding')
+MCP_REPLICA_EJECT_AFTER = int(os.getenv('MCP_REPLICA_EJECT_AFTER', '3'))
+MCP_REPLICA_EJECT_SECONDS = float(os.getenv('MCP_REPLICA_EJECT_SECONDS', '30'))
+MCP_STICKY_ROUTING = os.getenv('MCP_STICKY_ROUTING', 'true').lower() == 'true'
+MCP_POOL_MIN_SIZE = int(os.getenv('MCP_POOL_MIN_SIZE', '1'))
+MCP_POOL_MAX_SIZE = int(os.getenv('MCP_POOL_MAX_SIZE', '8'))
+MCP_POOL_IDLE_TIMEOUT = float(os.getenv('MCP_POOL_IDLE_TIMEOUT', '300'))
+MCP_TOOLS_TTL = float(os.getenv('MCP_TOOLS_TTL', '300'))
+MCP_RESULT_CACHE_TTL = float(os.getenv('MCP_RESULT_CACHE_TTL', '60'))
+MCP_RESULT_CACHE_SIZE = int(os.getenv('MCP_RESULT_CACHE_SIZE', '1024'))
+MCP_BREAKER_FAILURE_RATE = float(os.getenv('MCP_BREAKER_FAILURE_RATE', '0.5'))
+MCP_BREAKER_MIN_CALLS = int(os.getenv('MCP_BREAKER_MIN_CALLS', '10'))
+MCP_BREAKER_WINDOW = float(os.getenv('MCP_BREAKER_WINDOW', '30'))
+MCP_BREAKER_OPEN_SECONDS = float(os.getenv('MCP_BREAKER_OPEN_SECONDS', '15'))
+MCP_BREAKER_SLOW_CALL_SECONDS = float(os.getenv('MCP_BREAKER_SLOW_CALL_SECONDS', '10'))
+MCP_RETRY_ATTEMPTS = int(os.getenv('MCP_RETRY_ATTEMPTS', '3'))
 
-CLIENT = MultiServerMCPClient(
-    {
-        'assistant': {
-            'transport': 'http',
-            'url': ASSISTANT_MCP
-        }
-    }
-)
 TOOL_MAPPING = {
     'calendar': ["list_calendars", "list_events", "create_event", "update_event"],
 }
 HITL_TOOLS = {'create_event', 'update_event'}
+# side-effect free tools whose results can be cached
+READ_ONLY_TOOLS = {'list_calendars', 'list_events'}
+# per-tool deadlines in seconds, overriding TOOL_TIMEOUT_SECONDS
+TOOL_TIMEOUTS = {
+    'list_calendars': 10.0,
+    'list_events': 15.0,
+}
+# prerequisite read calls per tool type, prefetched once the policy router allowed it
+PREFETCH_TOOLS = {
+    'calendar': [('list_calendars', {})],
+}
+# (regex, weight) rules per tool type for the policy_router fast path; weights of matching rules
+# combine as 1 - prod(1 - weight) into the confidence that the request needs that tool type
+TOOL_TYPE_KEYWORDS = {
+    'calendar': [
+        (r'\bcalendars?\b', 0.8),
+        (r'\b(meetings?|events?|appointments?|invites?|agenda)\b', 0.6),
+        (r'\b(schedul\w*|reschedul\w*|book|cancel|postpone)\b', 0.5),
+        (r'\b(free|busy|availab\w*)\b', 0.4),
+        (r'\b(today|tonight|tomorrow|yesterday|this week|next week|(mon|tues|wednes|thurs|fri|satur|sun)day)\b', 0.3),
+        (r'\b\d{1,2}(:\d{2})?\s*(am|pm)\b', 0.3),
+    ],
+}
+# fields of each tool's JSON output the model needs; other fields are dropped before prompting
+TOOL_OUTPUT_FIELDS = {
+    'list_calendars': ['id', 'summary', 'primary', 'accessRole', 'timeZone'],
+    'list_events': ['id', 'summary', 'start', 'end', 'location', 'description', 'status', 'attendees'],
+}
+
+RESULT_CACHE = ToolResultCache(
+    read_tools=READ_ONLY_TOOLS,
+    write_tools=HITL_TOOLS,
+    maxsize=MCP_RESULT_CACHE_SIZE,
+    ttl=MCP_RESULT_CACHE_TTL,
+)
+# identical concurrent reads that miss the cache share one call to the server
+SINGLEFLIGHT = SingleFlight(tools=READ_ONLY_TOOLS)
+# reads are idempotent, so only they are retried; every attempt passes through the breaker
+RETRY_POLICY = RetryPolicy(tools=READ_ONLY_TOOLS, attempts=MCP_RETRY_ATTEMPTS)
+CIRCUIT_BREAKER = CircuitBreaker(
+    failure_rate=MCP_BREAKER_FAILURE_RATE,
+    min_calls=MCP_BREAKER_MIN_CALLS,
+    window=MCP_BREAKER_WINDOW,
+    open_seconds=MCP_BREAKER_OPEN_SECONDS,
+    slow_call_seconds=MCP_BREAKER_SLOW_CALL_SECONDS,
+)
+
 
-_tools_cache = None
-_cache_lock = asyncio.Lock()
+def create_client(urls: str | list[str]) -> PooledMCPClient:
+    """Build the pooled assistant MCP client for one or more replica urls, wired to the shared caches."""
+    urls = [urls] if isinstance(urls, str) else list(urls)
+    # sessions are pooled and kept warm, so tool listing and execution skip the initialize handshake
+    client = PooledMCPClient(
+        {
+            'assistant': {
+                'transport': 'http',
+                'url': urls[0]
+            }
+        },
+        min_size=MCP_POOL_MIN_SIZE,
+        max_size=MCP_POOL_MAX_SIZE,
+        idle_timeout=MCP_POOL_IDLE_TIMEOUT,
+        tool_interceptors=[RESULT_CACHE, SINGLEFLIGHT, RETRY_POLICY, CIRCUIT_BREAKER],
+        replicas={'assistant': urls},
+        balancer_options={
+            'strategy': MCP_BALANCER_STRATEGY,
+            'eject_after': MCP_REPLICA_EJECT_AFTER,
+            'eject_seconds': MCP_REPLICA_EJECT_SECONDS,
+            'sticky': MCP_STICKY_ROUTING,
+        },
+    )
+    client.add_tools_changed_listener(lambda server_name: invalidate_tools_cache('tools/list_changed'))
+    return client
+
+
+CLIENT = create_client(ASSISTANT_MCP_URLS)
+
+
+async def _load_all_tools():
+    # resolved at call time so the catalog always goes through the current CLIENT.get_tools
+    return await CLIENT.get_tools()
+
+
+CATALOG = ToolCatalog(_load_all_tools, ttl=MCP_TOOLS_TTL)
 
 
 async def get_tools(server_name: str = None, use_cache: bool = True):
-    """Get tools from MCP server with optional caching.
+    """Get tools from MCP server, reading through the shared tool catalog (CATALOG).
 
-    Only caches non-empty responses to avoid caching OAuth-needed states.
+    CATALOG holds the list for MCP_TOOLS_TTL, refreshes it in the background near expiry and is
+    invalidated on tools/list_changed and OAuth events. An empty list (e.g. OAuth still pending)
+    is returned but not cached, so the next call asks the server again. A server_name or
+    use_cache=False bypasses the catalog.
     """
-    global _tools_cache
-
-    if not use_cache:
+    if not use_cache or server_name is not None:
         return await CLIENT.get_tools(server_name=server_name)
 
-    async with _cache_lock:
-        if _tools_cache is not None:
-            return _tools_cache
-
-        tools = await CLIENT.get_tools(server_name=server_name)
-        if tools:
-            _tools_cache = tools
-        return tools
+    return await CATALOG.get()
 
 
-def invalidate_tools_cache():
+def invalidate_tools_cache(reason: str = "manual"):
     """Clear the tools cache. Call when tools may have changed."""
-    global _tools_cache
-    _tools_cache = None
+    CATALOG.invalidate(reason)
 
 
 if __name__ == '__main__':
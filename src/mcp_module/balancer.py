@@ -0,0 +1,144 @@
+"""
+Provides load balancing over equivalent MCP server replicas. Exposes the same session() interface
+as MCPSessionPool, so the pooled client can route calls across replicas without other changes.
+"""
+
+import time
+import logging
+from contextlib import asynccontextmanager
+from mcp.shared.exceptions import McpError
+from mcp_module.context import CURRENT_THREAD
+from utils.cache import TTLCache
+
+
+LEAST_OUTSTANDING = 'least_outstanding'
+EWMA = 'ewma'
+
+
+class Replica:
+    """One MCP endpoint with its session pool and passive health and load signals."""
+
+    def __init__(self, url: str, pool):
+        self.url = url
+        self.pool = pool
+        self.outstanding = 0
+        self.latency = None
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > time.monotonic()
+
+
+class ReplicaBalancer:
+    """
+    Routes sessions across replica pools, given as a mapping of URL to MCPSessionPool.
+
+    Picks the replica with the fewest outstanding requests, or with the lowest latency EWMA
+    weighted by outstanding requests. Replicas with eject_after consecutive transport failures are
+    ejected for eject_seconds; if every replica is ejected, the one ejected longest ago is used.
+    When sticky, calls bound to a thread keep going to the replica they first used (OAuth
+    elicitation state lives on that replica) unless it is ejected.
+    """
+
+    def __init__(
+        self,
+        pools: dict,
+        *,
+        strategy: str = LEAST_OUTSTANDING,
+        ewma_decay: float = 0.3,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        sticky: bool = True,
+        sticky_ttl: float = 3600.0,
+    ):
+        if strategy not in (LEAST_OUTSTANDING, EWMA):
+            raise ValueError(f"unknown balancing strategy: {strategy}")
+
+        self.replicas = [Replica(url, pool) for url, pool in pools.items()]
+        self.strategy = strategy
+        self.ewma_decay = ewma_decay
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.sticky = sticky
+        self._routes = TTLCache(maxsize=10_000, ttl=sticky_ttl)
+
+    async def start(self):
+        for replica in self.replicas:
+            try:
+                await replica.pool.start()
+            except Exception as e:
+                logging.warning(f"could not warm mcp replica {replica.url}: {e}")
+
+    async def close(self):
+        for replica in self.replicas:
+            await replica.pool.close()
+
+    def _score(self, replica: Replica) -> float:
+        if self.strategy == EWMA and replica.latency is not None:
+            return replica.latency * (replica.outstanding + 1)
+        return replica.outstanding
+
+    def choose(self) -> Replica:
+        thread_id = CURRENT_THREAD.get() if self.sticky else None
+        if thread_id is not None:
+            url = self._routes.get(thread_id)
+            replica = next((r for r in self.replicas if r.url == url), None)
+            if replica is not None and not replica.ejected:
+                return replica
+
+        healthy = [replica for replica in self.replicas if not replica.ejected]
+        if healthy:
+            replica = min(healthy, key=self._score)
+        else:
+            replica = min(self.replicas, key=lambda r: r.ejected_until)
+
+        if thread_id is not None:
+            self._routes.set(thread_id, replica.url)
+        return replica
+
+    @asynccontextmanager
+    async def session(self, headers: dict | None = None):
+        replica = self.choose()
+        replica.outstanding += 1
+        start = time.monotonic()
+        try:
+            async with replica.pool.session(headers) as session:
+                yield session
+        except McpError:
+            # protocol errors come from a responsive server
+            self._record_success(replica, time.monotonic() - start)
+            raise
+        except Exception:
+            self._record_failure(replica)
+            raise
+        else:
+            self._record_success(replica, time.monotonic() - start)
+        finally:
+            replica.outstanding -= 1
+
+    def _record_success(self, replica: Replica, elapsed: float):
+        replica.failures = 0
+        if replica.latency is None:
+            replica.latency = elapsed
+        else:
+            replica.latency += self.ewma_decay * (elapsed - replica.latency)
+
+    def _record_failure(self, replica: Replica):
+        replica.failures += 1
+        if replica.failures >= self.eject_after and not replica.ejected:
+            logging.warning(f"Ejecting mcp replica {replica.url} for {self.eject_seconds}s")
+            replica.ejected_until = time.monotonic() + self.eject_seconds
+            replica.failures = 0
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                'url': replica.url,
+                'outstanding': replica.outstanding,
+                'latency': replica.latency,
+                'ejected': replica.ejected,
+            }
+            for replica in self.replicas
+        ]
@@ -0,0 +1,189 @@
+"""
+Provides a circuit breaker and a retry policy for MCP tool calls, so a degraded MCP server makes
+calls fail fast instead of tying up every request until its deadline.
+"""
+
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from mcp.shared.exceptions import McpError
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the MCP server while the circuit is open."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"MCP service degraded: failing fast, retry in {retry_after:.0f}s")
+
+
+def is_transport_failure(e: Exception) -> bool:
+    # a JSON-RPC error (including OAuth elicitation) means the server is up and answering
+    return not isinstance(e, (McpError, CircuitOpenError))
+
+
+class CircuitBreaker:
+    """
+    Tool call interceptor tracking the failure rate of MCP calls over a sliding time window.
+
+    Opens once at least min_calls calls in the last window seconds failed at failure_rate or
+    more, and rejects calls with CircuitOpenError for open_seconds. It then lets up to
+    half_open_probes calls through; a successful probe closes the circuit, a failed one reopens
+    it. Calls slower than slow_call_seconds count as failures, even when cancelled by a deadline.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: float = 30.0,
+        open_seconds: float = 15.0,
+        half_open_probes: int = 1,
+        slow_call_seconds: float = 10.0,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.slow_call_seconds = slow_call_seconds
+
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logging.info("MCP circuit half-open, probing")
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def _admit(self) -> bool:
+        """Reserve a call slot; returns whether the call is a half-open probe."""
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_probes):
+            self.rejected += 1
+            raise CircuitOpenError(self.retry_after() or self.open_seconds)
+        if state == HALF_OPEN:
+            self._probes += 1
+            return True
+        return False
+
+    async def __call__(self, request, handler):
+        probe = self._admit()
+        start = time.monotonic()
+        try:
+            result = await handler(request)
+        except asyncio.CancelledError:
+            if time.monotonic() - start >= self.slow_call_seconds:
+                self.record(False, probe)
+            elif probe:
+                self._probes -= 1
+            raise
+        except Exception as e:
+            self.record(not is_transport_failure(e), probe)
+            raise
+
+        self.record(time.monotonic() - start < self.slow_call_seconds, probe)
+        return result
+
+    def record(self, ok: bool, probe: bool = False):
+        now = time.monotonic()
+        if probe:
+            if ok:
+                logging.info("MCP circuit closed after successful probe")
+                self._state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._trip(now)
+            return
+
+        self._outcomes.append((now, ok))
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+        if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._trip(now)
+
+    def _trip(self, now: float):
+        logging.warning(f"MCP circuit opened for {self.open_seconds}s")
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+
+    def stats(self) -> dict:
+        return {
+            'state': self.state,
+            'opened': self.opened,
+            'rejected': self.rejected,
+        }
+
+
+class RetryPolicy:
+    """
+    Tool call interceptor retrying idempotent read tools after transport failures.
+
+    Waits with full-jitter exponential backoff between attempts. Retries draw from a budget that
+    grows by budget_ratio per call, so retries cannot multiply load on an already struggling
+    server. Open circuits and JSON-RPC errors are never retried.
+    """
+
+    def __init__(
+        self,
+        tools: set[str],
+        attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 1.0,
+        budget_ratio: float = 0.2,
+        max_budget: float = 10.0,
+    ):
+        self.tools = tools
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self._budget = max_budget
+
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def __call__(self, request, handler):
+        if request.name not in self.tools:
+            return await handler(request)
+
+        self._budget = min(self.max_budget, self._budget + self.budget_ratio)
+        attempt = 0
+        while True:
+            try:
+                return await handler(request)
+            except Exception as e:
+                attempt += 1
+                if not is_transport_failure(e) or attempt >= self.attempts or self._budget < 1:
+                    raise
+                self._budget -= 1
+                self.retries += 1
+                delay = self.backoff(attempt)
+                logging.warning(f"Retrying {request.name} in {delay:.2f}s after failure: {e}")
+                await asyncio.sleep(delay)
@@ -0,0 +1,55 @@
+"""
+Provides a read-through cache for results of read-only MCP tools, invalidated whenever a write
+tool succeeds for the same user.
+"""
+
+import logging
+from mcp_module.context import CURRENT_USER, canonical_args
+from utils.cache import TTLCache
+
+
+class ToolResultCache:
+    """
+    Tool call interceptor caching results of read-only tools.
+
+    Entries are keyed by user, server, tool name and canonicalized arguments, and bounded by TTL
+    and LRU size. Error results are never cached. A successful call to any write tool drops every
+    cached entry for that user, since the data behind the reads may have changed.
+    """
+
+    def __init__(self, read_tools: set[str], write_tools: set[str], maxsize: int = 1024, ttl: float = 60.0):
+        self.read_tools = read_tools
+        self.write_tools = write_tools
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def __call__(self, request, handler):
+        user_id = CURRENT_USER.get()
+
+        if request.name in self.read_tools:
+            key = (user_id, request.server_name, request.name, canonical_args(request.args))
+            result = self.cache.get(key)
+            if result is not None:
+                logging.info(f"Tool result cache hit: {request.name}")
+                return result
+
+            result = await handler(request)
+            if not getattr(result, 'isError', True):
+                self.cache.set(key, result)
+            return result
+
+        result = await handler(request)
+        if request.name in self.write_tools and not getattr(result, 'isError', True):
+            self.invalidate_user(user_id)
+        return result
+
+    def invalidate_user(self, user_id: str) -> int:
+        dropped = self.cache.invalidate(lambda key: key[0] == user_id)
+        if dropped:
+            logging.info(f"Invalidated {dropped} cached tool results for user {user_id}")
+        return dropped
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return self.cache.stats()
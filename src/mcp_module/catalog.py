@@ -0,0 +1,100 @@
+"""
+Provides a shared, TTL-bound catalog of MCP tools, so nodes stop listing tools from the MCP server
+on every invocation.
+"""
+
+import time
+import asyncio
+import logging
+from utils.loop_local import LoopLocal
+
+
+class ToolCatalog:
+    """
+    Cache of the tool list returned by a loader coroutine.
+
+    Entries are served until ttl expires. Once an entry is older than refresh_after, it is still
+    served but a background refresh is started so callers rarely block on a reload. Empty tool
+    lists (e.g. while a server still needs OAuth) are returned but never cached.
+
+    Every newly stored tool list bumps version, which downstream caches use as part of their key.
+    """
+
+    def __init__(self, loader, ttl: float = 300.0, refresh_after: float | None = None):
+        self._loader = loader
+        self.ttl = ttl
+        self.refresh_after = refresh_after if refresh_after is not None else ttl * 0.8
+
+        self._tools = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = LoopLocal(asyncio.Lock)
+        self._refresh_task = None
+
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    async def get(self):
+        """Return the cached tool list, loading it on a miss."""
+        tools = self._tools
+        if tools is not None:
+            age = time.monotonic() - self._loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                if age >= self.refresh_after:
+                    self._schedule_refresh()
+                return tools
+
+        async with self._lock.get():
+            # another caller may have loaded the catalog while we waited
+            if self._tools is not None and time.monotonic() - self._loaded_at < self.ttl:
+                self.hits += 1
+                return self._tools
+
+            self.misses += 1
+            return await self._load()
+
+    async def _load(self):
+        generation = self._generation
+        tools = await self._loader()
+        # drop results from loads that raced with an invalidation
+        if tools and generation == self._generation:
+            self._tools = tools
+            self._loaded_at = time.monotonic()
+            self.version += 1
+        return tools
+
+    def _schedule_refresh(self):
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self):
+        async with self._lock.get():
+            try:
+                await self._load()
+                self.refreshes += 1
+            except Exception as e:
+                logging.warning(f"background tool catalog refresh failed: {e}")
+
+    def invalidate(self, reason: str = "manual"):
+        """Drop the cached tool list. Call when tools may have changed."""
+        logging.info(f"Invalidating tool catalog ({reason})")
+        self._tools = None
+        self._generation += 1
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'refreshes': self.refreshes,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,39 @@
+"""
+Provides request-scoped context for MCP tool calls. Interceptors run deep inside tool execution,
+so the caller's identity is carried in a context variable set by the tool node.
+"""
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+DEFAULT_USER_ID = 'default'
+
+CURRENT_USER: ContextVar[str] = ContextVar('mcp_current_user', default=DEFAULT_USER_ID)
+CURRENT_THREAD: ContextVar[str | None] = ContextVar('mcp_current_thread', default=None)
+
+
+@contextmanager
+def bind_user(user_id: str | None):
+    """Attribute MCP tool calls made inside the block to user_id."""
+    token = CURRENT_USER.set(user_id or DEFAULT_USER_ID)
+    try:
+        yield
+    finally:
+        CURRENT_USER.reset(token)
+
+
+@contextmanager
+def bind_thread(thread_id: str | None):
+    """Attribute MCP tool calls made inside the block to a conversation thread, for sticky routing."""
+    token = CURRENT_THREAD.set(thread_id)
+    try:
+        yield
+    finally:
+        CURRENT_THREAD.reset(token)
+
+
+def canonical_args(args: dict | None) -> str:
+    """Serialize tool arguments so that equivalent calls produce the same key."""
+    return json.dumps(args or {}, sort_keys=True, separators=(',', ':'), default=str)
@@ -0,0 +1,434 @@
+"""
+Provides pooled, long-lived MCP client sessions. Tool listing and tool execution borrow a warm,
+already-initialized session instead of paying a fresh HTTP connection and MCP initialize handshake
+on every call.
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.callbacks import CallbackContext
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import types
+from mcp.shared.exceptions import McpError
+from mcp_module.balancer import ReplicaBalancer
+
+
+class PooledSession:
+    """A warm MCP session whose transport is held open by a dedicated owner task."""
+
+    def __init__(self, session, stop: asyncio.Event, owner: asyncio.Task):
+        self.session = session
+        self.last_used = time.monotonic()
+        self._stop = stop
+        self._owner = owner
+
+    @property
+    def alive(self) -> bool:
+        return not self._owner.done()
+
+    async def close(self):
+        self._stop.set()
+        try:
+            await self._owner
+        except Exception as e:
+            logging.warning(f"error while closing pooled mcp session: {e}")
+
+
+def with_headers(connection: dict, headers: dict | None) -> dict:
+    """Connection config with extra HTTP headers merged over its own."""
+    if not headers:
+        return connection
+    return {**connection, 'headers': {**(connection.get('headers') or {}), **headers}}
+
+
+class MCPSessionPool:
+    """
+    Pool of initialized MCP sessions for a single server connection.
+
+    Keeps at least min_size sessions warm, never opens more than max_size, reaps sessions idle
+    for longer than idle_timeout, and pings sessions that have been idle for longer than
+    health_check_interval before handing them out again.
+
+    session_factory(headers=None) opens a session, with extra HTTP headers if given.
+    """
+
+    def __init__(
+        self,
+        connection: dict,
+        *,
+        min_size: int = 1,
+        max_size: int = 8,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+        session_factory=None,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f"invalid pool bounds: min_size={min_size}, max_size={max_size}")
+
+        self.connection = connection
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._session_factory = session_factory or self._connect
+
+        self._loop = None
+        self._cond = None
+        self._idle: list[PooledSession] = []
+        self._size = 0
+        self._reaper = None
+        self._closed = False
+
+    @asynccontextmanager
+    async def _connect(self, headers: dict | None = None):
+        async with create_session(with_headers(self.connection, headers)) as session:
+            await session.initialize()
+            yield session
+
+    def _bind_loop(self):
+        """(Re)bind pool state to the running event loop; sessions from a previous loop are unusable."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._cond = asyncio.Condition()
+            self._idle = []
+            self._size = 0
+            self._reaper = None
+            self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    async def start(self):
+        """Open min_size sessions up front and start the idle reaper."""
+        self._bind_loop()
+        await self._fill()
+        self._ensure_reaper()
+
+    async def close(self):
+        """Close every idle session and stop reaping. Sessions in use are closed on release."""
+        self._bind_loop()
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        async with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            await pooled.close()
+
+    @asynccontextmanager
+    async def session(self, headers: dict | None = None):
+        """
+        Borrow a session for the duration of the block.
+
+        Protocol-level errors (McpError) leave the transport healthy, so the session goes back to
+        the pool; any other failure or cancellation discards it. A session with extra headers
+        cannot be shared, so it is opened for the block only.
+        """
+        if headers:
+            async with self._session_factory(headers) as session:
+                yield session
+            return
+
+        pooled = await self._acquire()
+        try:
+            yield pooled.session
+        except McpError:
+            await self._release(pooled)
+            raise
+        except BaseException:
+            await self._discard(pooled)
+            raise
+        await self._release(pooled)
+
+    async def _open(self) -> PooledSession:
+        """
+        Open a session inside an owner task. The transport's context managers must be entered and
+        exited from the same task, so the owner holds them open until asked to stop.
+        """
+        ready = asyncio.get_running_loop().create_future()
+        stop = asyncio.Event()
+
+        async def owner():
+            try:
+                async with self._session_factory() as session:
+                    ready.set_result(session)
+                    await stop.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    logging.warning(f"pooled mcp session terminated: {e}")
+
+        task = asyncio.create_task(owner())
+        try:
+            session = await ready
+        except BaseException:
+            stop.set()
+            task.cancel()
+            raise
+        return PooledSession(session, stop, task)
+
+    async def _acquire(self) -> PooledSession:
+        self._bind_loop()
+        if self._closed:
+            raise RuntimeError("mcp session pool is closed")
+        self._ensure_reaper()
+
+        while True:
+            async with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    await self._cond.wait()
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._size += 1
+
+            if pooled is None:
+                try:
+                    return await self._open()
+                except BaseException:
+                    async with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            if await self._is_healthy(pooled):
+                return pooled
+            await self._discard(pooled)
+
+    async def _is_healthy(self, pooled: PooledSession) -> bool:
+        if not pooled.alive:
+            return False
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), self.health_check_timeout)
+            return True
+        except Exception as e:
+            logging.info(f"discarding unhealthy mcp session: {e}")
+            return False
+
+    async def _release(self, pooled: PooledSession):
+        pooled.last_used = time.monotonic()
+        if self._closed or not pooled.alive:
+            await self._discard(pooled)
+            return
+        async with self._cond:
+            # most recently used last, so acquire() hands out the warmest session
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    async def _discard(self, pooled: PooledSession):
+        async with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        await pooled.close()
+
+    async def _fill(self):
+        """Top the pool up to min_size warm sessions."""
+        while not self._closed:
+            async with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = await self._open()
+            except Exception:
+                async with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            await self._release(pooled)
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def _reap_forever(self):
+        interval = max(min(self.idle_timeout, self.health_check_interval) / 2, 0.01)
+        while not self._closed:
+            await asyncio.sleep(interval)
+            await self.reap()
+            try:
+                await self._fill()
+            except Exception as e:
+                logging.warning(f"could not refill mcp session pool: {e}")
+
+    async def reap(self):
+        """Close sessions idle for longer than idle_timeout, keeping min_size sessions open."""
+        now = time.monotonic()
+        async with self._cond:
+            expired = [
+                pooled for pooled in self._idle
+                if not pooled.alive or now - pooled.last_used > self.idle_timeout
+            ]
+            # never reap live sessions below min_size
+            keep = max(self.min_size - (self._size - len(expired)), 0)
+            live = [pooled for pooled in expired if pooled.alive]
+            expired = [pooled for pooled in expired if not pooled.alive] + live[keep:]
+
+            self._idle = [pooled for pooled in self._idle if pooled not in expired]
+            self._size -= len(expired)
+            if expired:
+                self._cond.notify(len(expired))
+
+        for pooled in expired:
+            await pooled.close()
+        if expired:
+            logging.info(f"reaped {len(expired)} idle mcp sessions")
+
+
+class PooledMCPClient(MultiServerMCPClient):
+    """
+    MultiServerMCPClient that lists and executes tools over pooled sessions.
+
+    Each configured server gets its own MCPSessionPool. A tool interceptor, installed innermost,
+    routes every tool call onto a borrowed session rather than the per-call session the base
+    client would open. Because sessions are long-lived, server notifications such as
+    tools/list_changed actually reach us and are forwarded to registered listeners.
+
+    Servers listed in replicas with more than one URL get a ReplicaBalancer over one pool per
+    URL instead, configured by balancer_options.
+    """
+
+    def __init__(
+        self,
+        connections: dict,
+        *,
+        min_size: int = 1,
+        max_size: int = 8,
+        idle_timeout: float = 300.0,
+        tool_interceptors: list | None = None,
+        replicas: dict[str, list[str]] | None = None,
+        balancer_options: dict | None = None,
+        **kwargs,
+    ):
+        super().__init__(
+            connections,
+            tool_interceptors=[*(tool_interceptors or []), self._call_on_pooled_session],
+            **kwargs
+        )
+        self._tools_changed_listeners = []
+        pool_options = {'min_size': min_size, 'max_size': max_size, 'idle_timeout': idle_timeout}
+        self.pools = {}
+        for name, connection in self.connections.items():
+            urls = (replicas or {}).get(name) or []
+            if len(urls) > 1:
+                self.pools[name] = ReplicaBalancer(
+                    {
+                        url: MCPSessionPool(
+                            {**connection, 'url': url},
+                            session_factory=self._session_factory(name, url),
+                            **pool_options,
+                        )
+                        for url in urls
+                    },
+                    **(balancer_options or {}),
+                )
+            else:
+                self.pools[name] = MCPSessionPool(
+                    connection,
+                    session_factory=self._session_factory(name),
+                    **pool_options,
+                )
+
+    def replica_stats(self) -> dict[str, list[dict]]:
+        """Per-replica load, latency and ejection of every server balanced across replicas."""
+        return {name: pool.stats() for name, pool in self.pools.items() if isinstance(pool, ReplicaBalancer)}
+
+    def add_tools_changed_listener(self, listener):
+        """Register a callable invoked with the server name on tools/list_changed notifications."""
+        self._tools_changed_listeners.append(listener)
+
+    def _message_handler(self, server_name: str):
+        async def handle(message):
+            if isinstance(message, types.ServerNotification) and \
+                    isinstance(message.root, types.ToolListChangedNotification):
+                logging.info(f"Tool list changed on mcp server '{server_name}'")
+                for listener in self._tools_changed_listeners:
+                    listener(server_name)
+        return handle
+
+    def _session_factory(self, server_name: str, url: str | None = None):
+        @asynccontextmanager
+        async def connect(headers: dict | None = None):
+            mcp_callbacks = self.callbacks.to_mcp_format(
+                context=CallbackContext(server_name=server_name)
+            )
+            connection = with_headers(dict(self.connections[server_name]), headers)
+            if url is not None:
+                connection['url'] = url
+            connection['session_kwargs'] = {
+                **connection.get('session_kwargs', {}),
+                'message_handler': self._message_handler(server_name),
+            }
+            async with create_session(connection, mcp_callbacks=mcp_callbacks) as session:
+                await session.initialize()
+                yield session
+        return connect
+
+    async def _call_on_pooled_session(self, request, handler):
+        """
+        Run a tool call on a pooled session, reporting progress to the client's callbacks. A call
+        whose headers an outer interceptor set cannot reuse the pooled connections; it gets a
+        session of its own with those headers, on the replica the balancer picks.
+        """
+        pool = self.pools.get(request.server_name)
+        if pool is None:
+            return await handler(request)
+        mcp_callbacks = self.callbacks.to_mcp_format(
+            context=CallbackContext(server_name=request.server_name, tool_name=request.name)
+        )
+        async with pool.session(request.headers) as session:
+            return await session.call_tool(
+                request.name, request.args, progress_callback=mcp_callbacks.progress_callback
+            )
+
+    async def _load_tools(self, server_name: str):
+        async with self.pools[server_name].session() as session:
+            return await load_mcp_tools(
+                session,
+                connection=self.connections[server_name],
+                callbacks=self.callbacks,
+                tool_interceptors=self.tool_interceptors,
+                server_name=server_name,
+                tool_name_prefix=self.tool_name_prefix,
+            )
+
+    async def get_tools(self, *, server_name: str | None = None):
+        """Get tools from one or all servers, listing them over pooled sessions."""
+        if server_name is not None and server_name not in self.connections:
+            raise ValueError(
+                f"Couldn't find a server with name '{server_name}', "
+                f"expected one of '{list(self.connections.keys())}'"
+            )
+
+        server_names = [server_name] if server_name is not None else list(self.connections)
+        tools_list = await asyncio.gather(*(self._load_tools(name) for name in server_names))
+        return [tool for tools in tools_list for tool in tools]
+
+    async def start(self):
+        """Warm every server's pool. Failures are logged so the app can start while a server is down."""
+        for name, pool in self.pools.items():
+            try:
+                await pool.start()
+            except Exception as e:
+                logging.warning(f"could not warm mcp session pool for '{name}': {e}")
+
+    async def close(self):
+        for pool in self.pools.values():
+            await pool.close()
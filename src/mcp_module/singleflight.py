@@ -0,0 +1,57 @@
+"""
+Provides singleflight coalescing of identical concurrent MCP tool calls, so a burst of requests
+for the same data results in a single call to the MCP server.
+"""
+
+import asyncio
+import logging
+from mcp_module.context import CURRENT_USER, canonical_args
+
+
+class SingleFlight:
+    """
+    Tool call interceptor sharing one in-flight call between identical concurrent callers.
+
+    Calls are identical when user, server, tool name and canonicalized arguments match. Only the
+    given side-effect free tools are coalesced. The shared call runs in its own task, so one
+    caller being cancelled does not cancel it for the others; every caller sees the same result
+    or exception.
+    """
+
+    def __init__(self, tools: set[str]):
+        self.tools = tools
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    async def __call__(self, request, handler):
+        if request.name not in self.tools:
+            return await handler(request)
+
+        key = (CURRENT_USER.get(), request.server_name, request.name, canonical_args(request.args))
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            self.calls += 1
+            task = asyncio.create_task(handler(request))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            logging.info(f"Coalesced in-flight tool call: {request.name}")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight),
+        }
@@ -2,7 +2,9 @@
 Provides shared helper functions.
 """
 
+import math
 from langchain_core.messages import AIMessage
+from mcp_module.context import DEFAULT_USER_ID
 
 
 def get_last_ai_message(state):
@@ -13,6 +15,22 @@ def get_last_ai_message(state):
     return None
 
 
+def get_user_id(state) -> str:
+    """Get the user a request belongs to, falling back to the default single-user identity."""
+    return state.get('user_id') or DEFAULT_USER_ID
+
+
+def get_thread_id(config) -> str | None:
+    """Get the conversation thread a graph invocation runs on, if any."""
+    return ((config or {}).get('configurable') or {}).get('thread_id')
+
+
+def cosine(a: list[float], b: list[float]) -> float:
+    """Cosine similarity of two vectors, 0.0 if either is zero."""
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(x * x for x in b))
+    return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+
 def tool_catalog(tools):
     return [
         {
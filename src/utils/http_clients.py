@@ -0,0 +1,82 @@
+"""
+Provides shared HTTP clients for LLM providers and warmup of their connection pools.
+"""
+
+import asyncio
+import logging
+import httpx
+
+
+def create_async_client(
+    max_connections: int = 100,
+    max_keepalive: int = 20,
+    keepalive_expiry: float = 120.0,
+    timeout: float = 60.0,
+    http2: bool = True,
+) -> httpx.AsyncClient:
+    """
+    Build a pooled async client meant to be shared by every model of a provider, so their calls
+    reuse kept-alive connections instead of each holding a cold pool of its own. HTTP/2 relies on
+    the h2 package from the httpx[http2] dependency.
+    """
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(timeout, connect=10.0),
+    )
+
+
+async def warm_up(client: httpx.AsyncClient, url: str, requests: int = 4, timeout: float = 5.0) -> int:
+    """
+    Send `requests` concurrent requests to url, paying DNS and TLS setup before the first real
+    call. Over HTTP/1.1 they open up to that many pooled connections; over HTTP/2 they share one.
+    Any HTTP response counts, since only the connection matters. Best effort: returns the number of
+    successful requests and never raises.
+    """
+    async def ping() -> bool:
+        try:
+            await client.get(url, timeout=timeout)
+            return True
+        except httpx.HTTPError as e:
+            logging.warning(f"LLM connection warmup to {url} failed: {e}")
+            return False
+
+    warmed = sum(await asyncio.gather(*(ping() for _ in range(requests))))
+    logging.info(f"Warmed {url} with {warmed}/{requests} requests")
+    return warmed
+
+
+def model_endpoint(model) -> tuple[httpx.AsyncClient, str] | None:
+    """The async HTTP client and base URL a chat model sends its requests with, if they can be found."""
+    # OpenAI models (openai SDK), including those on the shared client
+    sdk = getattr(model, 'root_async_client', None)
+    client = getattr(sdk, '_client', None)
+    if isinstance(client, httpx.AsyncClient):
+        return client, str(sdk.base_url)
+    # Gemini models (google-genai SDK)
+    api = getattr(getattr(model, 'client', None), '_api_client', None)
+    client = getattr(api, '_async_httpx_client', None)
+    if isinstance(client, httpx.AsyncClient):
+        return client, api._http_options.base_url
+    return None
+
+
+async def warm_up_models(models: list, requests: int = 4) -> int:
+    """
+    Warm every distinct (client, base URL) the given models use, so no provider pays its first
+    TLS handshake inside a request. Models without a known endpoint are skipped.
+    """
+    endpoints = {}
+    for model in models:
+        endpoint = model_endpoint(model) if model is not None else None
+        if endpoint is None:
+            if model is not None:
+                logging.info(f"No warmup for {type(model).__name__}, its HTTP client is unknown")
+            continue
+        client, url = endpoint
+        endpoints[(id(client), url)] = endpoint
+    return sum(await asyncio.gather(*(warm_up(client, url, requests) for client, url in endpoints.values())))
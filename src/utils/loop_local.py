@@ -0,0 +1,28 @@
+"""
+Provides a lazily created, per-event-loop asyncio primitive.
+"""
+
+import asyncio
+
+
+class LoopLocal:
+    """
+    Holds one object built by factory per running event loop.
+
+    asyncio locks, semaphores and conditions are bound to the loop they were first contended on,
+    so a module-level one breaks once a second loop uses it (each test, asyncio.run in a worker
+    thread). get() builds a fresh object whenever the running loop changes.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._loop = None
+        self._value = None
+
+    def get(self):
+        """Return the object for the running loop, creating it on first use in that loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._value = self._factory()
+        return self._value
@@ -14,12 +14,16 @@ class AgentResponse(BaseModel):
     pending_action: Optional[dict[str, Any]] = None
     url: Optional[str] = None
     message: Optional[str] = None
+    # per-node timings and token usage of the request, when asked for with debug
+    debug: Optional[dict[str, Any]] = None
 
 
 class RunBody(BaseModel):
     """Request body for initiating a new user request"""
     thread_id: str
     user_request: str
+    user_id: Optional[str] = None
+    debug: bool = False
 
 
 class ToolApproval(BaseModel):
@@ -40,3 +44,4 @@ class ResumeBody(BaseModel):
     thread_id: str
     approvals: Optional[List[ToolApproval]] = None
     clarification_responses: Optional[List[ClarificationResponse]] = None
+    debug: bool = False
@@ -0,0 +1,145 @@
+"""
+In-process stand-in for the assistant MCP server, used to benchmark the MCP transport path and
+use_tools offline. Serves the TOOL_MAPPING calendar tools over streamable HTTP with configurable
+per-tool latency, error rate and URL elicitation (-32042) responses.
+"""
+
+import random
+import socket
+import asyncio
+import threading
+import time
+import uvicorn
+from dataclasses import dataclass
+from typing import Callable
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import UrlElicitationRequiredError
+from mcp.types import ElicitRequestURLParams
+
+
+def fixed(seconds: float) -> Callable[[random.Random], float]:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Callable[[random.Random], float]:
+    """Right-skewed latency with the given median, closer to real API latency than uniform."""
+    return lambda rng: median * rng.lognormvariate(0, sigma)
+
+
+@dataclass
+class ToolBehavior:
+    """How a stand-in tool responds: a latency sampler plus error and elicitation rates."""
+    latency: Callable[[random.Random], float] = fixed(0.0)
+    error_rate: float = 0.0
+    elicitation_rate: float = 0.0
+
+
+class StubMCPServer:
+    """
+    Stand-in MCP server running on a background thread.
+
+    Behaviors can be changed between calls with configure(); a seeded RNG keeps latency and
+    failure sequences reproducible across runs. Calls per tool are counted in calls.
+    """
+
+    def __init__(self, seed: int = 0, host: str = '127.0.0.1'):
+        self.host = host
+        self.port = _free_port(host)
+        self.behaviors: dict[str, ToolBehavior] = {}
+        self.calls: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._seed = seed
+        self._server = None
+        self._thread = None
+        self.mcp = self._build()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/mcp"
+
+    def configure(self, tool_name: str, **behavior):
+        self.behaviors[tool_name] = ToolBehavior(**behavior)
+
+    def reset(self):
+        self.behaviors.clear()
+        self.calls.clear()
+        self._rng.seed(self._seed)
+
+    async def _respond(self, tool_name: str, payload: str) -> str:
+        self.calls[tool_name] = self.calls.get(tool_name, 0) + 1
+        behavior = self.behaviors.get(tool_name, ToolBehavior())
+
+        delay = max(0.0, behavior.latency(self._rng))
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._rng.random()
+        if roll < behavior.elicitation_rate:
+            raise UrlElicitationRequiredError([
+                ElicitRequestURLParams(
+                    message='Authorization required for your calendar',
+                    url=f'http://{self.host}:{self.port}/oauth/authorize',
+                    elicitationId=f'stub-{self.calls[tool_name]}',
+                )
+            ])
+        if roll < behavior.elicitation_rate + behavior.error_rate:
+            raise RuntimeError(f'injected {tool_name} failure')
+        return payload
+
+    def _build(self) -> FastMCP:
+        mcp = FastMCP('assistant-stub', host=self.host, port=self.port, log_level='WARNING')
+
+        @mcp.tool()
+        async def list_calendars() -> str:
+            """List all available calendars."""
+            return await self._respond(
+                'list_calendars',
+                '[{"id": "primary", "summary": "Primary Calendar", "primary": true}]',
+            )
+
+        @mcp.tool()
+        async def list_events(calendar_id: str = 'primary', start_time: str = None, end_time: str = None) -> str:
+            """List events from a calendar."""
+            return await self._respond(
+                'list_events',
+                '[{"id": "event1", "summary": "Team Meeting", "start": {"dateTime": "2024-01-15T10:00:00"}}]',
+            )
+
+        @mcp.tool()
+        async def create_event(calendar_id: str, summary: str, start_time: str, end_time: str = None, description: str = None) -> str:
+            """Create a new calendar event."""
+            return await self._respond('create_event', '{"id": "new_event", "status": "confirmed"}')
+
+        @mcp.tool()
+        async def update_event(calendar_id: str, event_id: str, summary: str = None, start_time: str = None, end_time: str = None) -> str:
+            """Update an existing calendar event."""
+            return await self._respond('update_event', '{"id": "' + event_id + '", "status": "updated"}')
+
+        return mcp
+
+    def start(self, timeout: float = 10.0):
+        config = uvicorn.Config(self.mcp.streamable_http_app(), host=self.host, port=self.port, log_level='warning')
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError('stub MCP server failed to start')
+            time.sleep(0.01)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
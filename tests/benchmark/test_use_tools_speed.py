@@ -0,0 +1,114 @@
+"""
+Speed benchmark tests for use_tools over the real MCP transport.
+Runs against the in-process stand-in MCP server, so no external service or API key is needed.
+"""
+
+import time
+import asyncio
+import statistics
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.graph import StateGraph, START, END
+from agentic.nodes.tool import use_tools
+from agentic.state import RequestState
+from mcp_module.adapter import TOOL_MAPPING
+from tests.benchmark.stub_mcp import lognormal
+
+
+def create_state(tool_name: str, args: dict, user_id: str = 'bench') -> dict:
+    return {
+        'messages': [AIMessage(content='', tool_calls=[{'name': tool_name, 'args': args, 'id': 'call_1'}])],
+        'allowed_tool_types': ['calendar'],
+        'user_id': user_id,
+    }
+
+
+@pytest.fixture
+def run_use_tools():
+    """Compiles a graph around use_tools using the real TOOL_MAPPING."""
+    builder = StateGraph(RequestState)
+    builder.add_node('use_tools', use_tools)
+    builder.add_edge(START, 'use_tools')
+    builder.add_edge('use_tools', END)
+    graph = builder.compile()
+
+    with patch('agentic.nodes.tool.TOOL_MAPPING', TOOL_MAPPING):
+        yield graph.ainvoke
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+@pytest.mark.asyncio
+async def test_list_events_latency(stub_mcp_client, run_use_tools, timing_threshold):
+    """Sequential list_events calls, each with distinct args so none are served from cache."""
+    stub_mcp_client.configure('list_events', latency=lognormal(0.02))
+    await run_use_tools(create_state('list_calendars', {}))
+
+    samples = []
+    for i in range(30):
+        start = time.perf_counter()
+        await run_use_tools(create_state('list_events', {'calendar_id': 'primary', 'start_time': f'2024-01-{i + 1:02d}'}))
+        samples.append(time.perf_counter() - start)
+
+    p50, p95 = statistics.median(samples), percentile(samples, 0.95)
+    print(f"\n[use_tools] list_events p50: {p50 * 1000:.1f}ms p95: {p95 * 1000:.1f}ms")
+
+    assert stub_mcp_client.calls['list_events'] == 30
+    assert p95 < timing_threshold['use_tools']
+
+
+@pytest.mark.asyncio
+async def test_burst_throughput(stub_mcp_client, run_use_tools, timing_threshold):
+    """Concurrent list_events calls from distinct users share the pooled sessions."""
+    stub_mcp_client.configure('list_events', latency=lognormal(0.05))
+    burst = 40
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_use_tools(create_state('list_events', {'calendar_id': 'primary'}, user_id=f'user-{i}'))
+        for i in range(burst)
+    ))
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[use_tools] burst of {burst}: {elapsed:.3f}s ({burst / elapsed:.1f} calls/s)")
+
+    assert all(isinstance(result['messages'][-1], ToolMessage) for result in results)
+    assert elapsed < timing_threshold['use_tools'] * 4
+
+
+@pytest.mark.asyncio
+async def test_identical_burst_coalesced(stub_mcp_client, run_use_tools):
+    """Identical concurrent reads for one user reach the server once."""
+    stub_mcp_client.configure('list_events', latency=lognormal(0.05))
+
+    await asyncio.gather(*(
+        run_use_tools(create_state('list_events', {'calendar_id': 'primary'}))
+        for _ in range(20)
+    ))
+
+    assert stub_mcp_client.calls['list_events'] == 1
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_become_error_messages(stub_mcp_client, run_use_tools):
+    """Tool failures surface as error ToolMessages instead of failing the step."""
+    stub_mcp_client.configure('list_events', error_rate=1.0)
+
+    result = await run_use_tools(create_state('list_events', {'calendar_id': 'primary'}))
+
+    assert result['messages'][-1].status == 'error'
+
+
+@pytest.mark.asyncio
+async def test_url_elicitation_starts_oauth(stub_mcp_client, run_use_tools):
+    """A -32042 response from the server is turned into an OAuth pending_action."""
+    stub_mcp_client.configure('list_events', elicitation_rate=1.0)
+
+    result = await run_use_tools(create_state('list_events', {'calendar_id': 'primary'}))
+
+    assert result['pending_action']['kind'] == 'oauth_url'
+    assert result['pending_action']['url'].endswith('/oauth/authorize')
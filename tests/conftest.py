@@ -5,8 +5,14 @@ Provides mock tools and fixtures decoupled from src definitions.
 
 import os
 import pytest
+import pytest_asyncio
 from unittest.mock import patch
 from langchain_core.tools import tool
+from agentic.calendars import CALENDARS
+from agentic.policy_cache import POLICY_CACHE
+from agentic.registry import TOOL_REGISTRY, ROUTING_REGISTRY
+from agentic.response_cache import RESPONSE_CACHE
+from mcp_module.adapter import CATALOG, RESULT_CACHE, create_client
 
 
 # mock tool mapping to decouple from src TOOL_MAPPING
@@ -84,12 +90,50 @@ def patch_hitl_tools():
 
 @pytest.fixture(autouse=True)
 def patch_tool_mapping():
-    """Patches TOOL_MAPPING in agent.py and prompts.py to use mock tools."""
+    """Patches TOOL_MAPPING in agent.py, tool.py and prompts.py to use mock tools."""
     with patch('agentic.nodes.agent.TOOL_MAPPING', MOCK_TOOL_MAPPING), \
+         patch('agentic.nodes.tool.TOOL_MAPPING', MOCK_TOOL_MAPPING), \
          patch('agentic.schema.prompts.TOOL_MAPPING', MOCK_TOOL_MAPPING):
         yield
 
 
+@pytest.fixture(autouse=True)
+def reset_tool_catalog():
+    """Clears the shared tool catalog and tool registries so cached tools never leak between tests."""
+    CATALOG.invalidate('test isolation')
+    TOOL_REGISTRY.clear()
+    ROUTING_REGISTRY.clear()
+    yield
+    CATALOG.invalidate('test isolation')
+    TOOL_REGISTRY.clear()
+    ROUTING_REGISTRY.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_calendar_directory():
+    """Keeps the per-user calendar directory in memory and empty for each test."""
+    with patch.object(CALENDARS, 'path', None):
+        CALENDARS.clear()
+        yield
+        CALENDARS.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_policy_cache():
+    """Clears cached policy decisions so a mocked decision never answers another test."""
+    POLICY_CACHE.clear()
+    yield
+    POLICY_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_response_cache():
+    """Clears cached final responses so a run never answers another test's request."""
+    RESPONSE_CACHE.clear()
+    yield
+    RESPONSE_CACHE.clear()
+
+
 @pytest.fixture
 def mock_mcp_client():
     """Patches CLIENT.get_tools to return mock tools, isolating LLM time from MCP latency."""
@@ -100,12 +144,39 @@ def mock_mcp_client():
         yield MOCK_TOOLS
 
 
+@pytest.fixture(scope='session')
+def stub_mcp_server():
+    """Starts the in-process stand-in MCP server once per session."""
+    from tests.benchmark.stub_mcp import StubMCPServer
+
+    server = StubMCPServer(seed=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest_asyncio.fixture
+async def stub_mcp_client(stub_mcp_server, monkeypatch):
+    """Points ASSISTANT_MCP_URL and the shared CLIENT at the stand-in server, with fresh behaviors and caches."""
+    stub_mcp_server.reset()
+    RESULT_CACHE.clear()
+    monkeypatch.setenv('ASSISTANT_MCP_URL', stub_mcp_server.url)
+
+    client = create_client(stub_mcp_server.url)
+    await client.start()
+    with patch('mcp_module.adapter.CLIENT', client):
+        yield stub_mcp_server
+    await client.close()
+    RESULT_CACHE.clear()
+
+
 @pytest.fixture
 def timing_threshold():
     """Returns max acceptable completion times in seconds for each node."""
     return {
         'policy_router': 5.0,
-        'task_executor': 16.0
+        'task_executor': 16.0,
+        'use_tools': 1.0,
     }
 
 
@@ -0,0 +1,171 @@
+"""
+Unit tests for the per-user calendar directory in agentic.calendars and its use by the nodes.
+"""
+
+import json
+import time
+import asyncio
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from agentic.calendars import CalendarDirectory, CALENDARS, parse_calendars
+from agentic.nodes.agent import prefetched_messages
+from agentic.nodes.tool import prefetch, record_calendars
+from agentic.schema.prompts import get_task_context
+
+
+CALENDARS_JSON = json.dumps([
+    {'id': 'alice@example.com', 'summary': 'Alice', 'primary': True, 'timeZone': 'Europe/Berlin', 'etag': 'x'},
+    {'id': 'team@example.com', 'summary': 'Team', 'timeZone': None},
+])
+
+
+class TestParsing:
+    """list_calendars output is reduced to the fields worth remembering."""
+
+    def test_parses_text_blocks(self):
+        calendars = parse_calendars([{'type': 'text', 'text': CALENDARS_JSON}])
+
+        assert calendars == [
+            {'id': 'alice@example.com', 'summary': 'Alice', 'primary': True, 'timeZone': 'Europe/Berlin'},
+            {'id': 'team@example.com', 'summary': 'Team'},
+        ]
+
+
+    def test_parses_items_wrapper(self):
+        assert parse_calendars(json.dumps({'items': [{'id': 'primary'}]})) == [{'id': 'primary'}]
+
+
+    def test_ignores_non_json(self):
+        assert parse_calendars('Authentication required.') == []
+
+
+class TestDirectory:
+    """Recording, expiry and persistence."""
+
+    def test_record_and_get_per_user(self):
+        directory = CalendarDirectory()
+
+        assert directory.record('alice', CALENDARS_JSON)
+        assert directory.get('alice')[0]['id'] == 'alice@example.com'
+        assert directory.get('bob') is None
+
+
+    def test_entries_expire(self):
+        directory = CalendarDirectory(ttl=60)
+        directory.record('alice', CALENDARS_JSON)
+
+        with patch('agentic.calendars.time.time', return_value=time.time() + 120):
+            assert directory.get('alice') is None
+
+
+    def test_persists_to_file(self, tmp_path):
+        path = str(tmp_path / 'calendars.json')
+        CalendarDirectory(path=path).record('alice', CALENDARS_JSON)
+
+        assert CalendarDirectory(path=path).get('alice')[0]['primary'] is True
+        assert [p.name for p in tmp_path.iterdir()] == ['calendars.json']
+
+
+    def test_unchanged_calendars_not_rewritten(self, tmp_path):
+        directory = CalendarDirectory(path=str(tmp_path / 'calendars.json'), ttl=60)
+        directory.record('alice', CALENDARS_JSON)
+
+        with patch.object(directory, '_write') as write:
+            assert not directory.record('alice', CALENDARS_JSON)
+            write.assert_not_called()
+
+            # past half the ttl the entry is refreshed
+            with patch('agentic.calendars.time.time', return_value=time.time() + 40):
+                assert directory.record('alice', CALENDARS_JSON)
+            write.assert_called_once()
+
+
+    @pytest.mark.asyncio
+    async def test_writes_off_loop_and_coalesced(self, tmp_path):
+        path = str(tmp_path / 'calendars.json')
+        directory = CalendarDirectory(path=path)
+
+        with patch('agentic.calendars.asyncio.to_thread', wraps=asyncio.to_thread) as to_thread:
+            directory.record('alice', CALENDARS_JSON)
+            directory.record('bob', CALENDARS_JSON)
+            await directory.flush()
+
+        assert to_thread.call_count == 1
+        assert set(json.load(open(path))) == {'alice', 'bob'}
+
+
+class TestNodeIntegration:
+    """Nodes record calendars and reuse them in later threads."""
+
+    def test_list_calendars_result_recorded(self):
+        message = ToolMessage(content=CALENDARS_JSON, name='list_calendars', tool_call_id='call_1')
+
+        record_calendars('alice', [message])
+
+        assert CALENDARS.get('alice') is not None
+
+
+    def test_error_result_not_recorded(self):
+        message = ToolMessage(content=CALENDARS_JSON, name='list_calendars', tool_call_id='call_1', status='error')
+
+        record_calendars('alice', [message])
+
+        assert CALENDARS.get('alice') is None
+
+
+    def test_context_lists_known_calendars(self):
+        prompt = get_task_context(calendars=parse_calendars(CALENDARS_JSON))
+
+        assert 'id=alice@example.com' in prompt
+        assert 'timeZone=Europe/Berlin' in prompt
+
+
+    @pytest.mark.asyncio
+    async def test_prefetch_skips_known_calendars(self):
+        calls = []
+
+        @tool
+        def list_calendars() -> str:
+            """List all available calendars."""
+            calls.append(1)
+            return CALENDARS_JSON
+
+        async def get_tools(server_name=None):
+            return [list_calendars]
+
+        CALENDARS.record('alice', CALENDARS_JSON)
+        state = {'messages': [HumanMessage(content='hi')], 'allowed_tool_types': ['calendar'], 'user_id': 'alice'}
+        with patch('mcp_module.adapter.CLIENT.get_tools', new=get_tools):
+            result = await prefetch(state)
+
+        assert result == {'prefetched': []}
+        assert calls == []
+
+
+    @pytest.mark.asyncio
+    async def test_prefetch_leaves_recording_to_injection(self):
+        @tool
+        def list_calendars() -> str:
+            """List all available calendars."""
+            return CALENDARS_JSON
+
+        async def get_tools(server_name=None):
+            return [list_calendars]
+
+        state = {'messages': [HumanMessage(content='hi')], 'allowed_tool_types': ['calendar'], 'user_id': 'alice'}
+        with patch('mcp_module.adapter.CLIENT.get_tools', new=get_tools):
+            result = await prefetch(state)
+
+        # a committed speculation would discard the result, so nothing is recorded yet
+        assert CALENDARS.get('alice') is None
+        assert result['prefetched'][0]['calendars'] == parse_calendars(CALENDARS_JSON)
+
+        prefetched_messages({**state, **result}, frozenset({'list_calendars'}))
+
+        assert CALENDARS.get('alice') == parse_calendars(CALENDARS_JSON)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
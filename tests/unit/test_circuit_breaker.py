@@ -0,0 +1,166 @@
+"""
+Unit tests for the MCP circuit breaker and retry policy in mcp_module.breaker.
+"""
+
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, ErrorData, TextContent
+from agentic.nodes.tool import use_tools, DEGRADED_MESSAGE
+from mcp_module.breaker import CircuitBreaker, CircuitOpenError, RetryPolicy, CLOSED, OPEN, HALF_OPEN
+
+
+READ_TOOL = 'mock_list_events'
+WRITE_TOOL = 'mock_create_event'
+
+
+def create_request(name: str = READ_TOOL) -> MCPToolCallRequest:
+    return MCPToolCallRequest(name=name, args={}, server_name='assistant')
+
+
+class FlakyHandler:
+    """Innermost handler failing with the given errors before succeeding."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self, request):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return CallToolResult(content=[TextContent(type='text', text='[]')], isError=False)
+
+
+async def fail_times(breaker: CircuitBreaker, count: int):
+    for _ in range(count):
+        with pytest.raises(ConnectionError):
+            await breaker(create_request(), FlakyHandler(ConnectionError('down')))
+
+
+class TestCircuitBreaker:
+    """Opening, fast failure and half-open probing."""
+
+    @pytest.mark.asyncio
+    async def test_opens_at_failure_rate(self):
+        breaker = CircuitBreaker(min_calls=4, failure_rate=0.5)
+
+        await breaker(create_request(), FlakyHandler())
+        await breaker(create_request(), FlakyHandler())
+        await fail_times(breaker, 2)
+
+        assert breaker.state == OPEN
+
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+        await fail_times(breaker, 2)
+        handler = FlakyHandler()
+
+        with pytest.raises(CircuitOpenError):
+            await breaker(create_request(), handler)
+
+        assert handler.calls == 0
+        assert breaker.stats()['rejected'] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_mcp_errors_do_not_count(self):
+        breaker = CircuitBreaker(min_calls=2)
+
+        for _ in range(3):
+            with pytest.raises(McpError):
+                await breaker(create_request(), FlakyHandler(McpError(ErrorData(code=-32042, message='auth'))))
+
+        assert breaker.state == CLOSED
+
+
+    @pytest.mark.asyncio
+    async def test_successful_probe_closes(self):
+        breaker = CircuitBreaker(min_calls=2, open_seconds=0)
+        await fail_times(breaker, 2)
+
+        assert breaker.state == HALF_OPEN
+        await breaker(create_request(), FlakyHandler())
+        assert breaker.state == CLOSED
+
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(min_calls=2, open_seconds=0)
+        await fail_times(breaker, 2)
+
+        await fail_times(breaker, 1)
+        assert breaker.stats()['opened'] == 2
+
+
+class TestRetryPolicy:
+    """Jittered retries for read tools only."""
+
+    @pytest.mark.asyncio
+    async def test_read_retried_until_success(self):
+        policy = RetryPolicy({READ_TOOL}, attempts=3, base_delay=0)
+        handler = FlakyHandler(ConnectionError('reset'), ConnectionError('reset'))
+
+        result = await policy(create_request(), handler)
+
+        assert not result.isError
+        assert handler.calls == 3
+
+
+    @pytest.mark.asyncio
+    async def test_write_not_retried(self):
+        policy = RetryPolicy({READ_TOOL}, attempts=3, base_delay=0)
+        handler = FlakyHandler(ConnectionError('reset'))
+
+        with pytest.raises(ConnectionError):
+            await policy(create_request(WRITE_TOOL), handler)
+        assert handler.calls == 1
+
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_not_retried(self):
+        policy = RetryPolicy({READ_TOOL}, attempts=3, base_delay=0)
+        handler = FlakyHandler(CircuitOpenError(10))
+
+        with pytest.raises(CircuitOpenError):
+            await policy(create_request(), handler)
+        assert handler.calls == 1
+
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_retries(self):
+        policy = RetryPolicy({READ_TOOL}, attempts=5, base_delay=0, max_budget=1)
+        handler = FlakyHandler(*[ConnectionError('reset')] * 5)
+
+        with pytest.raises(ConnectionError):
+            await policy(create_request(), handler)
+        assert handler.calls == 2
+
+
+class TestUseToolsFastFail:
+    """use_tools answers immediately while the circuit is open."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_returns_degraded_messages(self):
+        breaker = CircuitBreaker(min_calls=1, open_seconds=60)
+        await fail_times(breaker, 1)
+        state = {
+            'messages': [AIMessage(content='', tool_calls=[{'name': READ_TOOL, 'args': {}, 'id': 'call_1'}])],
+            'allowed_tool_types': ['calendar'],
+        }
+
+        with patch('agentic.nodes.tool.CIRCUIT_BREAKER', breaker):
+            result = await use_tools(state)
+
+        message = result['messages'][0]
+        assert message.content == DEGRADED_MESSAGE
+        assert message.tool_call_id == 'call_1'
+        assert message.status == 'error'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,202 @@
+"""
+Unit tests for context window management in agentic.context_window and the manage_context node.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
+from agentic.context_window import ContextWindow, BACKGROUND_SUMMARIES, SUMMARY_PREFIX, split_turns, collapse_turn
+from agentic.nodes.agent import manage_context
+
+
+def create_turn(n: int, tool_output: str = '[]') -> list:
+    """A finished turn: request, tool call, tool result, answer."""
+    return [
+        HumanMessage(content=f'request {n}', id=f'h{n}'),
+        AIMessage(content='', tool_calls=[{'id': f'call{n}', 'name': 'list_events', 'args': {}}], id=f'a{n}'),
+        ToolMessage(content=tool_output, name='list_events', tool_call_id=f'call{n}', id=f't{n}'),
+        AIMessage(content=f'answer {n}', id=f'r{n}'),
+    ]
+
+
+def count_messages(messages: list) -> int:
+    """Token counter that counts messages, to make budgets easy to reason about."""
+    return len(messages)
+
+
+def assert_paired(messages: list):
+    """Every ToolMessage answers a tool call of an earlier AIMessage, and every tool call is answered."""
+    calls = {tc['id'] for m in messages if isinstance(m, AIMessage) for tc in m.tool_calls}
+    answers = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    assert calls == answers
+
+
+class TestTurns:
+    """Finished turns collapse to the user's messages and the assistant's text answers."""
+
+    def test_split_at_human_messages(self):
+        turns = split_turns(create_turn(1) + create_turn(2))
+
+        assert [turn[0].id for turn in turns] == ['h1', 'h2']
+
+
+    def test_collapse_drops_tool_exchanges_and_filler(self):
+        turn = create_turn(1) + [
+            AIMessage(content='', tool_calls=[{'id': 'deferred', 'name': 'create_event', 'args': {}}], id='d1'),
+            ToolMessage(content='Deferred pending clarification.', tool_call_id='deferred', id='d2'),
+        ]
+
+        assert [m.id for m in collapse_turn(turn)] == ['h1', 'r1']
+
+
+class TestContextWindow:
+    """The view keeps recent turns verbatim and fits the budget by leaving out the oldest turns."""
+
+    def test_recent_turns_verbatim(self):
+        messages = create_turn(1) + create_turn(2) + create_turn(3)
+
+        view = ContextWindow(max_tokens=100, keep_turns=2, count_tokens=count_messages).view(messages)
+
+        assert [m.id for m in view] == ['h1', 'r1'] + [m.id for m in create_turn(2) + create_turn(3)]
+        assert_paired(view)
+
+
+    def test_oldest_turns_overflow(self):
+        messages = create_turn(1) + create_turn(2) + create_turn(3)
+
+        view, overflow = ContextWindow(max_tokens=6, keep_turns=1, count_tokens=count_messages).split(messages)
+
+        assert [m.id for m in view] == ['h2', 'r2'] + [m.id for m in create_turn(3)]
+        assert [turn[0].id for turn in overflow] == ['h1']
+
+
+    def test_current_turn_always_kept(self):
+        messages = create_turn(1)
+
+        view = ContextWindow(max_tokens=1, keep_turns=1, count_tokens=count_messages).view(messages)
+
+        assert view == messages
+
+
+    def test_summary_replaces_covered_turns(self):
+        messages = create_turn(1) + create_turn(2)
+        summary = {'content': 'User listed events.', 'through_id': 'r1'}
+
+        view = ContextWindow(max_tokens=100, count_tokens=count_messages).view(messages, summary)
+
+        assert view[0] == SystemMessage(content=SUMMARY_PREFIX + 'User listed events.')
+        assert view[1:] == create_turn(2)
+
+
+    @pytest.mark.asyncio
+    async def test_summarize_folds_overflow(self):
+        model = MagicMock()
+        model.ainvoke = AsyncMock(return_value=AIMessage(content='User asked about requests 1 and 2.'))
+        messages = create_turn(1) + create_turn(2) + create_turn(3)
+        window = ContextWindow(max_tokens=4, keep_turns=1, count_tokens=count_messages)
+
+        summary = await window.summarize(model, messages)
+
+        assert summary == {'content': 'User asked about requests 1 and 2.', 'through_id': 'r2'}
+        transcript = model.ainvoke.call_args[0][0][-1].content
+        assert 'answer 1' in transcript and 'answer 2' in transcript
+        assert window.view(messages, summary)[1:] == create_turn(3)
+
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_summarize(self):
+        model = MagicMock()
+        model.ainvoke = AsyncMock()
+
+        summary = await ContextWindow(max_tokens=100).summarize(model, create_turn(1))
+
+        assert summary is None
+        model.ainvoke.assert_not_called()
+
+
+class TestManageContext:
+    """manage_context summarizes in the background, hands the summary to the next turn and never fails the run."""
+
+    CONFIG = {'configurable': {'thread_id': 'thread-1'}}
+
+    @pytest.fixture(autouse=True)
+    def reset_background_summaries(self):
+        BACKGROUND_SUMMARIES.clear()
+        yield
+        BACKGROUND_SUMMARIES.clear()
+
+
+    @pytest.fixture
+    def window(self):
+        window = ContextWindow(max_tokens=4, keep_turns=1, count_tokens=count_messages)
+        with patch('agentic.nodes.agent.CONTEXT_WINDOW', window):
+            yield window
+
+
+    @pytest.mark.asyncio
+    async def test_summary_reaches_next_turn(self, window):
+        model = MagicMock()
+        model.ainvoke = AsyncMock(return_value=AIMessage(content='Earlier turns.'))
+        messages = create_turn(1) + create_turn(2)
+
+        with patch('agentic.nodes.agent.SUMMARY_MODEL', model):
+            first = await manage_context({'messages': messages}, self.CONFIG)
+            await BACKGROUND_SUMMARIES.wait('thread-1')
+            second = await manage_context({'messages': messages + create_turn(3)}, self.CONFIG)
+
+        assert first == {}
+        assert second == {'context_summary': {'content': 'Earlier turns.', 'through_id': 'r1'}}
+
+
+    @pytest.mark.asyncio
+    async def test_does_not_wait_for_the_model(self, window):
+        release = asyncio.Event()
+
+        async def slow_summary(messages):
+            await release.wait()
+            return AIMessage(content='Earlier turns.')
+
+        model = MagicMock()
+        model.ainvoke = slow_summary
+        messages = create_turn(1) + create_turn(2)
+
+        with patch('agentic.nodes.agent.SUMMARY_MODEL', model):
+            result = await asyncio.wait_for(manage_context({'messages': messages}, self.CONFIG), timeout=1)
+            # the summary is still running, so the next turn neither gets nor restarts it
+            assert await manage_context({'messages': messages}, self.CONFIG) == {}
+            release.set()
+            await BACKGROUND_SUMMARIES.wait('thread-1')
+
+        assert result == {}
+        assert BACKGROUND_SUMMARIES.take('thread-1')['content'] == 'Earlier turns.'
+
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_summarize(self, window):
+        model = MagicMock()
+        model.ainvoke = AsyncMock()
+
+        with patch('agentic.nodes.agent.SUMMARY_MODEL', model):
+            result = await manage_context({'messages': create_turn(1)}, self.CONFIG)
+
+        assert result == {}
+        model.ainvoke.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_failure_ignored(self, window):
+        model = MagicMock()
+        model.ainvoke = AsyncMock(side_effect=RuntimeError('model unavailable'))
+        messages = create_turn(1) + create_turn(2)
+
+        with patch('agentic.nodes.agent.SUMMARY_MODEL', model):
+            await manage_context({'messages': messages}, self.CONFIG)
+            await BACKGROUND_SUMMARIES.wait('thread-1')
+            result = await manage_context({'messages': messages}, self.CONFIG)
+
+        assert result == {}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
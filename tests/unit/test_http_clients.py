@@ -0,0 +1,111 @@
+"""
+Unit tests for the shared LLM HTTP client and its connection warmup (utils.http_clients).
+"""
+
+import httpx
+import pytest
+from langchain.chat_models import init_chat_model
+from utils.http_clients import create_async_client, warm_up, warm_up_models, model_endpoint
+
+
+class TestCreateAsyncClient:
+    """Pool limits and the HTTP version are applied."""
+
+    @pytest.mark.asyncio
+    async def test_pool_limits(self):
+        client = create_async_client(max_connections=10, max_keepalive=5, keepalive_expiry=30.0, http2=False)
+        pool = client._transport._pool
+
+        assert pool._max_connections == 10
+        assert pool._max_keepalive_connections == 5
+        assert pool._keepalive_expiry == 30.0
+        await client.aclose()
+
+
+    @pytest.mark.asyncio
+    async def test_http2_enabled(self):
+        client = create_async_client(http2=True)
+
+        assert client._transport._pool._http2 is True
+        await client.aclose()
+
+
+    @pytest.mark.asyncio
+    async def test_http2_disabled(self):
+        client = create_async_client(http2=False)
+
+        assert client._transport._pool._http2 is False
+        await client.aclose()
+
+
+class TestWarmUp:
+    """Warmup sends concurrent requests, counts any response and never raises."""
+
+    @pytest.mark.asyncio
+    async def test_any_response_counts(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(401)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            warmed = await warm_up(client, 'https://llm.example.com/v1', requests=3)
+
+        assert warmed == 3
+        assert len(requests) == 3
+        assert all(str(r.url) == 'https://llm.example.com/v1' for r in requests)
+
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_are_swallowed(self):
+        def handler(request):
+            raise httpx.ConnectError('unreachable', request=request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            warmed = await warm_up(client, 'https://llm.example.com/v1', requests=2)
+
+        assert warmed == 0
+
+
+class TestModelWarmUp:
+    """Every distinct endpoint of the configured models is warmed once."""
+
+    def test_openai_endpoint(self):
+        client = httpx.AsyncClient()
+        model = init_chat_model('openai:gpt-5-nano', http_async_client=client, base_url='https://llm.example.com/v1')
+
+        assert model_endpoint(model) == (client, 'https://llm.example.com/v1/')
+
+
+    def test_gemini_endpoint(self):
+        model = init_chat_model('google_genai:gemini-2.5-flash')
+
+        client, url = model_endpoint(model)
+        assert isinstance(client, httpx.AsyncClient)
+        assert url == 'https://generativelanguage.googleapis.com/'
+
+
+    @pytest.mark.asyncio
+    async def test_distinct_endpoints_warmed(self):
+        requests = []
+
+        def handler(request):
+            requests.append(str(request.url))
+            return httpx.Response(404)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            models = [
+                init_chat_model('openai:gpt-5-nano', http_async_client=client, base_url='https://a.example.com/v1'),
+                init_chat_model('openai:gpt-5-mini', http_async_client=client, base_url='https://a.example.com/v1'),
+                init_chat_model('openai:gpt-5-nano', http_async_client=client, base_url='https://b.example.com/v1'),
+                None,
+            ]
+            warmed = await warm_up_models(models, requests=2)
+
+        assert warmed == 4
+        assert sorted(requests) == ['https://a.example.com/v1/'] * 2 + ['https://b.example.com/v1/'] * 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,259 @@
+"""
+Unit tests for the LLM request scheduler (agentic.scheduler): token buckets, priority admission
+and its use by agent nodes.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from agentic.config import TASK_EXECUTOR_MODEL, POLICY_ROUTER_MODEL, SUMMARY_MODEL
+from agentic.nodes.agent import policy_router
+from agentic.schema.models import PolicyRouterOut
+from agentic.scheduler import (
+    TokenBucket, LLMScheduler, LLM_SCHEDULER, RESUME, IN_PROGRESS, NEW, BACKGROUND, request_priority, retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.fixture(autouse=True)
+def reset_scheduler_stats():
+    LLM_SCHEDULER.clear()
+    yield
+    LLM_SCHEDULER.clear()
+
+
+class TestTokenBucket:
+    """Buckets hold a minute's budget and refill continuously."""
+
+    def test_wait_time_and_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, clock=clock)
+
+        assert bucket.wait_time(60) == 0
+        bucket.take(60)
+        assert bucket.wait_time(1) == pytest.approx(1.0)
+
+        clock.now = 30
+        assert bucket.wait_time(30) == 0
+        assert bucket.wait_time(31) == pytest.approx(1.0)
+
+
+    def test_amounts_above_capacity_are_capped(self):
+        bucket = TokenBucket(per_minute=100, clock=FakeClock())
+
+        assert bucket.wait_time(1000) == 0
+        bucket.take(1000)
+        assert bucket.level == 0
+
+
+    def test_unlimited(self):
+        bucket = TokenBucket(per_minute=0, clock=FakeClock())
+        bucket.take(10 ** 6)
+
+        assert bucket.wait_time(10 ** 6) == 0
+
+
+    def test_adjust_and_drain(self):
+        bucket = TokenBucket(per_minute=600, clock=FakeClock())
+        bucket.take(100)
+        bucket.adjust(-50)
+        assert bucket.level == 550
+        bucket.adjust(-500)
+        assert bucket.level == 600
+
+        bucket.drain()
+        assert bucket.wait_time(60) == pytest.approx(6.0)
+
+
+class TestAdmission:
+    """Calls run immediately within budget and queue by priority beyond it."""
+
+    @pytest.mark.asyncio
+    async def test_unlimited_runs_immediately(self):
+        scheduler = LLMScheduler()
+        call = AsyncMock(return_value=AIMessage(content='ok'))
+
+        result = await scheduler.run(call, tokens=100)
+
+        assert result.content == 'ok'
+        stats = scheduler.stats()
+        assert stats['queue_depth'] == 0
+        assert stats['priorities']['new']['admitted'] == 1
+        assert stats['priorities']['new']['queued'] == 0
+
+
+    @pytest.mark.asyncio
+    async def test_priority_order_when_over_budget(self):
+        # 20 requests per second once the burst budget is used up
+        scheduler = LLMScheduler(rpm=1200)
+        scheduler.requests.drain()
+        admitted = []
+
+        async def call(name):
+            await scheduler.run(AsyncMock(side_effect=lambda: admitted.append(name)), tokens=10, priority=priority[name])
+
+        priority = {'new': NEW, 'background': BACKGROUND, 'in_progress': IN_PROGRESS, 'resume': RESUME}
+        tasks = [asyncio.create_task(call(name)) for name in priority]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 4
+
+        await asyncio.gather(*tasks)
+
+        assert admitted == ['resume', 'in_progress', 'new', 'background']
+        stats = scheduler.stats()
+        assert stats['max_queue_depth'] == 4
+        assert stats['priorities']['background']['max_wait_seconds'] > stats['priorities']['resume']['max_wait_seconds']
+
+
+    @pytest.mark.asyncio
+    async def test_tokens_budget_is_corrected_with_actual_usage(self):
+        scheduler = LLMScheduler(tpm=10_000)
+        response = AIMessage(content='ok', usage_metadata={'input_tokens': 2500, 'output_tokens': 500, 'total_tokens': 3000})
+
+        await scheduler.run(AsyncMock(return_value=response), tokens=1000)
+
+        assert scheduler.tokens.level == pytest.approx(7000, abs=1)
+
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_error_drains_budgets(self):
+        scheduler = LLMScheduler(rpm=600, tpm=10_000, max_retries=0)
+
+        with pytest.raises(RateLimitError):
+            await scheduler.run(AsyncMock(side_effect=RateLimitError()), tokens=100)
+
+        assert scheduler.stats()['rate_limited'] == 1
+        assert scheduler.requests.wait_time(1) > 0
+
+
+    @pytest.mark.asyncio
+    async def test_retryable_errors_are_retried(self):
+        scheduler = LLMScheduler(max_retries=2, base_delay=0.001)
+        call = AsyncMock(side_effect=[RateLimitError(), RateLimitError(), AIMessage(content='ok')])
+
+        result = await scheduler.run(call, tokens=100)
+
+        assert result.content == 'ok'
+        assert call.call_count == 3
+        stats = scheduler.stats()
+        assert stats['retries'] == 2
+        assert stats['priorities']['new']['admitted'] == 3
+
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded(self):
+        scheduler = LLMScheduler(max_retries=1, base_delay=0.001)
+        call = AsyncMock(side_effect=RateLimitError())
+
+        with pytest.raises(RateLimitError):
+            await scheduler.run(call, tokens=100)
+
+        assert call.call_count == 2
+
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self):
+        scheduler = LLMScheduler(base_delay=0.001)
+        call = AsyncMock(side_effect=ValueError('bad request'))
+
+        with pytest.raises(ValueError):
+            await scheduler.run(call, tokens=100)
+
+        assert call.call_count == 1
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiters_are_skipped(self):
+        scheduler = LLMScheduler(rpm=1200)
+        scheduler.requests.drain()
+
+        waiting = asyncio.create_task(scheduler.acquire(10, NEW))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.sleep(0)
+
+        assert scheduler.queue_depth == 0
+        await asyncio.wait_for(scheduler.acquire(10, NEW), timeout=1)
+
+
+class TestRequestPriority:
+    """Resumes outrank threads under way, which outrank new requests."""
+
+    def test_resumed_run(self):
+        state = {'messages': [HumanMessage(content='Hi')]}
+        assert request_priority(state, {'configurable': {'resumed': True}}) == RESUME
+
+
+    def test_opening_request(self):
+        assert request_priority({'messages': [HumanMessage(content='Hi')]}) == NEW
+
+
+    def test_later_iteration_of_first_turn(self):
+        state = {'messages': [
+            HumanMessage(content="What's on today?"),
+            AIMessage(content='', tool_calls=[{'id': 'call_1', 'name': 'list_events', 'args': {}}]),
+            ToolMessage(content='[]', tool_call_id='call_1'),
+        ]}
+        assert request_priority(state) == IN_PROGRESS
+
+
+    def test_follow_up_turn(self):
+        state = {'messages': [HumanMessage(content='Hi'), AIMessage(content='Hello!'), HumanMessage(content='Thanks')]}
+        assert request_priority(state) == IN_PROGRESS
+
+
+class TestRetryAfter:
+    """The provider's Retry-After header sets the retry delay."""
+
+    def test_header(self):
+        error = RateLimitError()
+        error.response = MagicMock(headers={'retry-after': '1.5'})
+        assert retry_after(error) == 1.5
+
+
+    def test_missing(self):
+        assert retry_after(RateLimitError()) is None
+
+
+class TestNodeScheduling:
+    """Agent node model calls are admitted by LLM_SCHEDULER with the request's priority."""
+
+    def test_models_leave_retries_to_the_scheduler(self):
+        assert TASK_EXECUTOR_MODEL.max_retries == POLICY_ROUTER_MODEL.max_retries == SUMMARY_MODEL.max_retries == 0
+
+
+    @pytest.mark.asyncio
+    async def test_policy_router_call_is_scheduled(self):
+        mock_structured = MagicMock()
+        mock_structured.ainvoke = AsyncMock(return_value=PolicyRouterOut(
+            decision='allow', note='calendar', allowed_tool_types=['calendar']
+        ))
+        mock_model = MagicMock()
+        mock_model.with_structured_output = MagicMock(return_value=mock_structured)
+        state = {'messages': [HumanMessage(content="What's on my calendar?")]}
+
+        with patch('agentic.nodes.agent.POLICY_FAST_PATH', False), \
+             patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_model):
+            await policy_router(state)
+            await policy_router({'messages': state['messages'] + [AIMessage(content='Nothing.'), HumanMessage(content='And tomorrow?')]})
+
+        priorities = LLM_SCHEDULER.stats()['priorities']
+        assert mock_structured.ainvoke.call_count == 2
+        assert priorities['new']['admitted'] == 1
+        assert priorities['in_progress']['admitted'] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,39 @@
+"""
+Unit tests for the per-event-loop holder in utils.loop_local.
+"""
+
+import asyncio
+import pytest
+from utils.loop_local import LoopLocal
+
+
+class TestLoopLocal:
+    """One object is built per running event loop."""
+
+    @pytest.mark.asyncio
+    async def test_same_loop_reuses_object(self):
+        lock = LoopLocal(asyncio.Lock)
+
+        assert lock.get() is lock.get()
+
+
+    def test_new_loop_gets_fresh_object(self):
+        lock = LoopLocal(asyncio.Lock)
+
+        async def use():
+            async with lock.get():
+                return lock.get()
+
+        first = asyncio.run(use())
+        second = asyncio.run(use())
+
+        assert first is not second
+
+
+    def test_get_outside_loop_raises(self):
+        with pytest.raises(RuntimeError):
+            LoopLocal(asyncio.Lock).get()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
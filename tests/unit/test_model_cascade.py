@@ -0,0 +1,192 @@
+"""
+Unit tests for the model cascade in agentic.cascade and its use by the agent nodes.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables.config import ensure_config
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from agentic.cascade import ModelCascade
+from agentic.nodes.agent import task_executor, policy_router, repeats_tool_calls
+from agentic.schema.models import PolicyRouterOut
+from tests.conftest import MOCK_TOOLS
+
+
+VALID_CALL = {'id': 'call_list_1', 'name': 'mock_list_events', 'args': {'calendar_id': 'primary'}}
+INVALID_CALL = {'id': 'call_list_2', 'name': 'mock_list_events', 'args': {}}
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+def create_task_model(response: AIMessage) -> tuple[MagicMock, MagicMock]:
+    mock_bound = MagicMock()
+    mock_bound.ainvoke = AsyncMock(return_value=response)
+
+    mock_model = MagicMock()
+    mock_model.bind_tools = MagicMock(return_value=mock_bound)
+    return mock_model, mock_bound
+
+
+def create_policy_model(response=None, error: Exception = None) -> MagicMock:
+    mock_structured = MagicMock()
+    mock_structured.ainvoke = AsyncMock(return_value=response, side_effect=error)
+
+    mock_model = MagicMock()
+    mock_model.with_structured_output = MagicMock(return_value=mock_structured)
+    return mock_model
+
+
+class TestModelCascade:
+    """Calls stay on the fast tier unless a check fails."""
+
+    @pytest.mark.asyncio
+    async def test_passing_check_stays_fast(self):
+        cascade = ModelCascade()
+
+        result = await cascade.run('node', ['fast', 'strong'], AsyncMock(side_effect=lambda model: model), check=lambda r: None)
+
+        assert result == 'fast'
+        assert cascade.stats()['node']['escalation_rate'] == 0.0
+        assert 'strong' not in cascade.stats()['node']['tiers']
+
+
+    @pytest.mark.asyncio
+    async def test_failing_check_escalates(self):
+        cascade = ModelCascade()
+
+        result = await cascade.run(
+            'node', ['fast', 'strong'],
+            AsyncMock(side_effect=lambda model: model),
+            check=lambda r: 'invalid_tool_call: x' if r == 'fast' else None,
+        )
+
+        stats = cascade.stats()['node']
+        assert result == 'strong'
+        assert stats['escalation_rate'] == 1.0
+        assert stats['reasons'] == {'invalid_tool_call': 1}
+        assert stats['tiers']['fast']['calls'] == stats['tiers']['strong']['calls'] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_last_tier_returned_unchecked(self):
+        cascade = ModelCascade()
+
+        result = await cascade.run('node', ['fast'], AsyncMock(return_value='bad'), check=lambda r: 'always')
+
+        assert result == 'bad'
+
+
+    @pytest.mark.asyncio
+    async def test_listed_errors_escalate(self):
+        cascade = ModelCascade()
+
+        async def call(model):
+            if model == 'fast':
+                raise OutputParserException('not json')
+            return 'parsed'
+
+        assert await cascade.run('node', ['fast', 'strong'], call, escalate_on=(OutputParserException,)) == 'parsed'
+
+
+    @pytest.mark.asyncio
+    async def test_attempts_tagged_in_metadata(self):
+        cascade = ModelCascade()
+        seen = []
+
+        async def call(model):
+            seen.append(ensure_config()['metadata'])
+            return model
+
+        await cascade.run('node', ['fast', 'strong'], call, check=lambda r: 'retry' if r == 'fast' else None)
+
+        assert seen == [
+            {'cascade_tier': 'fast', 'cascade_final': False},
+            {'cascade_tier': 'strong', 'cascade_final': True},
+        ]
+        assert 'cascade_tier' not in ensure_config().get('metadata', {})
+
+
+    @pytest.mark.asyncio
+    async def test_other_errors_raise(self):
+        cascade = ModelCascade()
+
+        with pytest.raises(RuntimeError):
+            await cascade.run('node', ['fast', 'strong'], AsyncMock(side_effect=RuntimeError('down')))
+
+
+class TestNoProgress:
+    """Repeating tool calls already made this turn counts as no progress."""
+
+    def test_repeated_calls_detected(self):
+        state = {'messages': [
+            HumanMessage(content='list my events'),
+            AIMessage(content='', tool_calls=[VALID_CALL]),
+            ToolMessage(content='[]', tool_call_id='call_list_1'),
+        ]}
+
+        assert repeats_tool_calls(state, AIMessage(content='', tool_calls=[{**VALID_CALL, 'id': 'call_list_3'}]))
+        assert not repeats_tool_calls(state, AIMessage(content='', tool_calls=[{**VALID_CALL, 'args': {'calendar_id': 'work'}}]))
+
+
+    def test_earlier_turns_ignored(self):
+        state = {'messages': [
+            HumanMessage(content='list my events'),
+            AIMessage(content='', tool_calls=[VALID_CALL]),
+            ToolMessage(content='[]', tool_call_id='call_list_1'),
+            AIMessage(content='No events.'),
+            HumanMessage(content='check again'),
+        ]}
+
+        assert not repeats_tool_calls(state, AIMessage(content='', tool_calls=[VALID_CALL]))
+
+
+class TestNodeEscalation:
+    """Nodes escalate to the strong model when one is configured."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_tool_call_escalates(self):
+        fast_model, fast_bound = create_task_model(AIMessage(content='', tool_calls=[INVALID_CALL]))
+        strong_model, _ = create_task_model(AIMessage(content='', tool_calls=[VALID_CALL]))
+
+        state = {'messages': [HumanMessage(content='list my events')], 'allowed_tool_types': ['calendar']}
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', fast_model), \
+             patch('agentic.nodes.agent.STRONG_MODEL', strong_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        assert result['messages'].tool_calls[0]['args'] == {'calendar_id': 'primary'}
+        fast_bound.ainvoke.assert_awaited_once()
+
+
+    @pytest.mark.asyncio
+    async def test_without_strong_model_corrects_in_loop(self):
+        fast_model, _ = create_task_model(AIMessage(content='', tool_calls=[INVALID_CALL]))
+
+        state = {'messages': [HumanMessage(content='list my events')], 'allowed_tool_types': ['calendar']}
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', fast_model), \
+             patch('agentic.nodes.agent.STRONG_MODEL', None), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        assert result['messages'][-1].status == 'error'
+
+
+    @pytest.mark.asyncio
+    async def test_malformed_policy_output_escalates(self):
+        fast_model = create_policy_model(error=OutputParserException('not json'))
+        strong_model = create_policy_model(PolicyRouterOut(decision='allow', note='calendar', allowed_tool_types=['calendar']))
+
+        state = {'messages': [HumanMessage(content='Test request')]}
+        with patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', fast_model), \
+             patch('agentic.nodes.agent.STRONG_MODEL', strong_model), \
+             patch('agentic.nodes.agent.POLICY_FAST_PATH', False):
+            result = await policy_router(state)
+
+        assert result['allowed_tool_types'] == ['calendar']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,69 @@
+"""
+Unit tests for the policy decision cache in agentic.policy_cache.
+"""
+
+import pytest
+from langchain_core.messages import HumanMessage, AIMessage
+from agentic.policy_cache import PolicyDecisionCache, normalize_request
+from agentic.schema.models import PolicyRouterOut
+from tests.conftest import MOCK_TOOL_MAPPING
+
+
+DECISION = PolicyRouterOut(decision='allow', note='calendar', allowed_tool_types=['calendar'])
+
+
+def create_messages(text: str) -> list:
+    return [HumanMessage(content=text)]
+
+
+class TestNormalization:
+    """Trivially different phrasings share a key."""
+
+    def test_case_punctuation_and_whitespace(self):
+        assert normalize_request("  What's on my  Calendar today?") == normalize_request("what’s on my calendar today")
+
+
+class TestPolicyDecisionCache:
+    """Decisions are served for repeated opening requests under the same tool mapping."""
+
+    def test_repeated_request_hits(self):
+        cache = PolicyDecisionCache()
+
+        cache.set(create_messages("What's on my calendar today?"), MOCK_TOOL_MAPPING, DECISION)
+
+        assert cache.get(create_messages("what's on my calendar today"), MOCK_TOOL_MAPPING) is DECISION
+        assert cache.stats()['hits'] == 1
+
+
+    def test_follow_up_turns_not_cached(self):
+        cache = PolicyDecisionCache()
+        messages = create_messages("Show my calendar") + [AIMessage(content='Done.'), HumanMessage(content='And tomorrow?')]
+
+        cache.set(messages, MOCK_TOOL_MAPPING, DECISION)
+
+        assert cache.get(messages, MOCK_TOOL_MAPPING) is None
+        assert len(cache.cache) == 0
+
+
+    def test_mapping_change_invalidates(self):
+        cache = PolicyDecisionCache()
+        messages = create_messages("Show my calendar")
+        cache.set(messages, MOCK_TOOL_MAPPING, DECISION)
+
+        changed = {**MOCK_TOOL_MAPPING, 'email': ['send_email']}
+
+        assert cache.get(messages, changed) is None
+        assert cache.get(messages, MOCK_TOOL_MAPPING) is None
+
+
+    def test_entries_expire(self):
+        cache = PolicyDecisionCache(ttl=0)
+        messages = create_messages("Show my calendar")
+
+        cache.set(messages, MOCK_TOOL_MAPPING, DECISION)
+
+        assert cache.get(messages, MOCK_TOOL_MAPPING) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
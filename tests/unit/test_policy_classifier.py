@@ -0,0 +1,127 @@
+"""
+Unit tests for the policy_router fast path classifier in agentic.classifier.
+"""
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import HumanMessage, AIMessage
+from agentic.classifier import KeywordScorer, EmbeddingScorer, FastPathClassifier
+from tests.conftest import MOCK_TOOL_MAPPING
+
+
+RULES = {
+    'calendar': [(r'\bcalendars?\b', 0.8), (r'\bmeetings?\b', 0.6), (r'\btomorrow\b', 0.3)],
+    'maps': [(r'\bdirections?\b', 0.8), (r'\btomorrow\b', 0.3)],
+}
+
+
+class StaticScorer:
+    def __init__(self, scores: dict | None = None):
+        self.scores = scores
+
+    async def score(self, text: str) -> dict:
+        if self.scores is None:
+            raise RuntimeError('scorer unavailable')
+        return self.scores
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds texts as counts of a fixed vocabulary."""
+
+    VOCABULARY = ['calendar', 'events', 'meeting', 'directions', 'places']
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(word in text.lower()) for word in self.VOCABULARY]
+
+
+def create_messages(text: str) -> list:
+    return [HumanMessage(content=text)]
+
+
+class TestKeywordScorer:
+    """Matching rule weights combine as 1 - prod(1 - weight)."""
+
+    @pytest.mark.asyncio
+    async def test_weights_combine(self):
+        scores = await KeywordScorer(RULES).score('Calendar meeting tomorrow')
+
+        assert scores['calendar'] == pytest.approx(1 - 0.2 * 0.4 * 0.7)
+        assert scores['maps'] == pytest.approx(0.3)
+
+
+    @pytest.mark.asyncio
+    async def test_no_match_omitted(self):
+        assert await KeywordScorer(RULES).score('Tell me a joke') == {}
+
+
+class TestEmbeddingScorer:
+    """Requests are scored against descriptions of each TOOL_MAPPING category."""
+
+    @pytest.mark.asyncio
+    async def test_closest_category_scores_highest(self):
+        scorer = EmbeddingScorer(KeywordEmbeddings(), MOCK_TOOL_MAPPING)
+
+        scores = await scorer.score('show my calendar events')
+
+        assert scores['calendar'] > 0.5
+        assert scores['maps'] == 0.0
+
+
+class TestFastPathClassifier:
+    """Confident, unambiguous requests are allowed; everything else falls back to the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_confident_request_allowed(self):
+        classifier = FastPathClassifier([KeywordScorer(RULES)], threshold=0.7)
+
+        decision = await classifier.classify(create_messages('Add a meeting to my calendar'), MOCK_TOOL_MAPPING)
+
+        assert decision.decision == 'allow'
+        assert decision.allowed_tool_types == ['calendar']
+
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_back(self):
+        classifier = FastPathClassifier([KeywordScorer(RULES)], threshold=0.7)
+
+        assert await classifier.classify(create_messages('Set up a meeting'), MOCK_TOOL_MAPPING) is None
+
+
+    @pytest.mark.asyncio
+    async def test_doubtful_other_type_falls_back(self):
+        classifier = FastPathClassifier([StaticScorer({'calendar': 0.9, 'maps': 0.5})], threshold=0.7)
+
+        assert await classifier.classify(create_messages('anything'), MOCK_TOOL_MAPPING) is None
+
+
+    @pytest.mark.asyncio
+    async def test_unmapped_tool_types_ignored(self):
+        classifier = FastPathClassifier([StaticScorer({'calendar': 0.9, 'email': 0.9})], threshold=0.7)
+
+        decision = await classifier.classify(create_messages('anything'), MOCK_TOOL_MAPPING)
+
+        assert decision.allowed_tool_types == ['calendar']
+
+
+    @pytest.mark.asyncio
+    async def test_latest_human_message_classified(self):
+        classifier = FastPathClassifier([KeywordScorer(RULES)], threshold=0.7)
+        messages = create_messages('Show my calendar') + [AIMessage(content='Done.'), HumanMessage(content='Thanks')]
+
+        assert await classifier.classify(messages, MOCK_TOOL_MAPPING) is None
+
+
+    @pytest.mark.asyncio
+    async def test_failing_scorer_skipped(self):
+        classifier = FastPathClassifier([StaticScorer(None), StaticScorer({'calendar': 0.9})], threshold=0.7)
+
+        decision = await classifier.classify(create_messages('anything'), MOCK_TOOL_MAPPING)
+
+        assert decision.allowed_tool_types == ['calendar']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
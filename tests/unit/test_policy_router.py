@@ -22,6 +22,11 @@ class TestPolicyRouterMockLLM:
     Mock LLM tests for policy_router.
     Tests post-LLM logic by mocking the model's response.
     """
+    @pytest.fixture(autouse=True)
+    def disable_fast_path(self):
+        with patch('agentic.nodes.agent.POLICY_FAST_PATH', False):
+            yield
+
     @pytest.mark.asyncio
     async def test_calendar_allowed_extracts_tool_types(self):
         """Verify extraction when calendar tools are allowed."""
@@ -111,6 +116,91 @@ class TestPolicyRouterMockLLM:
         assert set(result.keys()) == {'allowed_tool_types', 'auth_url'}
 
 
+class TestPolicyRouterFastPath:
+    """
+    Obvious requests are routed by the deterministic classifier without calling the LLM.
+    """
+    def create_mock_model(self) -> MagicMock:
+        mock_structured = MagicMock()
+        mock_structured.ainvoke = AsyncMock(return_value=PolicyRouterOut(
+            decision='refuse',
+            note='LLM decision',
+            allowed_tool_types=[]
+        ))
+
+        mock_model = MagicMock()
+        mock_model.with_structured_output = MagicMock(return_value=mock_structured)
+        return mock_model
+
+
+    @pytest.mark.asyncio
+    async def test_obvious_request_skips_llm(self):
+        """A clear calendar request is allowed without a model call."""
+        mock_model = self.create_mock_model()
+
+        state = create_state("Schedule a meeting tomorrow at 3pm")
+        with patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_model):
+            result = await policy_router(state)
+
+        assert result == {'allowed_tool_types': ['calendar'], 'auth_url': None}
+        mock_model.with_structured_output.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_uncertain_request_falls_back_to_llm(self):
+        """A request without enough signal is decided by the LLM."""
+        mock_model = self.create_mock_model()
+
+        state = create_state("What's the weather tomorrow?")
+        with patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_model):
+            result = await policy_router(state)
+
+        assert result['allowed_tool_types'] == []
+        mock_model.with_structured_output.assert_called_once()
+
+
+    @pytest.mark.asyncio
+    async def test_disabled_always_uses_llm(self):
+        mock_model = self.create_mock_model()
+
+        state = create_state("What's on my calendar?")
+        with patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_model), \
+             patch('agentic.nodes.agent.POLICY_FAST_PATH', False):
+            result = await policy_router(state)
+
+        assert result['allowed_tool_types'] == []
+
+
+class TestPolicyRouterDecisionCache:
+    """
+    Repeated opening requests reuse the cached LLM decision.
+    """
+    @pytest.fixture(autouse=True)
+    def disable_fast_path(self):
+        with patch('agentic.nodes.agent.POLICY_FAST_PATH', False):
+            yield
+
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_skips_llm(self):
+        mock_structured = MagicMock()
+        mock_structured.ainvoke = AsyncMock(return_value=PolicyRouterOut(
+            decision='allow',
+            note='Calendar request detected',
+            allowed_tool_types=['calendar']
+        ))
+
+        mock_model = MagicMock()
+        mock_model.with_structured_output = MagicMock(return_value=mock_structured)
+
+        with patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_model):
+            first = await policy_router(create_state("What's on my calendar today?"))
+            second = await policy_router(create_state("what's on my calendar today"))
+
+        assert first == second
+        mock_structured.ainvoke.assert_awaited_once()
+
+
 class TestPolicyRouterRealLLM:
     """
     Real LLM tests for policy_router.
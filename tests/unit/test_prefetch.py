@@ -0,0 +1,137 @@
+"""
+Unit tests for prerequisite prefetching (prefetch node and task_executor injection).
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from langchain_core.tools import tool
+from agentic.nodes.agent import task_executor
+from agentic.nodes.tool import prefetch
+from tests.conftest import MOCK_TOOLS
+
+
+MOCK_PREFETCH_TOOLS = {
+    'calendar': [('mock_list_calendars', {})],
+    'maps': [('mock_search_places', {'query': 'coffee'})],
+}
+
+
+def create_state(allowed_tool_types: list = None, prefetched: list = None) -> dict:
+    state = {
+        'messages': [HumanMessage(content="What's on my calendar today?")],
+        'allowed_tool_types': allowed_tool_types if allowed_tool_types is not None else ['calendar'],
+    }
+    if prefetched is not None:
+        state['prefetched'] = prefetched
+    return state
+
+
+def create_prefetched(tool_type: str, tool_name: str) -> dict:
+    return {'tool_type': tool_type, 'tool_name': tool_name, 'args': {}, 'content': '[{"id": "primary"}]'}
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+class TestPrefetchNode:
+    """Prerequisite reads are run for the allowed tool types, best effort."""
+
+    @pytest.mark.asyncio
+    async def test_prefetches_allowed_tool_types(self):
+        with patch('mcp_module.adapter.CLIENT.get_tools', new=mock_get_tools), \
+             patch('agentic.nodes.tool.PREFETCH_TOOLS', MOCK_PREFETCH_TOOLS):
+            result = await prefetch(create_state(['calendar', 'maps']))
+
+        names = {item['tool_name'] for item in result['prefetched']}
+        assert names == {'mock_list_calendars', 'mock_search_places'}
+        calendars = next(item for item in result['prefetched'] if item['tool_name'] == 'mock_list_calendars')
+        assert calendars['tool_type'] == 'calendar'
+        assert 'primary' in calendars['content']
+
+
+    @pytest.mark.asyncio
+    async def test_disallowed_tool_types_not_prefetched(self):
+        with patch('mcp_module.adapter.CLIENT.get_tools', new=mock_get_tools), \
+             patch('agentic.nodes.tool.PREFETCH_TOOLS', MOCK_PREFETCH_TOOLS):
+            result = await prefetch(create_state(['calendar']))
+
+        assert [item['tool_name'] for item in result['prefetched']] == ['mock_list_calendars']
+
+
+    @pytest.mark.asyncio
+    async def test_nothing_allowed(self):
+        with patch('agentic.nodes.tool.PREFETCH_TOOLS', MOCK_PREFETCH_TOOLS):
+            result = await prefetch(create_state([]))
+
+        assert result == {'prefetched': []}
+
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_skipped(self):
+        @tool
+        def mock_list_calendars() -> str:
+            """Fails."""
+            raise RuntimeError('backend down')
+
+        async def get_failing_tools(server_name=None):
+            return [mock_list_calendars]
+
+        with patch('mcp_module.adapter.CLIENT.get_tools', new=get_failing_tools), \
+             patch('agentic.nodes.tool.PREFETCH_TOOLS', MOCK_PREFETCH_TOOLS):
+            result = await prefetch(create_state())
+
+        assert result == {'prefetched': []}
+
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        with patch('agentic.nodes.tool.PREFETCH_ENABLED', False):
+            result = await prefetch(create_state())
+
+        assert result == {'prefetched': []}
+
+
+class TestInjection:
+    """task_executor injects prefetched results for allowed tool types only."""
+
+    async def run_task_executor(self, state: dict):
+        mock_model = MagicMock()
+        mock_bound = MagicMock()
+        mock_bound.ainvoke = AsyncMock(return_value=AIMessage(content='You have one calendar.'))
+        mock_model.bind_tools = MagicMock(return_value=mock_bound)
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', new=mock_get_tools):
+            result = await task_executor(state)
+        return result, mock_bound.ainvoke.call_args[0][0]
+
+
+    @pytest.mark.asyncio
+    async def test_allowed_results_injected(self):
+        state = create_state(['calendar'], [create_prefetched('calendar', 'mock_list_calendars')])
+
+        result, prompt = await self.run_task_executor(state)
+
+        injected_call, injected_result, final = result['messages']
+        assert injected_call.tool_calls[0]['name'] == 'mock_list_calendars'
+        assert injected_result.tool_call_id == injected_call.tool_calls[0]['id']
+        assert final.content == 'You have one calendar.'
+        assert prompt[-3:-1] == [injected_call, injected_result]
+        assert result['prefetched'] == []
+
+
+    @pytest.mark.asyncio
+    async def test_disallowed_results_dropped(self):
+        state = create_state(['calendar'], [create_prefetched('maps', 'mock_search_places')])
+
+        result, prompt = await self.run_task_executor(state)
+
+        assert isinstance(result['messages'], AIMessage)
+        assert not any(isinstance(message, ToolMessage) for message in prompt)
+        assert result['prefetched'] == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,81 @@
+"""
+Unit tests for per-node prompt cache instrumentation in agentic.metrics.
+"""
+
+import pytest
+from typing import TypedDict
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END
+from agentic.metrics import PromptCacheMetrics
+
+
+def create_reply(input_tokens: int, cached_tokens: int) -> AIMessage:
+    return AIMessage(
+        content='ok',
+        usage_metadata={
+            'input_tokens': input_tokens,
+            'output_tokens': 1,
+            'total_tokens': input_tokens + 1,
+            'input_token_details': {'cache_read': cached_tokens},
+        },
+    )
+
+
+class State(TypedDict):
+    reply: str
+
+
+def create_graph(model):
+    async def router(state: State):
+        await model.ainvoke([HumanMessage(content='route')])
+        return {}
+
+    async def executor(state: State):
+        await model.ainvoke([HumanMessage(content='execute')])
+        return {'reply': 'done'}
+
+    graph = StateGraph(State)
+    graph.add_node('router', router)
+    graph.add_node('executor', executor)
+    graph.add_edge(START, 'router')
+    graph.add_edge('router', 'executor')
+    graph.add_edge('executor', END)
+    return graph.compile()
+
+
+class TestPromptCacheMetrics:
+    """Cached input tokens are aggregated per graph node."""
+
+    @pytest.mark.asyncio
+    async def test_usage_attributed_to_nodes(self):
+        metrics = PromptCacheMetrics()
+        model = GenericFakeChatModel(messages=iter([create_reply(100, 0), create_reply(2000, 1536)]))
+
+        await create_graph(model).ainvoke({'reply': ''}, config={'callbacks': [metrics]})
+
+        stats = metrics.stats()
+        assert stats['router'] == {'calls': 1, 'input_tokens': 100, 'cached_tokens': 0, 'cached_ratio': 0.0}
+        assert stats['executor']['cached_tokens'] == 1536
+        assert stats['executor']['cached_ratio'] == pytest.approx(0.768)
+
+
+    def test_totals_accumulate(self):
+        metrics = PromptCacheMetrics()
+
+        metrics.record('task_executor', {'input_tokens': 1000, 'input_token_details': {'cache_read': 0}})
+        metrics.record('task_executor', {'input_tokens': 1000, 'input_token_details': {'cache_read': 1000}})
+
+        assert metrics.stats()['task_executor']['cached_ratio'] == 0.5
+
+
+    def test_missing_cache_details(self):
+        metrics = PromptCacheMetrics()
+
+        metrics.record('policy_router', {'input_tokens': 500})
+
+        assert metrics.stats()['policy_router']['cached_tokens'] == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
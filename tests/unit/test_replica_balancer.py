@@ -0,0 +1,192 @@
+"""
+Unit tests for least-loaded routing across MCP replicas in mcp_module.balancer.
+"""
+
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+from mcp_module.balancer import ReplicaBalancer, EWMA
+from mcp_module.context import bind_thread
+from mcp_module.adapter import CLIENT
+from mcp_module.pool import PooledMCPClient
+from main import metrics
+
+
+class FakePool:
+    """Stands in for MCPSessionPool, yielding its own url as the session."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.borrowed = 0
+        self.headers = []
+
+    @asynccontextmanager
+    async def session(self, headers=None):
+        self.borrowed += 1
+        self.headers.append(headers)
+        yield self.url
+
+
+def create_balancer(*urls: str, **kwargs) -> ReplicaBalancer:
+    return ReplicaBalancer({url: FakePool(url) for url in urls}, **kwargs)
+
+
+async def fail_on(balancer: ReplicaBalancer, error: Exception):
+    with pytest.raises(type(error)):
+        async with balancer.session():
+            raise error
+
+
+class TestRouting:
+    """Replica selection by load and latency."""
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding_spreads_concurrent_calls(self):
+        balancer = create_balancer('a', 'b')
+        release = asyncio.Event()
+        used = []
+
+        async def hold():
+            async with balancer.session() as url:
+                used.append(url)
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(4)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert sorted(used) == ['a', 'a', 'b', 'b']
+
+
+    @pytest.mark.asyncio
+    async def test_ewma_prefers_faster_replica(self):
+        balancer = create_balancer('slow', 'fast', strategy=EWMA)
+        balancer.replicas[0].latency = 0.5
+        balancer.replicas[1].latency = 0.05
+
+        async with balancer.session() as url:
+            assert url == 'fast'
+
+
+    @pytest.mark.asyncio
+    async def test_sticky_thread_keeps_replica(self):
+        balancer = create_balancer('a', 'b')
+
+        with bind_thread('thread-1'):
+            async with balancer.session() as first:
+                # the other replica is now less loaded, but the thread stays put
+                async with balancer.session() as second:
+                    assert second == first
+
+
+class TestEjection:
+    """Passive health ejection after consecutive transport failures."""
+
+    @pytest.mark.asyncio
+    async def test_failing_replica_is_ejected(self):
+        balancer = create_balancer('a', 'b', eject_after=2)
+
+        for _ in range(2):
+            with bind_thread('pin-a'):
+                await fail_on(balancer, ConnectionError('down'))
+
+        ejected = [replica.url for replica in balancer.replicas if replica.ejected]
+        assert len(ejected) == 1
+        for _ in range(3):
+            async with balancer.session() as url:
+                assert url not in ejected
+
+
+    @pytest.mark.asyncio
+    async def test_mcp_errors_do_not_eject(self):
+        balancer = create_balancer('a', 'b', eject_after=1)
+
+        await fail_on(balancer, McpError(ErrorData(code=-32042, message='auth')))
+
+        assert not any(replica.ejected for replica in balancer.replicas)
+
+
+    @pytest.mark.asyncio
+    async def test_all_ejected_still_routes(self):
+        balancer = create_balancer('a', 'b', eject_after=1)
+        for replica in balancer.replicas:
+            replica.ejected_until = float('inf') if replica.url == 'b' else 1e12
+
+        async with balancer.session() as url:
+            assert url == 'a'
+
+
+class TestClientWiring:
+    """PooledMCPClient builds a balancer only for replicated servers."""
+
+    def test_replicas_create_balancer(self):
+        client = PooledMCPClient(
+            {'assistant': {'transport': 'http', 'url': 'http://a/mcp'}},
+            replicas={'assistant': ['http://a/mcp', 'http://b/mcp']},
+        )
+
+        pool = client.pools['assistant']
+        assert isinstance(pool, ReplicaBalancer)
+        assert [replica.pool.connection['url'] for replica in pool.replicas] == ['http://a/mcp', 'http://b/mcp']
+
+
+    def test_single_url_keeps_plain_pool(self):
+        client = PooledMCPClient(
+            {'assistant': {'transport': 'http', 'url': 'http://a/mcp'}},
+            replicas={'assistant': ['http://a/mcp']},
+        )
+
+        assert not isinstance(client.pools['assistant'], ReplicaBalancer)
+
+
+    @pytest.mark.asyncio
+    async def test_replica_stats_in_metrics(self):
+        balancer = create_balancer('http://a/mcp', 'http://b/mcp')
+        balancer.replicas[1].ejected_until = float('inf')
+
+        with patch.dict(CLIENT.pools, {'replicated': balancer}):
+            payload = await metrics()
+
+        replicas = payload['mcp_replicas']['replicated']
+        assert [replica['url'] for replica in replicas] == ['http://a/mcp', 'http://b/mcp']
+        assert [replica['ejected'] for replica in replicas] == [False, True]
+
+
+    @pytest.mark.asyncio
+    async def test_call_with_headers_routed_by_balancer(self):
+        class ToolSession:
+            def __init__(self, url):
+                self.url = url
+
+            async def call_tool(self, name, args, progress_callback=None):
+                return self.url
+
+        class ToolPool(FakePool):
+            @asynccontextmanager
+            async def session(self, headers=None):
+                async with super().session(headers):
+                    yield ToolSession(self.url)
+
+        client = PooledMCPClient({'assistant': {'transport': 'http', 'url': 'http://a/mcp'}})
+        balancer = ReplicaBalancer({url: ToolPool(url) for url in ('http://a/mcp', 'http://b/mcp')})
+        balancer.replicas[0].ejected_until = float('inf')
+        client.pools['assistant'] = balancer
+
+        async def not_called(request):
+            raise AssertionError("base handler should not run for pooled servers")
+
+        request = MCPToolCallRequest(name='list_events', args={}, server_name='assistant', headers={'X-User': 'alice'})
+        assert await client._call_on_pooled_session(request, not_called) == 'http://b/mcp'
+
+        assert balancer.replicas[1].pool.headers == [{'X-User': 'alice'}]
+        assert balancer.replicas[0].pool.borrowed == 0
+        assert balancer.replicas[1].latency is not None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,243 @@
+"""
+Unit tests for the final response cache (agentic.response_cache) and its use by graph runs.
+"""
+
+import uuid
+import pytest
+from unittest.mock import patch
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from agentic.graph import run_graph, stream_run
+from agentic.response_cache import ResponseCache, RESPONSE_CACHE
+from tests.conftest import MOCK_TOOLS
+
+
+READ_TOOLS = {'mock_list_calendars', 'mock_list_events'}
+WRITE_TOOLS = {'mock_create_event', 'mock_update_event'}
+
+
+class FakeEmbeddings:
+    """Embeds texts by the words they contain from a tiny vocabulary."""
+
+    VOCABULARY = ['calendar', 'today', 'events', 'tomorrow', 'weather']
+
+    def __init__(self):
+        self.calls = 0
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        words = text.lower().replace('?', '').split()
+        return [float(word in words) for word in self.VOCABULARY]
+
+
+class FakeModel(GenericFakeChatModel):
+    """Fake chat model that ignores bound tools."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+def read_only_state(**overrides) -> dict:
+    state = {
+        'messages': [
+            HumanMessage(content="What's on my calendar today?"),
+            AIMessage(content='', tool_calls=[{'id': 'call_1', 'name': 'mock_list_events', 'args': {'calendar_id': 'primary'}}]),
+            ToolMessage(content='[]', name='mock_list_events', tool_call_id='call_1'),
+            AIMessage(content='Nothing today.'),
+        ],
+        'final_response': 'Nothing today.',
+    }
+    state.update(overrides)
+    return state
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(read_tools=READ_TOOLS, write_tools=WRITE_TOOLS)
+
+
+class TestCacheable:
+    """Only finished, opening, read-only runs are stored."""
+
+    def test_read_only_run(self, cache):
+        assert cache.cacheable(read_only_state())
+
+
+    def test_run_without_tools(self, cache):
+        state = {'messages': [HumanMessage(content='Hi'), AIMessage(content='Hello!')], 'final_response': 'Hello!'}
+        assert cache.cacheable(state)
+
+
+    def test_write_tool_call(self, cache):
+        state = read_only_state()
+        state['messages'][1].tool_calls[0]['name'] = 'mock_create_event'
+        assert not cache.cacheable(state)
+
+
+    def test_failed_tool_call(self, cache):
+        state = read_only_state()
+        state['messages'][2] = ToolMessage(content='Error', name='mock_list_events', tool_call_id='call_1', status='error')
+        assert not cache.cacheable(state)
+
+
+    def test_follow_up_turn(self, cache):
+        state = read_only_state()
+        state['messages'] += [HumanMessage(content='And tomorrow?'), AIMessage(content='Also nothing.')]
+        assert not cache.cacheable(state)
+
+
+    def test_pending_action(self, cache):
+        state = read_only_state(pending_action={'kind': 'clarification', 'message': 'Which calendar?'})
+        assert not cache.cacheable(state)
+
+
+    def test_oauth_required(self, cache):
+        assert not cache.cacheable(read_only_state(auth_url='https://auth.example.com'))
+
+
+    def test_no_final_response(self, cache):
+        state = read_only_state()
+        del state['final_response']
+        assert not cache.cacheable(state)
+
+
+class TestLookup:
+    """Responses are found per user by normalized or similar request text."""
+
+    @pytest.mark.asyncio
+    async def test_exact_match_ignores_case_and_punctuation(self, cache):
+        await cache.set('alice', "What's on my calendar today?", 'Nothing today.')
+
+        assert await cache.get('alice', "  what's on my CALENDAR today ") == 'Nothing today.'
+        assert await cache.get('alice', "What's on my calendar tomorrow?") is None
+
+
+    @pytest.mark.asyncio
+    async def test_scoped_per_user(self, cache):
+        await cache.set('alice', "What's on my calendar today?", 'Nothing today.')
+
+        assert await cache.get('bob', "What's on my calendar today?") is None
+
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self):
+        cache = ResponseCache(read_tools=READ_TOOLS, write_tools=WRITE_TOOLS, ttl=0)
+        await cache.set('alice', 'Hi', 'Hello!')
+
+        assert await cache.get('alice', 'Hi') is None
+
+
+    @pytest.mark.asyncio
+    async def test_similar_request_hits(self):
+        embeddings = FakeEmbeddings()
+        cache = ResponseCache(read_tools=READ_TOOLS, write_tools=WRITE_TOOLS, embeddings=embeddings, similarity=0.9)
+        await cache.set('alice', 'calendar events today', 'Nothing today.')
+
+        assert await cache.get('alice', 'today calendar events?') == 'Nothing today.'
+        assert await cache.get('alice', 'calendar events tomorrow') is None
+        assert await cache.get('bob', 'today calendar events?') is None
+        assert cache.stats()['similar_hits'] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_falls_back_to_exact(self):
+        class FailingEmbeddings:
+            async def aembed_query(self, text):
+                raise RuntimeError('embeddings down')
+
+        cache = ResponseCache(read_tools=READ_TOOLS, write_tools=WRITE_TOOLS, embeddings=FailingEmbeddings())
+        await cache.set('alice', 'calendar events today', 'Nothing today.')
+
+        assert await cache.get('alice', 'calendar events today') == 'Nothing today.'
+        assert await cache.get('alice', 'today calendar events') is None
+
+
+class TestInvalidation:
+    """A successful write drops the writing user's responses."""
+
+    @pytest.mark.asyncio
+    async def test_successful_write_invalidates_user(self, cache):
+        await cache.set('alice', 'Hi', 'Hello!')
+        await cache.set('bob', 'Hi', 'Hello!')
+
+        dropped = cache.record_writes('alice', [ToolMessage(content='{}', name='mock_create_event', tool_call_id='call_1')])
+
+        assert dropped == 1
+        assert await cache.get('alice', 'Hi') is None
+        assert await cache.get('bob', 'Hi') == 'Hello!'
+
+
+    @pytest.mark.asyncio
+    async def test_reads_and_failed_writes_keep_entries(self, cache):
+        await cache.set('alice', 'Hi', 'Hello!')
+
+        cache.record_writes('alice', [
+            ToolMessage(content='[]', name='mock_list_events', tool_call_id='call_1'),
+            ToolMessage(content='Error', name='mock_create_event', tool_call_id='call_2', status='error'),
+        ])
+
+        assert await cache.get('alice', 'Hi') == 'Hello!'
+
+
+class TestGraphRuns:
+    """run_graph and stream_run answer repeated opening requests without calling the model."""
+
+    @pytest.fixture(autouse=True)
+    def graph_mocks(self):
+        with patch('agentic.nodes.tool.PREFETCH_ENABLED', False), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            yield
+
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_skips_the_graph(self):
+        model = FakeModel(messages=iter([AIMessage(content='Nothing today.')]))
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', model):
+            first = await run_graph(str(uuid.uuid4()), "What's on my calendar today?", user_id='alice')
+            # the model has no replies left, so a second graph run would fail
+            thread_id = str(uuid.uuid4())
+            second = await run_graph(thread_id, "what's on my calendar today", user_id='alice')
+            events = [event async for event in stream_run(str(uuid.uuid4()), "What's on my calendar today?", user_id='alice')]
+
+        assert first['final_response'] == second['final_response'] == 'Nothing today.'
+        assert [m.type for m in second['messages']] == ['human', 'ai']
+        assert second['user_id'] == 'alice'
+        assert events[0] == ('token', 'Nothing today.')
+        assert events[-1][1]['final_response'] == 'Nothing today.'
+        assert RESPONSE_CACHE.stats()['hits'] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_cached_answer_is_part_of_the_thread(self):
+        model = FakeModel(messages=iter([AIMessage(content='Nothing today.'), AIMessage(content='Nothing tomorrow either.')]))
+        thread_id = str(uuid.uuid4())
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', model):
+            await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+            await run_graph(thread_id, "What's on my calendar today?")
+            follow_up = await run_graph(thread_id, "What's on my calendar tomorrow?")
+
+        assert follow_up['final_response'] == 'Nothing tomorrow either.'
+        assert [m.text for m in follow_up['messages'][:2]] == ["What's on my calendar today?", 'Nothing today.']
+
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        model = FakeModel(messages=iter([AIMessage(content='Nothing today.'), AIMessage(content='Still nothing.')]))
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', model), \
+             patch('agentic.graph.RESPONSE_CACHE_ENABLED', False):
+            await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+            second = await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+
+        assert second['final_response'] == 'Still nothing.'
+        assert len(RESPONSE_CACHE.cache) == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
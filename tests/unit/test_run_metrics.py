@@ -0,0 +1,143 @@
+"""
+Unit tests for per-run node accounting (agentic.metrics.RunRecorder) and its aggregation.
+"""
+
+import json
+import uuid
+import pytest
+from unittest.mock import patch
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from agentic.graph import run_graph
+from agentic.metrics import RunRecorder, RunMetrics, RUN_METRICS, CURRENT_RUN, record_run, empty_node_stats
+from main import stream_agent_events
+from tests.conftest import MOCK_TOOLS
+
+
+class FakeModel(GenericFakeChatModel):
+    """Fake chat model that ignores bound tools."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+def usage(input_tokens: int, output_tokens: int, cached: int = 0) -> dict:
+    return {
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'total_tokens': input_tokens + output_tokens,
+        'input_token_details': {'cache_read': cached},
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_run_metrics():
+    RUN_METRICS.clear()
+    yield
+    RUN_METRICS.clear()
+
+
+@pytest.fixture
+def graph_mocks():
+    model = FakeModel(messages=iter([
+        AIMessage(
+            content='',
+            tool_calls=[{'id': 'call_1', 'name': 'mock_list_events', 'args': {'calendar_id': 'primary'}}],
+            usage_metadata=usage(1200, 40, cached=1024),
+        ),
+        AIMessage(content='You have a team meeting at 10.', usage_metadata=usage(1300, 20, cached=1152)),
+    ]))
+    with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', model), \
+         patch('agentic.nodes.tool.PREFETCH_ENABLED', False), \
+         patch('agentic.graph.RESPONSE_CACHE_ENABLED', False), \
+         patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+        yield model
+
+
+class TestRunRecorder:
+    """Graph runs inside record_run are accounted per node."""
+
+    @pytest.mark.asyncio
+    async def test_run_summary(self, graph_mocks):
+        with record_run() as recorder:
+            state = await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+
+        summary = recorder.summary()
+        nodes = summary['nodes']
+        assert state['final_response'] == 'You have a team meeting at 10.'
+        assert summary['iterations'] == 2
+        assert nodes['task_executor']['calls'] == 2
+        assert nodes['task_executor']['llm_calls'] == 2
+        assert nodes['task_executor']['input_tokens'] == 2500
+        assert nodes['task_executor']['output_tokens'] == 60
+        assert nodes['task_executor']['cached_tokens'] == 2176
+        assert nodes['use_tools']['calls'] == 1
+        assert nodes['use_tools']['tool_calls'] == 1
+        assert summary['totals']['input_tokens'] == 2500
+        assert summary['totals']['tool_calls'] == 1
+        assert summary['wall_seconds'] >= nodes['task_executor']['wall_seconds'] >= nodes['task_executor']['llm_seconds'] > 0
+
+
+    @pytest.mark.asyncio
+    async def test_runs_outside_record_run_are_not_recorded(self, graph_mocks):
+        await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+
+        assert CURRENT_RUN.get() is None
+        assert RUN_METRICS.stats()['runs'] == 0
+
+
+    @pytest.mark.asyncio
+    async def test_aggregated_into_run_metrics(self, graph_mocks):
+        with record_run():
+            await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+
+        stats = RUN_METRICS.stats()
+        assert stats['runs'] == 1
+        assert stats['mean_iterations'] == 2
+        assert stats['nodes']['task_executor']['input_tokens'] == 2500
+        assert stats['nodes']['task_executor']['mean_wall_seconds'] > 0
+
+
+    @pytest.mark.asyncio
+    async def test_stream_debug_field(self, graph_mocks):
+        async def events():
+            yield 'state', await run_graph(str(uuid.uuid4()), "What's on my calendar today?")
+
+        chunks = [chunk async for chunk in stream_agent_events(events(), 'thread-1', debug=True)]
+        data = json.loads(chunks[-1].split('data: ')[1])
+
+        assert data['status'] == 'success'
+        assert data['debug']['iterations'] == 2
+        assert RUN_METRICS.stats()['runs'] == 1
+
+
+class TestRunMetrics:
+    """Summaries add up per node."""
+
+    def test_add_and_stats(self):
+        metrics = RunMetrics()
+        recorder = RunRecorder()
+        recorder.nodes['task_executor'] = {**empty_node_stats(), 'calls': 2, 'wall_seconds': 3.0, 'input_tokens': 100}
+        recorder.finish()
+
+        metrics.add(recorder.summary())
+        metrics.add(recorder.summary())
+        stats = metrics.stats()
+
+        assert stats['runs'] == 2
+        assert stats['mean_iterations'] == 2
+        assert stats['nodes']['task_executor']['calls'] == 4
+        assert stats['nodes']['task_executor']['input_tokens'] == 200
+        assert stats['nodes']['task_executor']['mean_wall_seconds'] == 1.5
+
+
+    def test_empty(self):
+        assert RunMetrics().stats() == {'runs': 0, 'mean_wall_seconds': 0.0, 'mean_iterations': 0.0, 'nodes': {}}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,215 @@
+"""
+Unit tests for the pooled MCP sessions in mcp_module.pool.
+Uses a fake session factory so no MCP server is needed.
+"""
+
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from langchain_mcp_adapters.callbacks import Callbacks
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest
+from mcp_module.pool import MCPSessionPool, PooledMCPClient, with_headers
+
+
+class FakeSession:
+    """Stands in for an initialized mcp ClientSession."""
+
+    def __init__(self, session_id: int, headers: dict | None = None):
+        self.session_id = session_id
+        self.headers = headers
+        self.ping_ok = True
+        self.closed = False
+        self.calls = []
+
+    async def send_ping(self):
+        if not self.ping_ok:
+            raise ConnectionError("ping failed")
+
+    async def initialize(self):
+        pass
+
+    async def call_tool(self, name, args, progress_callback=None):
+        self.calls.append((name, args, progress_callback))
+        if progress_callback is not None:
+            await progress_callback(1.0, 1.0, 'done')
+        return 'result'
+
+
+class FakeFactory:
+    """Counts how many sessions were opened and closed."""
+
+    def __init__(self):
+        self.opened = []
+
+    @asynccontextmanager
+    async def __call__(self, headers=None):
+        session = FakeSession(len(self.opened), headers)
+        self.opened.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+
+def create_pool(factory: FakeFactory, **kwargs) -> MCPSessionPool:
+    options = {'min_size': 0, 'max_size': 2, 'idle_timeout': 60.0, 'health_check_interval': 60.0}
+    options.update(kwargs)
+    return MCPSessionPool({}, session_factory=factory, **options)
+
+
+class TestSessionReuse:
+    """Sessions are reused instead of reconnecting per call."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_share_one_session(self):
+        factory = FakeFactory()
+        pool = create_pool(factory)
+
+        for _ in range(5):
+            async with pool.session() as session:
+                assert session.session_id == 0
+
+        assert len(factory.opened) == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_start_warms_min_size_sessions(self):
+        factory = FakeFactory()
+        pool = create_pool(factory, min_size=2)
+
+        await pool.start()
+
+        assert len(factory.opened) == 2
+        assert pool.idle == 2
+        await pool.close()
+        assert all(s.closed for s in factory.opened)
+
+
+class TestPoolBounds:
+    """The pool never opens more than max_size sessions."""
+
+    @pytest.mark.asyncio
+    async def test_waits_when_exhausted(self):
+        factory = FakeFactory()
+        pool = create_pool(factory, max_size=1)
+        first_released = asyncio.Event()
+
+        async def hold():
+            async with pool.session():
+                await asyncio.sleep(0.05)
+            first_released.set()
+
+        async def wait_for_turn():
+            await asyncio.sleep(0.01)
+            async with pool.session():
+                return first_released.is_set()
+
+        _, waited = await asyncio.gather(hold(), wait_for_turn())
+
+        assert waited is True
+        assert len(factory.opened) == 1
+        await pool.close()
+
+
+class TestSessionHealth:
+    """Broken or unhealthy sessions are replaced."""
+
+    @pytest.mark.asyncio
+    async def test_failure_discards_session(self):
+        factory = FakeFactory()
+        pool = create_pool(factory)
+
+        with pytest.raises(ConnectionError):
+            async with pool.session():
+                raise ConnectionError("transport dropped")
+
+        async with pool.session() as session:
+            assert session.session_id == 1
+        assert factory.opened[0].closed
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_ping_replaces_session(self):
+        factory = FakeFactory()
+        pool = create_pool(factory, health_check_interval=0.0)
+
+        async with pool.session() as session:
+            session.ping_ok = False
+
+        async with pool.session() as session:
+            assert session.session_id == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_reap_closes_idle_sessions_above_min_size(self):
+        factory = FakeFactory()
+        pool = create_pool(factory, min_size=1, idle_timeout=0.0)
+
+        async def borrow():
+            async with pool.session():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(borrow(), borrow())
+        assert pool.size == 2
+
+        await pool.reap()
+
+        assert pool.size == 1
+        assert sum(s.closed for s in factory.opened) == 1
+        await pool.close()
+
+
+class TestPooledToolCalls:
+    """Tool calls run on pooled sessions with the client's progress callback."""
+
+    def create_client(self, progress: list) -> tuple[PooledMCPClient, FakeFactory]:
+        async def on_progress(progress_value, total, message, context):
+            progress.append((progress_value, context.tool_name))
+
+        client = PooledMCPClient(
+            {'assistant': {'transport': 'http', 'url': 'http://a/mcp', 'headers': {'X-Base': '1'}}},
+            callbacks=Callbacks(on_progress=on_progress),
+        )
+        factory = FakeFactory()
+        client.pools['assistant'] = create_pool(factory)
+        return client, factory
+
+    async def not_called(self, request):
+        raise AssertionError("base handler should not run for pooled servers")
+
+    @pytest.mark.asyncio
+    async def test_progress_reported_on_pooled_session(self):
+        progress = []
+        client, factory = self.create_client(progress)
+        request = MCPToolCallRequest(name='list_events', args={'calendar_id': 'primary'}, server_name='assistant')
+
+        assert await client._call_on_pooled_session(request, self.not_called) == 'result'
+
+        assert factory.opened[0].calls[0][:2] == ('list_events', {'calendar_id': 'primary'})
+        assert progress == [(1.0, 'list_events')]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_headers_get_their_own_session(self):
+        progress = []
+        client, factory = self.create_client(progress)
+        request = MCPToolCallRequest(name='list_events', args={}, server_name='assistant', headers={'X-User': 'alice'})
+
+        assert await client._call_on_pooled_session(request, self.not_called) == 'result'
+
+        session = factory.opened[0]
+        assert session.headers == {'X-User': 'alice'}
+        assert session.closed
+        assert client.pools['assistant'].idle == 0
+        assert progress == [(1.0, 'list_events')]
+        await client.close()
+
+    def test_headers_merged_into_connection(self):
+        connection = {'transport': 'http', 'url': 'http://a/mcp', 'headers': {'X-Base': '1'}}
+
+        assert with_headers(connection, {'X-User': 'alice'})['headers'] == {'X-Base': '1', 'X-User': 'alice'}
+        assert with_headers(connection, None) is connection
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
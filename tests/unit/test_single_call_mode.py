@@ -0,0 +1,138 @@
+"""
+Unit tests for the single_call graph mode, where the task executor declares its own tool types.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from agentic.edges import route_from_routing_executor
+from agentic.graph import build_graph
+from agentic.nodes.agent import routing_executor
+from tests.conftest import MOCK_TOOLS
+
+
+def declare_call(tool_types: list, call_id: str = 'call_declare_1') -> dict:
+    return {'id': call_id, 'name': 'declare_tool_types', 'args': {'tool_types': tool_types}}
+
+
+LIST_EVENTS_CALL = {'id': 'call_list_1', 'name': 'mock_list_events', 'args': {'calendar_id': 'primary'}}
+CREATE_EVENT_CALL = {
+    'id': 'call_create_1',
+    'name': 'mock_create_event',
+    'args': {'calendar_id': 'primary', 'summary': 'Meeting', 'start_time': '2024-01-15T10:00:00'},
+}
+SEARCH_PLACES_CALL = {'id': 'call_search_1', 'name': 'mock_search_places', 'args': {'query': 'coffee'}}
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+def create_state() -> dict:
+    return {
+        'messages': [HumanMessage(content="What's on my calendar?")],
+        'allowed_tool_types': [],
+    }
+
+
+def create_mock_model(*responses: AIMessage) -> tuple[MagicMock, MagicMock]:
+    mock_bound = MagicMock()
+    mock_bound.ainvoke = AsyncMock(side_effect=list(responses))
+
+    mock_model = MagicMock()
+    mock_model.bind_tools = MagicMock(return_value=mock_bound)
+    return mock_model, mock_bound
+
+
+async def run_routing_executor(response: AIMessage) -> dict:
+    mock_model, _ = create_mock_model(response)
+    with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+         patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+        return await routing_executor(create_state())
+
+
+class TestRoutingExecutor:
+    """The declaration becomes allowed_tool_types and is enforced before anything runs."""
+
+    @pytest.mark.asyncio
+    async def test_declared_calls_continue(self):
+        result = await run_routing_executor(AIMessage(content='', tool_calls=[declare_call(['calendar']), LIST_EVENTS_CALL]))
+
+        original, declared, deferred, remaining = result['messages']
+        assert result['allowed_tool_types'] == ['calendar']
+        assert declared.tool_call_id == 'call_declare_1'
+        assert deferred.tool_call_id == 'call_list_1'
+        assert [tc['id'] for tc in remaining.tool_calls] == ['call_list_1']
+        assert 'pending_action' not in result
+
+
+    @pytest.mark.asyncio
+    async def test_hitl_call_needs_confirmation(self):
+        result = await run_routing_executor(AIMessage(content='', tool_calls=[declare_call(['calendar']), CREATE_EVENT_CALL]))
+
+        assert result['pending_action']['kind'] == 'confirmation'
+        assert result['pending_action']['tool_calls'][0]['call_id'] == 'call_create_1'
+        assert [tc['id'] for tc in result['messages'][-1].tool_calls] == ['call_create_1']
+
+
+    @pytest.mark.asyncio
+    async def test_undeclared_tool_type_rejected(self):
+        result = await run_routing_executor(AIMessage(content='', tool_calls=[declare_call(['calendar']), SEARCH_PLACES_CALL]))
+
+        rejection = result['messages'][-1]
+        assert result['allowed_tool_types'] == ['calendar']
+        assert rejection.status == 'error'
+        assert 'not in the declared tool types' in rejection.content
+        assert route_from_routing_executor(result) == 'task_executor'
+
+
+    @pytest.mark.asyncio
+    async def test_calls_without_declaration_rejected(self):
+        result = await run_routing_executor(AIMessage(content='', tool_calls=[LIST_EVENTS_CALL]))
+
+        assert 'allowed_tool_types' not in result
+        assert result['messages'][-1].status == 'error'
+        assert route_from_routing_executor(result) == 'routing_executor'
+
+
+    @pytest.mark.asyncio
+    async def test_unmapped_tool_types_dropped(self):
+        result = await run_routing_executor(AIMessage(content='', tool_calls=[declare_call(['calendar', 'email'])]))
+
+        assert result['allowed_tool_types'] == ['calendar']
+        assert isinstance(result['messages'][-1], ToolMessage)
+
+
+    @pytest.mark.asyncio
+    async def test_plain_answer_is_final(self):
+        result = await run_routing_executor(AIMessage(content='I can only help with calendars.'))
+
+        assert result['allowed_tool_types'] == []
+        assert result['final_response'] == 'I can only help with calendars.'
+
+
+class TestSingleCallGraph:
+    """The single_call graph never calls the policy router model."""
+
+    @pytest.mark.asyncio
+    async def test_request_completes_without_policy_router(self):
+        mock_model, mock_bound = create_mock_model(
+            AIMessage(content='', tool_calls=[declare_call(['calendar']), LIST_EVENTS_CALL]),
+            AIMessage(content='You have a team meeting.'),
+        )
+        mock_policy_model = MagicMock()
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_policy_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            state = await build_graph('single_call').ainvoke(create_state())
+
+        assert state['final_response'] == 'You have a team meeting.'
+        assert state['allowed_tool_types'] == ['calendar']
+        assert any(isinstance(m, ToolMessage) and m.name == 'mock_list_events' and m.status == 'success' for m in state['messages'])
+        assert mock_bound.ainvoke.await_count == 2
+        mock_policy_model.with_structured_output.assert_not_called()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,120 @@
+"""
+Unit tests for coalescing identical concurrent tool calls in mcp_module.singleflight.
+"""
+
+import asyncio
+import pytest
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest
+from mcp.types import CallToolResult, TextContent
+from mcp_module.context import bind_user
+from mcp_module.singleflight import SingleFlight
+
+
+READ_TOOL = 'mock_list_events'
+WRITE_TOOL = 'mock_create_event'
+
+
+def create_request(name: str, args: dict = None) -> MCPToolCallRequest:
+    return MCPToolCallRequest(name=name, args=args or {}, server_name='assistant')
+
+
+class SlowHandler:
+    """Innermost handler that takes a moment to answer and counts calls."""
+
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.error = error
+
+    async def __call__(self, request):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.error:
+            raise self.error
+        return CallToolResult(content=[TextContent(type='text', text='[]')], isError=False)
+
+
+async def call_as(user: str, flight: SingleFlight, request, handler):
+    with bind_user(user):
+        return await flight(request, handler)
+
+
+class TestCoalescing:
+    """Identical concurrent reads share one call."""
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_call(self):
+        flight, handler = SingleFlight({READ_TOOL}), SlowHandler()
+        request = create_request(READ_TOOL, {'calendar_id': 'primary'})
+
+        results = await asyncio.gather(*(flight(request, handler) for _ in range(5)))
+
+        assert handler.calls == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+    @pytest.mark.asyncio
+    async def test_different_users_not_coalesced(self):
+        flight, handler = SingleFlight({READ_TOOL}), SlowHandler()
+        request = create_request(READ_TOOL)
+
+        await asyncio.gather(
+            call_as('alice', flight, request, handler),
+            call_as('bob', flight, request, handler),
+        )
+
+        assert handler.calls == 2
+
+
+    @pytest.mark.asyncio
+    async def test_writes_never_coalesced(self):
+        flight, handler = SingleFlight({READ_TOOL}), SlowHandler()
+        request = create_request(WRITE_TOOL, {'summary': 'Meeting'})
+
+        await asyncio.gather(flight(request, handler), flight(request, handler))
+
+        assert handler.calls == 2
+
+
+    @pytest.mark.asyncio
+    async def test_sequential_reads_call_again(self):
+        flight, handler = SingleFlight({READ_TOOL}), SlowHandler()
+        request = create_request(READ_TOOL)
+
+        await flight(request, handler)
+        await flight(request, handler)
+
+        assert handler.calls == 2
+
+
+class TestFailures:
+    """Errors and cancellation of one caller."""
+
+    @pytest.mark.asyncio
+    async def test_error_shared_by_all_callers(self):
+        flight, handler = SingleFlight({READ_TOOL}), SlowHandler(error=RuntimeError('down'))
+        request = create_request(READ_TOOL)
+
+        results = await asyncio.gather(flight(request, handler), flight(request, handler), return_exceptions=True)
+
+        assert handler.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight, handler = SingleFlight({READ_TOOL}), SlowHandler()
+        request = create_request(READ_TOOL)
+
+        leader = asyncio.create_task(flight(request, handler))
+        follower = asyncio.create_task(flight(request, handler))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        result = await follower
+        assert not result.isError
+        assert handler.calls == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
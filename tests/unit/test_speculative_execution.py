@@ -0,0 +1,151 @@
+"""
+Unit tests for speculative execution of task_executor alongside policy_router.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.messages import HumanMessage, AIMessage
+from agentic.graph import build_graph
+from agentic.nodes.agent import task_executor, speculative_executor
+from agentic.schema.models import PolicyRouterOut
+from tests.conftest import MOCK_TOOLS
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+def create_state(allowed_tool_types: list, speculation: dict | None = None) -> dict:
+    state = {
+        'messages': [HumanMessage(content="What's on my calendar?")],
+        'allowed_tool_types': allowed_tool_types,
+    }
+    if speculation is not None:
+        state['speculation'] = speculation
+    return state
+
+
+def create_mock_model(*responses: AIMessage) -> tuple[MagicMock, MagicMock]:
+    mock_bound = MagicMock()
+    mock_bound.ainvoke = AsyncMock(side_effect=list(responses))
+
+    mock_model = MagicMock()
+    mock_model.bind_tools = MagicMock(return_value=mock_bound)
+    return mock_model, mock_bound
+
+
+class TestCommit:
+    """task_executor commits a speculation only when the policy allowed the same tool types."""
+
+    @pytest.mark.asyncio
+    async def test_matching_speculation_committed(self):
+        speculative = AIMessage(content='You have no events today.')
+        mock_model, mock_bound = create_mock_model()
+
+        state = create_state(['calendar'], {'allowed_tool_types': ['calendar'], 'message': speculative})
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        assert result['messages'] is speculative
+        assert result['final_response'] == 'You have no events today.'
+        assert result['speculation'] is None
+        mock_bound.ainvoke.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_mismatched_speculation_discarded(self):
+        speculative = AIMessage(content='Speculative answer.')
+        mock_model, mock_bound = create_mock_model(AIMessage(content='I can only help with calendars.'))
+
+        state = create_state([], {'allowed_tool_types': ['calendar'], 'message': speculative})
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        assert result['final_response'] == 'I can only help with calendars.'
+        assert result['speculation'] is None
+        mock_bound.ainvoke.assert_awaited_once()
+
+
+class TestSpeculativeExecutor:
+    """speculative_executor records its guess and never fails the run."""
+
+    @pytest.mark.asyncio
+    async def test_records_guessed_tool_types(self):
+        mock_model, _ = create_mock_model(AIMessage(content='Done.'))
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('agentic.nodes.agent.SPECULATIVE_TOOL_TYPES', ['calendar']), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await speculative_executor(create_state([]))
+
+        assert result['speculation']['allowed_tool_types'] == ['calendar']
+        assert result['speculation']['message'].content == 'Done.'
+
+
+    @pytest.mark.asyncio
+    async def test_failure_leaves_no_speculation(self):
+        mock_bound = MagicMock()
+        mock_bound.ainvoke = AsyncMock(side_effect=RuntimeError('model unavailable'))
+        mock_model = MagicMock()
+        mock_model.bind_tools = MagicMock(return_value=mock_bound)
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await speculative_executor(create_state([]))
+
+        assert result == {'speculation': None}
+
+
+class TestSpeculativeGraph:
+    """In speculative mode the first model call overlaps policy_router."""
+
+    async def run_graph(self, policy: PolicyRouterOut, *responses: AIMessage):
+        mock_model, mock_bound = create_mock_model(*responses)
+        mock_structured = MagicMock()
+        mock_structured.ainvoke = AsyncMock(return_value=policy)
+        mock_policy_model = MagicMock()
+        mock_policy_model.with_structured_output = MagicMock(return_value=mock_structured)
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('agentic.nodes.agent.POLICY_ROUTER_MODEL', mock_policy_model), \
+             patch('agentic.nodes.agent.POLICY_FAST_PATH', False), \
+             patch('agentic.nodes.agent.SPECULATIVE_TOOL_TYPES', ['calendar']), \
+             patch('agentic.nodes.tool.PREFETCH_ENABLED', False), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            state = await build_graph('speculative').ainvoke(create_state([]))
+        return state, mock_bound
+
+
+    @pytest.mark.asyncio
+    async def test_agreeing_policy_uses_one_model_call(self):
+        policy = PolicyRouterOut(decision='allow', note='calendar', allowed_tool_types=['calendar'])
+
+        state, mock_bound = await self.run_graph(policy, AIMessage(content='Nothing today.'))
+
+        assert state['final_response'] == 'Nothing today.'
+        assert mock_bound.ainvoke.await_count == 1
+
+
+    @pytest.mark.asyncio
+    async def test_disagreeing_policy_reruns(self):
+        policy = PolicyRouterOut(decision='refuse', note='out of scope', allowed_tool_types=[])
+
+        state, mock_bound = await self.run_graph(
+            policy,
+            AIMessage(content='Speculative answer.'),
+            AIMessage(content='I can only help with calendars.'),
+        )
+
+        assert state['final_response'] == 'I can only help with calendars.'
+        assert mock_bound.ainvoke.await_count == 2
+
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            build_graph('eager')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
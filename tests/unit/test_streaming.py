@@ -0,0 +1,209 @@
+"""
+Unit tests for streaming graph runs (agentic.graph.stream_graph) and their SSE encoding in main.
+"""
+
+import json
+import uuid
+import pytest
+from unittest.mock import patch
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from agentic.graph import stream_run, stream_graph, build_graph
+from agentic.schema.models import PolicyRouterOut
+from agentic.validation import CORRECTIONS_EXHAUSTED_MESSAGE
+from main import stream_agent_events
+from tests.conftest import MOCK_TOOLS
+
+
+class StreamingFakeModel(GenericFakeChatModel):
+    """Fake chat model that streams its replies word by word and ignores bound tools."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+async def mock_get_tools(server_name=None):
+    return MOCK_TOOLS
+
+
+async def collect(events) -> list:
+    return [event async for event in events]
+
+
+def parse_sse(chunks: list[str]) -> list[tuple[str, dict]]:
+    events = []
+    for chunk in chunks:
+        event_line, data_line = chunk.strip().split('\n')
+        events.append((event_line.removeprefix('event: '), json.loads(data_line.removeprefix('data: '))))
+    return events
+
+
+class TestStreamGraph:
+    """Final response tokens are yielded as they are generated, followed by the final state."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_then_state(self):
+        model = StreamingFakeModel(messages=iter([AIMessage(content='You have no events today.')]))
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', model), \
+             patch('agentic.nodes.tool.PREFETCH_ENABLED', False), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            events = await collect(stream_run(str(uuid.uuid4()), "What's on my calendar today?"))
+
+        tokens = [payload for kind, payload in events if kind == 'token']
+        kind, final_state = events[-1]
+        assert len(tokens) > 1
+        assert ''.join(tokens) == 'You have no events today.'
+        assert kind == 'state'
+        assert final_state['final_response'] == 'You have no events today.'
+
+
+    @pytest.mark.asyncio
+    async def test_committed_speculation_streamed(self):
+        model = StreamingFakeModel(messages=iter([AIMessage(content='Nothing today.')]))
+        policy = PolicyRouterOut(decision='allow', note='calendar', allowed_tool_types=['calendar'])
+
+        async def decide(messages, mapping):
+            return policy
+
+        with patch('agentic.graph.graph', build_graph('speculative', checkpointer=InMemorySaver())), \
+             patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', model), \
+             patch('agentic.nodes.agent.POLICY_CLASSIFIER.classify', decide), \
+             patch('agentic.nodes.agent.SPECULATIVE_TOOL_TYPES', ['calendar']), \
+             patch('agentic.nodes.tool.PREFETCH_ENABLED', False), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            events = await collect(stream_run(str(uuid.uuid4()), "What's on my calendar today?"))
+
+        assert [payload for kind, payload in events if kind == 'token'] == ['Nothing today.']
+        assert events[-1][1]['final_response'] == 'Nothing today.'
+
+
+class FakeStreamingGraph:
+    """Graph stand-in replaying recorded (mode, chunk) stream events."""
+
+    def __init__(self, events: list):
+        self.events = events
+
+    async def astream(self, *args, **kwargs):
+        for event in self.events:
+            yield event
+
+
+def token(text: str, final: bool, node: str = 'task_executor') -> tuple:
+    return 'messages', (AIMessageChunk(content=text), {'langgraph_node': node, 'cascade_final': final})
+
+
+class TestCascadeStreaming:
+    """Only the text of the answer a node returned is streamed: the kept cascade attempt, never text before tool calls."""
+
+    async def stream(self, events: list) -> list[str]:
+        with patch('agentic.graph.graph', FakeStreamingGraph(events)):
+            results = await collect(stream_graph('thread', {}))
+        return [payload for kind, payload in results if kind == 'token']
+
+
+    @pytest.mark.asyncio
+    async def test_escalated_attempt_dropped(self):
+        tokens = await self.stream([
+            token('Let me ', final=False),
+            token('check.', final=False),
+            token('Done', final=True),
+            token('.', final=True),
+            ('updates', {'task_executor': {'messages': AIMessage(content='Done.')}}),
+        ])
+
+        assert tokens == ['Done', '.']
+
+
+    @pytest.mark.asyncio
+    async def test_kept_fast_attempt_released_with_update(self):
+        tokens = await self.stream([
+            token('All ', final=False),
+            token('set.', final=False),
+            ('updates', {'task_executor': {'messages': AIMessage(content='All set.')}}),
+        ])
+
+        assert tokens == ['All ', 'set.']
+
+
+    @pytest.mark.asyncio
+    async def test_text_before_tool_calls_dropped(self):
+        call = {'id': 'call_1', 'name': 'list_events', 'args': {}}
+        tokens = await self.stream([
+            token('Let me look.', final=True),
+            ('updates', {'task_executor': {'messages': AIMessage(content='Let me look.', tool_calls=[call])}}),
+            token('Nothing today.', final=True),
+            ('updates', {'task_executor': {'messages': AIMessage(content='Nothing today.')}}),
+        ])
+
+        assert tokens == ['Nothing today.']
+
+
+    @pytest.mark.asyncio
+    async def test_fixed_answer_replaces_streamed_text(self):
+        call = {'id': 'call_1', 'name': 'create_event', 'args': {}}
+        update = {'messages': [
+            AIMessage(content='Creating it.', tool_calls=[call]),
+            ToolMessage(content='Invalid arguments', tool_call_id='call_1', status='error'),
+            AIMessage(content=CORRECTIONS_EXHAUSTED_MESSAGE),
+        ]}
+        tokens = await self.stream([
+            token('Creating it.', final=True),
+            ('updates', {'task_executor': update}),
+        ])
+
+        assert tokens == [CORRECTIONS_EXHAUSTED_MESSAGE]
+
+
+    @pytest.mark.asyncio
+    async def test_other_nodes_ignored(self):
+        tokens = await self.stream([
+            token('guess', final=True, node='speculative_executor'),
+            ('updates', {'speculative_executor': {'speculation': None}}),
+        ])
+
+        assert tokens == []
+
+
+class TestServerSentEvents:
+    """Stream events are encoded as SSE matching AgentResponse."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_and_success(self):
+        async def events():
+            yield 'token', 'Hello'
+            yield 'state', {'final_response': 'Hello'}
+
+        sse = parse_sse(await collect(stream_agent_events(events(), 'thread-1')))
+
+        assert sse == [('token', {'content': 'Hello'}), ('success', {'status': 'success', 'response': 'Hello'})]
+
+
+    @pytest.mark.asyncio
+    async def test_confirmation_event(self):
+        pending = {'kind': 'confirmation', 'tool_calls': []}
+
+        async def events():
+            yield 'state', {'pending_action': pending}
+
+        (event, data), = parse_sse(await collect(stream_agent_events(events(), 'thread-1')))
+
+        assert event == 'confirmation_required'
+        assert data['pending_action'] == pending
+        assert data['thread_id'] == 'thread-1'
+
+
+    @pytest.mark.asyncio
+    async def test_failure_becomes_error_event(self):
+        async def events():
+            yield 'token', 'Partial'
+            raise RuntimeError('model unavailable')
+
+        sse = parse_sse(await collect(stream_agent_events(events(), 'thread-1')))
+
+        assert sse[-1] == ('error', {'status': 'error', 'message': 'model unavailable'})
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
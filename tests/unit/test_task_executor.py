@@ -5,8 +5,9 @@ Tests post-LLM routing logic by mocking the model's response.
 
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from agentic.nodes.agent import task_executor
+from agentic.schema.prompts import TASK_EXECUTOR
 from tests.conftest import MOCK_TOOLS
 
 
@@ -68,7 +69,7 @@ class TestClarificationRouting:
 
         state = create_state("Schedule something")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert result['pending_action']['kind'] == 'clarification'
@@ -101,7 +102,7 @@ class TestClarificationRouting:
 
         state = create_state("Schedule a meeting")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert len(result['pending_action']['clarifications']) == 2
@@ -126,7 +127,7 @@ class TestClarificationRouting:
 
         state = create_state("Do something")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         clarification = result['pending_action']['clarifications'][0]
@@ -151,7 +152,7 @@ class TestClarificationRouting:
 
         state = create_state("Schedule a meeting")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         # should route to clarification, not confirmation
@@ -179,7 +180,7 @@ class TestHITLRouting:
 
         state = create_state("Create a meeting")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert result['pending_action']['kind'] == 'confirmation'
@@ -192,7 +193,7 @@ class TestHITLRouting:
         hitl_call_1 = {
             'id': 'call_create_1',
             'name': 'mock_create_event',
-            'args': {'calendar_id': 'primary', 'summary': 'Meeting 1'}
+            'args': {'calendar_id': 'primary', 'summary': 'Meeting 1', 'start_time': '2024-01-15T10:00:00'}
         }
         hitl_call_2 = {
             'id': 'call_update_1',
@@ -212,7 +213,7 @@ class TestHITLRouting:
 
         state = create_state("Create and update events")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert len(result['pending_action']['tool_calls']) == 2
@@ -237,7 +238,7 @@ class TestHITLRouting:
 
         state = create_state("Create a meeting")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         tool_call = result['pending_action']['tool_calls'][0]
@@ -263,7 +264,7 @@ class TestHITLRouting:
 
         state = create_state("Show calendar and create event")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert result['pending_action']['kind'] == 'confirmation'
@@ -294,7 +295,7 @@ class TestNoToolCalls:
 
         state = create_state("What's on my calendar?")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert result['final_response'] == "Here's what's on your calendar today."
@@ -316,7 +317,7 @@ class TestNoToolCalls:
 
         state = create_state("Tell me about my day")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert 'messages' in result
@@ -343,7 +344,7 @@ class TestRegularToolCalls:
 
         state = create_state("Show my events")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert 'messages' in result
@@ -377,7 +378,7 @@ class TestRegularToolCalls:
 
         state = create_state("Show all calendars and events")
         with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
-             patch('agentic.nodes.agent.CLIENT.get_tools', mock_get_tools):
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
             result = await task_executor(state)
 
         assert 'messages' in result
@@ -385,5 +386,106 @@ class TestRegularToolCalls:
         assert 'pending_action' not in result
 
 
+
+class TestInvalidToolCalls:
+    """
+    Tests for local validation of tool call arguments.
+    Invalid calls are answered with corrective ToolMessages instead of reaching HITL.
+    """
+    @pytest.mark.asyncio
+    async def test_invalid_hitl_call_rejected_before_confirmation(self):
+        """HITL call missing a required argument gets a corrective ToolMessage, no pending_action."""
+        invalid_call = {
+            'id': 'call_create_bad',
+            'name': 'mock_create_event',
+            'args': {'calendar_id': 'primary', 'summary': 'Meeting'}
+        }
+        mock_message = create_mock_ai_message(content="", tool_calls=[invalid_call])
+
+        mock_bound = MagicMock()
+        mock_bound.ainvoke = AsyncMock(return_value=mock_message)
+
+        mock_model = MagicMock()
+        mock_model.bind_tools = MagicMock(return_value=mock_bound)
+
+        state = create_state("Create a meeting")
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        assert 'pending_action' not in result
+        ai_message, correction = result['messages']
+        assert correction.tool_call_id == 'call_create_bad'
+        assert correction.status == 'error'
+        assert 'start_time' in correction.content
+
+
+    @pytest.mark.asyncio
+    async def test_valid_calls_in_invalid_step_skipped(self):
+        """Valid calls alongside an invalid one are answered too, so every call has a ToolMessage."""
+        invalid_call = {
+            'id': 'call_list_bad',
+            'name': 'mock_list_events',
+            'args': {'calendar_id': 42}
+        }
+        mock_message = create_mock_ai_message(content="", tool_calls=[SAMPLE_NON_HITL_CALL, invalid_call])
+
+        mock_bound = MagicMock()
+        mock_bound.ainvoke = AsyncMock(return_value=mock_message)
+
+        mock_model = MagicMock()
+        mock_model.bind_tools = MagicMock(return_value=mock_bound)
+
+        state = create_state("Show my events")
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        corrections = result['messages'][1:]
+        assert [m.tool_call_id for m in corrections] == ['call_list_1', 'call_list_bad']
+        assert 'Not executed' in corrections[0].content
+        assert 'calendar_id' in corrections[1].content
+
+class TestPromptLayout:
+    """
+    The prompt keeps static instructions first and volatile context last,
+    so the prefix providers cache stays identical across calls.
+    """
+    async def run_task_executor(self, state: dict) -> list:
+        mock_bound = MagicMock()
+        mock_bound.ainvoke = AsyncMock(return_value=create_mock_ai_message("Done."))
+
+        mock_model = MagicMock()
+        mock_model.bind_tools = MagicMock(return_value=mock_bound)
+
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            await task_executor(state)
+        return mock_bound.ainvoke.call_args[0][0]
+
+
+    @pytest.mark.asyncio
+    async def test_static_instructions_lead(self):
+        """The first message is the static system prompt, unchanged between calls."""
+        first = await self.run_task_executor(create_state("What's on my calendar?"))
+        second = await self.run_task_executor(create_state("What's on my calendar?"))
+
+        assert first[0] == SystemMessage(content=TASK_EXECUTOR)
+        assert first[:-1] == second[:-1]
+
+
+    @pytest.mark.asyncio
+    async def test_volatile_context_trails(self):
+        """Current datetime is sent after the conversation, not in the system prompt."""
+        state = create_state("What's on my calendar?")
+
+        prompt = await self.run_task_executor(state)
+
+        assert prompt[1:-1] == state['messages']
+        assert isinstance(prompt[-1], SystemMessage)
+        assert 'Current datetime:' in prompt[-1].content
+        assert 'Current datetime' not in TASK_EXECUTOR
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,146 @@
+"""
+Unit tests for local tool call validation in agentic.validation and the routing that follows it.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+from agentic.edges import route_from_task_executor
+from agentic.nodes.agent import task_executor
+from agentic.validation import ToolCallValidator, CORRECTIONS_EXHAUSTED_MESSAGE
+from tests.conftest import MOCK_TOOLS
+
+
+MCP_STYLE_TOOL = StructuredTool(
+    name='create_event',
+    description='Create a new calendar event.',
+    args_schema={
+        'type': 'object',
+        'properties': {
+            'calendar_id': {'type': 'string'},
+            'summary': {'type': 'string'},
+            'start_time': {'type': 'string'},
+            'attendees': {'type': 'array', 'items': {'type': 'string'}},
+        },
+        'required': ['calendar_id', 'summary', 'start_time'],
+    },
+    coroutine=lambda **kwargs: None,
+)
+
+
+def create_call(name: str, args: dict, call_id: str = 'call_1') -> dict:
+    return {'name': name, 'args': args, 'id': call_id}
+
+
+class TestValidator:
+    """Calls are checked against compiled input schemas."""
+
+    def test_valid_call(self):
+        validator = ToolCallValidator(MOCK_TOOLS)
+        assert validator.errors(create_call('mock_list_events', {'calendar_id': 'primary'})) == []
+
+
+    def test_missing_required_argument(self):
+        validator = ToolCallValidator([MCP_STYLE_TOOL])
+        errors = validator.errors(create_call('create_event', {'calendar_id': 'primary', 'summary': 'Standup'}))
+
+        assert errors == ["arguments: 'start_time' is a required property"]
+
+
+    def test_wrong_nested_type_reports_path(self):
+        validator = ToolCallValidator([MCP_STYLE_TOOL])
+        args = {'calendar_id': 'primary', 'summary': 'Standup', 'start_time': 'now', 'attendees': ['a', 1]}
+
+        errors = validator.errors(create_call('create_event', args))
+
+        assert len(errors) == 1
+        assert errors[0].startswith('attendees/1:')
+
+
+    def test_unknown_tool(self):
+        validator = ToolCallValidator(MOCK_TOOLS)
+        assert 'unknown tool' in validator.errors(create_call('delete_everything', {}))[0]
+
+
+    def test_all_valid_needs_no_corrections(self):
+        validator = ToolCallValidator(MOCK_TOOLS)
+        assert validator.reject_invalid([create_call('mock_list_calendars', {})]) == []
+
+
+class TestRouting:
+    """Corrective ToolMessages send the loop straight back to task_executor."""
+
+    def test_routes_back_after_corrections(self):
+        call = create_call('create_event', {})
+        state = {
+            'messages': [
+                HumanMessage(content='Create a meeting'),
+                AIMessage(content='', tool_calls=[call]),
+                ToolMessage(content='Invalid arguments', tool_call_id='call_1', status='error'),
+            ],
+            'allowed_tool_types': ['calendar'],
+        }
+
+        assert route_from_task_executor(state) == 'task_executor'
+
+
+async def mock_get_tools():
+    return MOCK_TOOLS
+
+
+class TestCorrectionLimit:
+    """Repeated invalid calls end the turn with an error answer instead of looping."""
+
+    async def run_invalid_step(self, state: dict) -> dict:
+        message = AIMessage(content='', tool_calls=[create_call('mock_create_event', {'summary': 'Meeting'})])
+        mock_model = MagicMock()
+        mock_model.bind_tools = MagicMock(return_value=MagicMock(ainvoke=AsyncMock(return_value=message)))
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools), \
+             patch('agentic.nodes.agent.TOOL_CALL_MAX_CORRECTIONS', 2):
+            return await task_executor(state)
+
+    @pytest.mark.asyncio
+    async def test_corrections_are_counted(self):
+        state = {'messages': [HumanMessage(content='Create a meeting')], 'allowed_tool_types': ['calendar']}
+
+        result = await self.run_invalid_step(state)
+
+        assert result['tool_call_corrections'] == 1
+        assert isinstance(result['messages'][-1], ToolMessage)
+        assert 'final_response' not in result
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_limit(self):
+        state = {
+            'messages': [HumanMessage(content='Create a meeting')],
+            'allowed_tool_types': ['calendar'],
+            'tool_call_corrections': 2,
+        }
+
+        result = await self.run_invalid_step(state)
+
+        assert result['final_response'] == CORRECTIONS_EXHAUSTED_MESSAGE
+        assert result['tool_call_corrections'] == 0
+        assert route_from_task_executor({'messages': [*state['messages'], *result['messages']]}) == '__end__'
+
+    @pytest.mark.asyncio
+    async def test_valid_step_resets_count(self):
+        message = AIMessage(content='Done.')
+        mock_model = MagicMock()
+        mock_model.bind_tools = MagicMock(return_value=MagicMock(ainvoke=AsyncMock(return_value=message)))
+        state = {
+            'messages': [HumanMessage(content='Create a meeting')],
+            'allowed_tool_types': ['calendar'],
+            'tool_call_corrections': 1,
+        }
+        with patch('agentic.nodes.agent.TASK_EXECUTOR_MODEL', mock_model), \
+             patch('mcp_module.adapter.CLIENT.get_tools', mock_get_tools):
+            result = await task_executor(state)
+
+        assert result['tool_call_corrections'] == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,120 @@
+"""
+Unit tests for the shared tool catalog in mcp_module.catalog.
+"""
+
+import asyncio
+import pytest
+from mcp_module.catalog import ToolCatalog
+from tests.conftest import MOCK_TOOLS
+
+
+class CountingLoader:
+    """Loader that returns a fixed tool list and counts calls."""
+
+    def __init__(self, tools=MOCK_TOOLS):
+        self.tools = tools
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.tools
+
+
+class TestCatalogCaching:
+    """Tool lists are loaded once and shared until they expire."""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_a_hit(self):
+        loader = CountingLoader()
+        catalog = ToolCatalog(loader, ttl=60)
+
+        assert await catalog.get() == MOCK_TOOLS
+        assert await catalog.get() == MOCK_TOOLS
+
+        assert loader.calls == 1
+        assert catalog.stats()['hits'] == 1
+        assert catalog.stats()['misses'] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self):
+        loader = CountingLoader()
+        catalog = ToolCatalog(loader, ttl=60)
+
+        await asyncio.gather(*(catalog.get() for _ in range(5)))
+
+        assert loader.calls == 1
+
+
+    @pytest.mark.asyncio
+    async def test_empty_tool_list_not_cached(self):
+        loader = CountingLoader(tools=[])
+        catalog = ToolCatalog(loader, ttl=60)
+
+        await catalog.get()
+        await catalog.get()
+
+        assert loader.calls == 2
+        assert catalog.version == 0
+
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_reloads(self):
+        loader = CountingLoader()
+        catalog = ToolCatalog(loader, ttl=0)
+
+        await catalog.get()
+        await catalog.get()
+
+        assert loader.calls == 2
+
+
+class TestCatalogRefresh:
+    """Stale entries are served while a background refresh runs."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_triggers_background_refresh(self):
+        loader = CountingLoader()
+        catalog = ToolCatalog(loader, ttl=60, refresh_after=0)
+
+        await catalog.get()
+        assert await catalog.get() == MOCK_TOOLS
+        await catalog._refresh_task
+
+        assert loader.calls == 2
+        assert catalog.version == 2
+        assert catalog.stats()['refreshes'] == 1
+
+
+class TestCatalogInvalidation:
+    """Invalidation forces the next lookup to reload."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self):
+        loader = CountingLoader()
+        catalog = ToolCatalog(loader, ttl=60)
+
+        await catalog.get()
+        catalog.invalidate('tools/list_changed')
+        await catalog.get()
+
+        assert loader.calls == 2
+        assert catalog.stats()['invalidations'] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidation_is_not_stored(self):
+        catalog = None
+
+        async def invalidating_loader():
+            catalog.invalidate('oauth required')
+            return MOCK_TOOLS
+
+        catalog = ToolCatalog(invalidating_loader, ttl=60)
+        await catalog.get()
+
+        assert catalog.version == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
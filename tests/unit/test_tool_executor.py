@@ -0,0 +1,162 @@
+"""
+Unit tests for bounded, deadline-aware tool execution in agentic.executor and use_tools.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import StateGraph, START, END
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+from agentic.executor import ToolCallExecutor, TOOL_EXECUTOR, URL_ELICITATION_ERROR
+from agentic.nodes.tool import use_tools
+from agentic.state import RequestState
+
+
+class FakeRequest:
+    def __init__(self, name: str, call_id: str = 'call_1'):
+        self.tool_call = {'name': name, 'args': {}, 'id': call_id}
+
+
+def returning(content: str, delay: float = 0.0):
+    async def execute(request):
+        await asyncio.sleep(delay)
+        return ToolMessage(content=content, tool_call_id=request.tool_call['id'])
+    return execute
+
+
+def raising(error: Exception):
+    async def execute(request):
+        raise error
+    return execute
+
+
+@tool
+async def fast_tool() -> str:
+    """Returns immediately."""
+    return 'fast result'
+
+
+@tool
+async def slow_tool() -> str:
+    """Never finishes within the test deadline."""
+    await asyncio.sleep(5)
+    return 'slow result'
+
+
+@tool
+async def broken_tool() -> str:
+    """Always fails."""
+    raise RuntimeError('backend unavailable')
+
+
+TEST_TOOL_MAPPING = {'test': ['fast_tool', 'slow_tool', 'broken_tool', 'needs_auth']}
+
+
+def create_state(tool_names: list[str]) -> dict:
+    tool_calls = [{'name': name, 'args': {}, 'id': f'call_{i}'} for i, name in enumerate(tool_names)]
+    return {
+        'messages': [AIMessage(content='', tool_calls=tool_calls)],
+        'allowed_tool_types': ['test'],
+    }
+
+
+async def run_use_tools(state: dict) -> dict:
+    # ToolNode needs a runnable config, so the node is exercised inside a minimal graph
+    builder = StateGraph(RequestState)
+    builder.add_node('use_tools', use_tools)
+    builder.add_edge(START, 'use_tools')
+    builder.add_edge('use_tools', END)
+    return await builder.compile().ainvoke(state)
+
+
+class TestToolCallExecutor:
+    """Deadlines, error isolation and the concurrency bound."""
+
+    @pytest.mark.asyncio
+    async def test_returns_result(self):
+        executor = ToolCallExecutor()
+        result = await executor(FakeRequest('fast'), returning('ok'))
+        assert result.content == 'ok'
+
+
+    @pytest.mark.asyncio
+    async def test_timeout_becomes_error_message(self):
+        executor = ToolCallExecutor(default_timeout=5, timeouts={'slow': 0.05})
+        result = await executor(FakeRequest('slow'), returning('late', delay=1))
+
+        assert result.status == 'error'
+        assert 'timed out' in result.content
+        assert result.tool_call_id == 'call_1'
+
+
+    @pytest.mark.asyncio
+    async def test_failure_becomes_error_message(self):
+        executor = ToolCallExecutor()
+        result = await executor(FakeRequest('broken'), raising(RuntimeError('boom')))
+
+        assert result.status == 'error'
+        assert 'boom' in result.content
+
+
+    @pytest.mark.asyncio
+    async def test_propagates_selected_errors(self):
+        executor = ToolCallExecutor(should_propagate=lambda e: isinstance(e, ValueError))
+        with pytest.raises(ValueError):
+            await executor(FakeRequest('broken'), raising(ValueError('auth')))
+
+
+    @pytest.mark.asyncio
+    async def test_bounds_concurrency(self):
+        executor = ToolCallExecutor(max_concurrency=2)
+        running, peak = 0, 0
+
+        async def execute(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return ToolMessage(content='ok', tool_call_id=request.tool_call['id'])
+
+        await asyncio.gather(*(executor(FakeRequest('t', f'call_{i}'), execute) for i in range(6)))
+        assert peak == 2
+
+
+class TestUseToolsPartialResults:
+    """A slow or failing call does not discard results from the others."""
+
+    @pytest.mark.asyncio
+    async def test_slow_and_broken_calls_keep_fast_result(self):
+        with patch('mcp_module.adapter.CLIENT.get_tools', return_value=[fast_tool, slow_tool, broken_tool]), \
+             patch('agentic.nodes.tool.TOOL_MAPPING', TEST_TOOL_MAPPING), \
+             patch.object(TOOL_EXECUTOR, 'timeouts', {'slow_tool': 0.05}):
+            result = await run_use_tools(create_state(['fast_tool', 'slow_tool', 'broken_tool']))
+
+        tool_messages = {m.name: m for m in result['messages'] if isinstance(m, ToolMessage)}
+        assert tool_messages['fast_tool'].content == 'fast result'
+        assert tool_messages['slow_tool'].status == 'error'
+        assert tool_messages['broken_tool'].status == 'error'
+
+
+    @pytest.mark.asyncio
+    async def test_url_elicitation_still_starts_oauth(self):
+        elicitation = {'elicitationId': 'e1', 'url': 'https://auth.example', 'message': 'Sign in'}
+
+        @tool
+        async def needs_auth() -> str:
+            """Requires OAuth."""
+            raise McpError(ErrorData(code=URL_ELICITATION_ERROR, message='auth', data={'elicitations': [elicitation]}))
+
+        with patch('mcp_module.adapter.CLIENT.get_tools', return_value=[needs_auth]), \
+             patch('agentic.nodes.tool.TOOL_MAPPING', TEST_TOOL_MAPPING):
+            result = await run_use_tools(create_state(['needs_auth']))
+
+        assert result['pending_action']['kind'] == 'oauth_url'
+        assert result['pending_action']['url'] == 'https://auth.example'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,124 @@
+"""
+Unit tests for tool output compaction in agentic.compaction.
+"""
+
+import json
+import pytest
+from langchain_core.messages import ToolMessage
+from agentic.compaction import ToolOutputCompactor, get_full_output
+
+
+EVENT_FIELDS = {'mock_list_events': ['id', 'summary', 'start', 'description']}
+
+
+def create_event(i: int, description: str = None) -> dict:
+    return {
+        'id': f'event{i}',
+        'summary': f'Meeting {i}',
+        'start': {'dateTime': f'2024-01-15T{10 + i % 8:02d}:00:00', 'timeZone': None},
+        'description': description,
+        'etag': '"3181161784712000"',
+        'htmlLink': f'https://www.google.com/calendar/event?eid={i}',
+    }
+
+
+def create_message(data, name: str = 'mock_list_events', status: str = 'success') -> ToolMessage:
+    content = [{'type': 'text', 'text': json.dumps(data, indent=2)}]
+    return ToolMessage(content=content, name=name, tool_call_id='call_1', status=status)
+
+
+def create_compactor(**kwargs) -> ToolOutputCompactor:
+    return ToolOutputCompactor(fields=EVENT_FIELDS, **{'max_field_chars': 50, 'table_threshold': 10_000, **kwargs})
+
+
+class TestProjection:
+    """Outputs are projected to configured fields and stripped of empty values."""
+
+    def test_drops_unlisted_fields_and_nulls(self):
+        compacted = create_compactor().compact(create_message([create_event(1)]))
+
+        assert json.loads(compacted.content) == [
+            {'id': 'event1', 'summary': 'Meeting 1', 'start': {'dateTime': '2024-01-15T11:00:00'}}
+        ]
+
+
+    def test_truncates_long_strings(self):
+        compacted = create_compactor().compact(create_message([create_event(1, description='x' * 500)]))
+
+        description = json.loads(compacted.content)[0]['description']
+        assert len(description) == 51
+        assert description.endswith('…')
+
+
+    def test_wrapped_records_are_projected(self):
+        data = {'kind': 'calendar#events', 'summary': 'me@example.com', 'items': [create_event(1), create_event(2)]}
+
+        compacted = create_compactor().compact(create_message(data))
+
+        assert json.loads(compacted.content) == {
+            'kind': 'calendar#events',
+            'summary': 'me@example.com',
+            'items': [
+                {'id': 'event1', 'summary': 'Meeting 1', 'start': {'dateTime': '2024-01-15T11:00:00'}},
+                {'id': 'event2', 'summary': 'Meeting 2', 'start': {'dateTime': '2024-01-15T12:00:00'}},
+            ],
+        }
+
+
+    def test_top_level_record_fields_are_kept(self):
+        data = {'id': 'event1', 'summary': 'Meeting 1', 'htmlLink': 'https://example.com/e1'}
+
+        compacted = create_compactor().compact(create_message(data))
+
+        assert json.loads(get_full_output(compacted)[0]['text']) == data
+        assert json.loads(compacted.content) == data
+
+
+    def test_unconfigured_tool_keeps_all_fields(self):
+        compacted = create_compactor().compact(create_message({'a': 1, 'b': None, 'c': 'keep'}, name='other_tool'))
+
+        assert json.loads(compacted.content) == {'a': 1, 'c': 'keep'}
+
+
+class TestTabular:
+    """Large record lists switch to a CSV encoding."""
+
+    def test_large_list_becomes_table(self):
+        events = [create_event(i) for i in range(30)]
+        compacted = create_compactor(table_threshold=500).compact(create_message(events))
+
+        lines = compacted.content.splitlines()
+        assert lines[0] == '30 rows (csv)'
+        assert lines[1] == 'id,summary,start.dateTime'
+        assert lines[2] == 'event0,Meeting 0,2024-01-15T10:00:00'
+
+
+    def test_small_list_stays_json(self):
+        compacted = create_compactor(table_threshold=500).compact(create_message([create_event(1)]))
+
+        assert compacted.content.startswith('[')
+
+
+class TestFullOutput:
+    """The full payload stays retrievable and unchanged outputs pass through."""
+
+    def test_full_output_kept_in_artifact(self):
+        message = create_message([create_event(1)])
+        compacted = create_compactor().compact(message)
+
+        assert get_full_output(compacted) == message.content
+        assert get_full_output(message) == message.content
+
+
+    def test_non_json_untouched(self):
+        message = ToolMessage(content='Event created', name='mock_list_events', tool_call_id='call_1')
+        assert create_compactor().compact(message) is message
+
+
+    def test_error_untouched(self):
+        message = create_message([create_event(1)], status='error')
+        assert create_compactor().compact(message) is message
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
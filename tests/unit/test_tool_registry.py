@@ -0,0 +1,106 @@
+"""
+Unit tests for the memoized tool bindings in agentic.registry.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from agentic.registry import ToolRegistry
+from mcp_module.catalog import ToolCatalog
+from tests.conftest import MOCK_TOOLS, MOCK_TOOL_MAPPING
+
+
+class CountingLoader:
+    """Tool loader returning a configurable tool list."""
+
+    def __init__(self, tools: list):
+        self.tools = tools
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.tools
+
+
+def create_registry(tools: list = None):
+    loader = CountingLoader(MOCK_TOOLS if tools is None else tools)
+    catalog = ToolCatalog(loader, ttl=60)
+    return ToolRegistry(catalog, catalog.get), catalog
+
+
+def create_model() -> MagicMock:
+    model = MagicMock()
+    model.bind_tools = MagicMock(side_effect=lambda tools: MagicMock(tools=tools))
+    return model
+
+
+class TestMemoization:
+    """Bindings and bound models are built once per allowed set and catalog version."""
+
+    @pytest.mark.asyncio
+    async def test_same_types_reuse_binding(self):
+        registry, _ = create_registry()
+
+        first = await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+        second = await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+
+        assert first is second
+        assert registry.builds == 1
+
+
+    @pytest.mark.asyncio
+    async def test_type_order_does_not_matter(self):
+        registry, _ = create_registry()
+
+        first = await registry.get(['calendar', 'maps'], MOCK_TOOL_MAPPING)
+        second = await registry.get(['maps', 'calendar'], MOCK_TOOL_MAPPING)
+
+        assert first is second
+
+
+    @pytest.mark.asyncio
+    async def test_binding_filters_allowed_tools(self):
+        registry, _ = create_registry()
+
+        binding = await registry.get(['maps'], MOCK_TOOL_MAPPING)
+
+        assert binding.tool_names == {'mock_search_places', 'mock_get_directions'}
+        assert set(binding.tool_node.tools_by_name) == binding.tool_names
+
+
+    @pytest.mark.asyncio
+    async def test_model_bound_once(self):
+        registry, _ = create_registry()
+        model = create_model()
+
+        binding = await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+        assert binding.bind(model) is binding.bind(model)
+        assert model.bind_tools.call_count == 1
+
+
+class TestRebuild:
+    """Bindings are rebuilt when the tool catalog changes."""
+
+    @pytest.mark.asyncio
+    async def test_catalog_invalidation_rebuilds(self):
+        registry, catalog = create_registry()
+
+        first = await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+        catalog.invalidate('test')
+        second = await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+
+        assert first is not second
+        assert registry.builds == 2
+
+
+    @pytest.mark.asyncio
+    async def test_empty_tool_list_not_memoized(self):
+        registry, _ = create_registry(tools=[])
+
+        await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+        await registry.get(['calendar'], MOCK_TOOL_MAPPING)
+
+        assert registry.builds == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
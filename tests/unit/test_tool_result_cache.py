@@ -0,0 +1,125 @@
+"""
+Unit tests for the read-through tool result cache in mcp_module.cache.
+"""
+
+import pytest
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest
+from mcp.types import CallToolResult, TextContent
+from mcp_module.cache import ToolResultCache
+from mcp_module.context import bind_user
+
+
+READ_TOOL = 'mock_list_events'
+WRITE_TOOL = 'mock_create_event'
+
+
+def create_request(name: str, args: dict = None) -> MCPToolCallRequest:
+    return MCPToolCallRequest(name=name, args=args or {}, server_name='assistant')
+
+
+class CountingHandler:
+    """Innermost handler returning a fixed result and counting calls."""
+
+    def __init__(self, is_error: bool = False):
+        self.calls = 0
+        self.is_error = is_error
+
+    async def __call__(self, request):
+        self.calls += 1
+        return CallToolResult(content=[TextContent(type='text', text='[]')], isError=self.is_error)
+
+
+def create_cache() -> ToolResultCache:
+    return ToolResultCache(read_tools={READ_TOOL}, write_tools={WRITE_TOOL}, ttl=60)
+
+
+class TestReadCaching:
+    """Read-only tool results are served from the cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_read_hits_cache(self):
+        cache, handler = create_cache(), CountingHandler()
+
+        await cache(create_request(READ_TOOL, {'calendar_id': 'primary'}), handler)
+        await cache(create_request(READ_TOOL, {'calendar_id': 'primary'}), handler)
+
+        assert handler.calls == 1
+        assert cache.stats()['hits'] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_argument_order_does_not_matter(self):
+        cache, handler = create_cache(), CountingHandler()
+
+        await cache(create_request(READ_TOOL, {'a': 1, 'b': 2}), handler)
+        await cache(create_request(READ_TOOL, {'b': 2, 'a': 1}), handler)
+
+        assert handler.calls == 1
+
+
+    @pytest.mark.asyncio
+    async def test_users_do_not_share_entries(self):
+        cache, handler = create_cache(), CountingHandler()
+
+        with bind_user('alice'):
+            await cache(create_request(READ_TOOL), handler)
+        with bind_user('bob'):
+            await cache(create_request(READ_TOOL), handler)
+
+        assert handler.calls == 2
+
+
+    @pytest.mark.asyncio
+    async def test_error_results_not_cached(self):
+        cache, handler = create_cache(), CountingHandler(is_error=True)
+
+        await cache(create_request(READ_TOOL), handler)
+        await cache(create_request(READ_TOOL), handler)
+
+        assert handler.calls == 2
+
+
+class TestWriteInvalidation:
+    """Successful write tools invalidate the writing user's cached reads."""
+
+    @pytest.mark.asyncio
+    async def test_successful_write_invalidates_user(self):
+        cache, handler = create_cache(), CountingHandler()
+
+        with bind_user('alice'):
+            await cache(create_request(READ_TOOL), handler)
+            await cache(create_request(WRITE_TOOL, {'summary': 'Meeting'}), handler)
+            await cache(create_request(READ_TOOL), handler)
+
+        # read, write, read again after invalidation
+        assert handler.calls == 3
+
+
+    @pytest.mark.asyncio
+    async def test_write_keeps_other_users_entries(self):
+        cache, handler = create_cache(), CountingHandler()
+
+        with bind_user('bob'):
+            await cache(create_request(READ_TOOL), handler)
+        with bind_user('alice'):
+            await cache(create_request(WRITE_TOOL), handler)
+        with bind_user('bob'):
+            await cache(create_request(READ_TOOL), handler)
+
+        assert handler.calls == 2
+
+
+    @pytest.mark.asyncio
+    async def test_failed_write_keeps_entries(self):
+        cache = create_cache()
+        read_handler, failing_write = CountingHandler(), CountingHandler(is_error=True)
+
+        await cache(create_request(READ_TOOL), read_handler)
+        await cache(create_request(WRITE_TOOL), failing_write)
+        await cache(create_request(READ_TOOL), read_handler)
+
+        assert read_handler.calls == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])